@@ -0,0 +1,333 @@
+"""
+End-to-end benchmarks of the provisioning, listing and migration flows.
+Drives the real service functions headlessly (scripted answers to the
+prompts) against the local OLT simulator with injected latency, and reports
+per flow the wall time, round trips to the OLT, time sleeping and time
+waiting on OLT output, plus ONUs/hour. Results are compared with a stored
+baseline so every driver change comes with before/after numbers.
+
+Usage: python -m benchmarks.bench_flows [--flows a,b] [--migration-size N]
+                                        [--latency S] [--save-baseline] [--keep]
+"""
+
+import os
+import sys
+import csv
+import json
+import time
+import shutil
+import tempfile
+import argparse
+import builtins
+import threading
+from contextlib import redirect_stdout
+from typing import Callable, Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pexpect
+
+# Constants
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline_flows.json")
+NOKIA_HOST = "198.51.100.10"
+PARKS_HOST = "198.51.100.20"
+DEFAULT_MIGRATION_SIZE = 12
+DEFAULT_LATENCY = 0.05
+REGRESSION_TOLERANCE = 0.10
+NOKIA_BRIDGE_MODELS = ("TX-6610", "110Gb")
+PARKS_BRIDGE_MODELS = ("FiberLink101", "Fiberlink100", "TX-6610")
+
+# Ambiente da execução: OLTs simuladas, banco e CSVs num diretório descartável
+BENCH_ENV = {
+    "SSH_BINARY": f"{sys.executable} {os.path.join(ROOT, 'simulator')}",
+    "SSH_MULTIPLEX": "0",
+    "SSH_USER": "bench", "SSH_PASSWORD": "bench", "PORT": "22",
+    "TL1_USER": "bench", "TL1_PASSWORD": "bench", "TL1_PORT": "1023",
+    "SSH_USER_PARKS": "bench", "SSH_PASSWORD_PARKS": "bench",
+    "LAB_IP": NOKIA_HOST, "LAB_IP_PARKS": PARKS_HOST,
+    "LATENCY_REPORT": "",
+}
+
+
+class FlowMeter:
+    """Round trips, sleep time and I/O wait accumulated by every thread"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.round_trips = 0
+        self.sleep = 0.0
+        self.io_wait = 0.0
+
+    def add(self, round_trips: int = 0, sleep: float = 0.0, io_wait: float = 0.0) -> None:
+        with self._lock:
+            self.round_trips += round_trips
+            self.sleep += sleep
+            self.io_wait += io_wait
+
+    def snapshot(self) -> Tuple[int, float, float]:
+        with self._lock:
+            return self.round_trips, self.sleep, self.io_wait
+
+
+meter = FlowMeter()
+
+
+def install_meter() -> None:
+    """Wrap time.sleep and the pexpect send/read primitives to feed the meter"""
+    real_sleep = time.sleep
+    real_send = pexpect.spawn.send
+    real_read = pexpect.spawn.read_nonblocking
+
+    def sleep(seconds):
+        start = time.perf_counter()
+        try:
+            real_sleep(seconds)
+        finally:
+            meter.add(sleep=time.perf_counter() - start)
+
+    def send(self, s):
+        meter.add(round_trips=1)
+        return real_send(self, s)
+
+    def read_nonblocking(self, size=1, timeout=-1):
+        start = time.perf_counter()
+        try:
+            return real_read(self, size, timeout)
+        finally:
+            meter.add(io_wait=time.perf_counter() - start)
+
+    time.sleep = sleep
+    pexpect.spawn.send = send
+    pexpect.spawn.read_nonblocking = read_nonblocking
+
+
+class ScriptedInput:
+    """Replacement for input(): answers by prompt substring, fails on unexpected prompts"""
+
+    def __init__(self) -> None:
+        self.answers: Dict[str, str] = {}
+
+    def __call__(self, prompt: str = "") -> str:
+        for fragment, answer in self.answers.items():
+            if fragment in prompt:
+                return answer
+        raise RuntimeError(f"Pergunta inesperada no benchmark: {prompt!r}")
+
+
+def prepare_workdir(workdir: str, migration_size: int) -> None:
+    """Environment, simulator sizing and the lookup CSVs the flows read"""
+    os.environ.update(BENCH_ENV)
+    os.environ["SIM_STATE_DIR"] = os.path.join(workdir, "simulator")
+    os.environ["PORYGON_DB"] = os.path.join(workdir, "porygon.db")
+    os.environ["SIM_UNPROVISIONED"] = str(max(int(os.getenv("SIM_UNPROVISIONED", 0)), migration_size + 8))
+    os.chdir(workdir)
+    os.makedirs("csv", exist_ok=True)
+
+    from simulator import state
+    with open(os.path.join("csv", "nokia.csv"), "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["CARD", "PON", "VLAN"])
+        for slot in range(1, state.SIM_SLOTS + 1):
+            for pon in range(1, state.SIM_PONS + 1):
+                writer.writerow([slot, pon, 100 + slot * 10 + pon])
+    with open(os.path.join("csv", "parks.csv"), "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["olt_ip", "pon", "type", "vlan", "profile"])
+        for pon in range(1, state.SIM_PONS + 1):
+            writer.writerow([PARKS_HOST, pon, "bridge", 200 + pon, f"bridge_vlan_{200 + pon}"])
+            writer.writerow([PARKS_HOST, pon, "router", 300 + pon, f"router_vlan_{300 + pon}"])
+
+
+def waiting_onus(host: str, vendor: str, models: Optional[Tuple[str, ...]] = None,
+                 prefix: Optional[str] = None) -> List[str]:
+    """Serials waiting for authorization on a simulated OLT"""
+    from simulator.state import olt_state
+    with olt_state(host, vendor) as olt:
+        return [serial for serial, onu in olt["unprovisioned"].items()
+                if (models is None or onu["model"] in models) and (prefix is None or serial.startswith(prefix))]
+
+
+def provisioned(host: str, vendor: str, serials: List[str]) -> int:
+    from simulator.state import olt_state
+    with olt_state(host, vendor) as olt:
+        return sum(1 for serial in serials if serial in olt["onts"])
+
+
+def pon_size(host: str, vendor: str, slot: str, pon: str) -> int:
+    from simulator.state import olt_state
+    with olt_state(host, vendor) as olt:
+        return sum(1 for ont in olt["onts"].values() if (ont["slot"], ont["pon"]) == (slot, pon))
+
+
+# Cada cenário prepara as respostas e devolve a função que conta as ONUs atendidas
+
+def scenario_provision(answers: Dict[str, str], migration_size: int) -> Tuple[Callable, Callable[[], int]]:
+    from services.parks_service import provision
+    serial = waiting_onus(PARKS_HOST, "parks", PARKS_BRIDGE_MODELS)[0]
+    answers.update({"serial da ONU": serial, "alias/nome": "bench_parks"})
+    return lambda: provision(PARKS_HOST), lambda: provisioned(PARKS_HOST, "parks", [serial])
+
+
+def scenario_provision_nokia(answers: Dict[str, str], migration_size: int) -> Tuple[Callable, Callable[[], int]]:
+    from services.nokia_service import provision_nokia
+    serial = waiting_onus(NOKIA_HOST, "nokia", NOKIA_BRIDGE_MODELS)[0]
+    answers.update({"serial da ONU": serial, "nome de cadastro": "bench_nokia"})
+    return lambda: provision_nokia(NOKIA_HOST), lambda: provisioned(NOKIA_HOST, "nokia", [serial])
+
+
+def scenario_provision_nokia_tl1(answers: Dict[str, str], migration_size: int) -> Tuple[Callable, Callable[[], int]]:
+    from services.nokia_service import provision_nokia
+    serial = waiting_onus(NOKIA_HOST, "nokia", prefix="ALCL")[0]
+    answers.update({"serial da ONU": serial, "nome de cadastro": "bench_tl1", "modo desejado": "1"})
+    return lambda: provision_nokia(NOKIA_HOST), lambda: provisioned(NOKIA_HOST, "nokia", [serial])
+
+
+def scenario_list_pon_nokia(answers: Dict[str, str], migration_size: int) -> Tuple[Callable, Callable[[], int]]:
+    from services.nokia_service import list_pon_nokia
+    answers.update({"CARD": "1", "PON": "1"})
+    return lambda: list_pon_nokia(NOKIA_HOST), lambda: pon_size(NOKIA_HOST, "nokia", "1", "1")
+
+
+def scenario_list_onu_csv_parks(answers: Dict[str, str], migration_size: int) -> Tuple[Callable, Callable[[], int]]:
+    from services.parks_service import list_onu_csv_parks
+    answers.update({"PON": "1"})
+    return lambda: list_onu_csv_parks(PARKS_HOST), lambda: pon_size(PARKS_HOST, "parks", "0", "1")
+
+
+def scenario_mass_migration_nokia(answers: Dict[str, str], migration_size: int) -> Tuple[Callable, Callable[[], int]]:
+    from services.nokia_service import mass_migration_nokia
+    serials = waiting_onus(NOKIA_HOST, "nokia")[:migration_size]
+    with open(os.path.join("csv", "migration.csv"), "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["serial", "name"])
+        writer.writerows([serial, f"bench_migracao_{i}"] for i, serial in enumerate(serials, start=1))
+    answers.update({"Escolha 1 ou 2": "1"})
+    return lambda: mass_migration_nokia(NOKIA_HOST), lambda: provisioned(NOKIA_HOST, "nokia", serials)
+
+
+SCENARIOS = {
+    "provision": scenario_provision,
+    "provision_nokia": scenario_provision_nokia,
+    "provision_nokia_tl1": scenario_provision_nokia_tl1,
+    "list_pon_nokia": scenario_list_pon_nokia,
+    "list_onu_csv_parks": scenario_list_onu_csv_parks,
+    "mass_migration_nokia": scenario_mass_migration_nokia,
+}
+
+
+def run_flow(name: str, scripted: ScriptedInput, migration_size: int, verbose: bool) -> Dict[str, float]:
+    """Run one flow on cold sessions and return its measurements"""
+    from utils.session_pool import session_pool
+    from utils.instrumentation import operation
+
+    scripted.answers = {}
+    flow, count_onus = SCENARIOS[name](scripted.answers, migration_size)
+    round_trips, sleep, io_wait = meter.snapshot()
+    start = time.perf_counter()
+    with operation(name), open(os.devnull, "w") as devnull, redirect_stdout(sys.stdout if verbose else devnull):
+        flow()
+    wall = time.perf_counter() - start
+    end_round_trips, end_sleep, end_io_wait = meter.snapshot()
+    session_pool.close_all()
+
+    onus = count_onus()
+    return {
+        "wall_s": round(wall, 3),
+        "round_trips": end_round_trips - round_trips,
+        "sleep_s": round(end_sleep - sleep, 3),
+        "io_wait_s": round(end_io_wait - io_wait, 3),
+        "onus": onus,
+        "onus_per_hour": round(onus * 3600 / wall, 1) if wall else 0.0,
+    }
+
+
+def simulator_settings(migration_size: int) -> Dict[str, str]:
+    from simulator import state
+    return {
+        "latency": os.getenv("SIM_LATENCY", str(DEFAULT_LATENCY)),
+        "pon_size": str(state.SIM_PON_SIZE),
+        "ont_up_delay": str(state.SIM_ONT_UP_DELAY),
+        "migration_size": str(migration_size),
+    }
+
+
+def report(results: Dict[str, Dict[str, float]], baseline: Optional[Dict]) -> bool:
+    """Print the results next to the baseline; False when a flow got slower than the tolerance"""
+    previous = (baseline or {}).get("flows", {})
+    ok = True
+    print(f"{'fluxo':<22} {'tempo s':>8} {'idas':>6} {'sleep s':>8} {'E/S s':>7} {'ONUs':>5} "
+          f"{'ONUs/h':>8} {'Δ tempo':>8} {'Δ idas':>7}")
+    print("-" * 88)
+    for name, r in results.items():
+        base = previous.get(name)
+        delta_wall = delta_trips = ""
+        if base and base["wall_s"]:
+            change = r["wall_s"] / base["wall_s"] - 1
+            delta_wall = f"{change:+.0%}"
+            delta_trips = f"{r['round_trips'] - base['round_trips']:+d}"
+            if change > REGRESSION_TOLERANCE:
+                ok = False
+        print(f"{name:<22} {r['wall_s']:>8.2f} {r['round_trips']:>6} {r['sleep_s']:>8.2f} {r['io_wait_s']:>7.2f} "
+              f"{r['onus']:>5} {r['onus_per_hour']:>8.0f} {delta_wall:>8} {delta_trips:>7}")
+    print("\nsleep e E/S somam o tempo de todas as threads (a migração roda PONs em paralelo)")
+    return ok
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Benchmark ponta a ponta dos fluxos contra o simulador de OLT")
+    arg_parser.add_argument("--flows", default=",".join(SCENARIOS), help="fluxos separados por vírgula")
+    arg_parser.add_argument("--migration-size", type=int, default=DEFAULT_MIGRATION_SIZE, help="ONUs na migração em massa")
+    arg_parser.add_argument("--latency", type=float, default=None, help="latência por comando do simulador (s)")
+    arg_parser.add_argument("--baseline", default=BASELINE_PATH, help="arquivo de baseline")
+    arg_parser.add_argument("--save-baseline", action="store_true", help="grava os resultados como nova baseline")
+    arg_parser.add_argument("--keep", action="store_true", help="mantém o diretório de trabalho (logs, CSVs, estado)")
+    arg_parser.add_argument("--verbose", action="store_true", help="mostra a saída dos fluxos")
+    args = arg_parser.parse_args()
+
+    flows = [name.strip() for name in args.flows.split(",") if name.strip()]
+    unknown = [name for name in flows if name not in SCENARIOS]
+    if unknown:
+        arg_parser.error(f"fluxos desconhecidos: {', '.join(unknown)}")
+    if args.latency is not None:
+        os.environ["SIM_LATENCY"] = str(args.latency)
+    os.environ.setdefault("SIM_LATENCY", str(DEFAULT_LATENCY))
+
+    workdir = tempfile.mkdtemp(prefix="porygon-bench-")
+    cwd = os.getcwd()
+    try:
+        # Os drivers leem o ambiente ao serem importados: só depois do prepare_workdir
+        prepare_workdir(workdir, args.migration_size)
+        install_meter()
+        scripted = ScriptedInput()
+        builtins.input = scripted
+        from nokia import nokia_ssh
+        nokia_ssh.ONUListApp.run = lambda self: None  # listagem sem a interface textual
+
+        results = {name: run_flow(name, scripted, args.migration_size, args.verbose) for name in flows}
+        settings = simulator_settings(args.migration_size)
+    finally:
+        os.chdir(cwd)
+        if args.keep:
+            print(f"Diretório de trabalho mantido em {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("settings") != settings:
+            print(f"⚠️ Baseline medida com outro simulador ({baseline.get('settings')}); deltas apenas indicativos")
+
+    ok = report(results, baseline)
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"settings": settings, "flows": results}, f, indent=2)
+            f.write("\n")
+        print(f"Baseline gravada em {args.baseline}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Microbenchmarks for utils.parsers on recorded CLI outputs.
+Each sample is replicated to simulate PON, slot and whole-OLT dumps; the
+time per input line must stay flat as the input grows (linear parsers).
+
+Usage: python -m benchmarks.bench_parsers [--repeat N]
+"""
+
+import os
+import sys
+import time
+import argparse
+from typing import Callable, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import parsers
+
+# Constants
+SAMPLES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "samples")
+SCALES = (1, 16, 128, 2048)  # amostra, PON, slot, OLT inteira
+DEFAULT_REPEAT = 5
+LINEARITY_TOLERANCE = 3.0
+
+
+def load_sample(name: str) -> str:
+    with open(os.path.join(SAMPLES_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def without_lines(text: str, marker: str) -> str:
+    """Drop the lines containing marker (worst case: the parser scans to the end)"""
+    return "\n".join(line for line in text.splitlines() if marker not in line)
+
+
+BENCHMARKS: List[Tuple[str, Callable[[str], object], str]] = [
+    ("nokia unprovision-onu", parsers.parse_unprovisioned_onus, load_sample("nokia_unprovision_onu.txt")),
+    ("nokia ont status pon", parsers.parse_ont_status_table, load_sample("nokia_ont_status_pon.txt")),
+    ("nokia ont position", parsers.parse_ont_position, without_lines(load_sample("nokia_ont_status_pon.txt"), "1/1/1/1/")),
+    ("nokia equip-id", parsers.parse_ont_equip_id, without_lines(load_sample("nokia_ont_interface_detail.txt"), "equip-id")),
+    ("nokia optics detail", parsers.parse_optics_detail, load_sample("nokia_ont_optics_detail.txt")),
+    ("nokia optics (sem temperatura)", parsers.parse_optics_detail,
+     without_lines(load_sample("nokia_ont_optics_detail.txt"), "ont-temperature")),
+    ("parks blacklist", parsers.parse_blacklist, load_sample("parks_blacklist.txt")),
+    ("parks onu model", parsers.parse_onu_models, load_sample("parks_onu_model.txt")),
+    ("parks onu summary", parsers.parse_onu_summary, load_sample("parks_onu_summary.txt")),
+    ("parks running-config alias", parsers.parse_alias_config, load_sample("parks_running_config_gpon.txt")),
+]
+
+
+def best_time(parser: Callable[[str], object], text: str, repeat: int) -> float:
+    """Best wall time of repeat runs, in seconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parser(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(repeat: int) -> bool:
+    linear = True
+    print(f"{'parser':<32} {'escala':>7} {'linhas':>9} {'tempo (ms)':>11} {'ns/linha':>9}")
+    print("-" * 72)
+    for name, parser, sample in BENCHMARKS:
+        per_line = []
+        for scale in SCALES:
+            text = "\n".join([sample] * scale)
+            lines = text.count("\n") + 1
+            elapsed = best_time(parser, text, repeat)
+            per_line.append(elapsed * 1e9 / lines)
+            print(f"{name:<32} {scale:>7} {lines:>9} {elapsed * 1e3:>11.3f} {per_line[-1]:>9.1f}")
+
+        # Custo por linha na maior escala comparado ao de escala de PON
+        growth = per_line[-1] / max(per_line[1], 1e-9)
+        if growth > LINEARITY_TOLERANCE:
+            linear = False
+            print(f"⚠️ {name}: custo por linha cresceu {growth:.1f}x (não linear)")
+        print()
+    return linear
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Microbenchmarks dos parsers de saída das OLTs")
+    arg_parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="execuções por medição")
+    args = arg_parser.parse_args()
+    sys.exit(0 if run(args.repeat) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""
+Offline replay benchmarks of the drivers on recorded session transcripts.
+--record drives each call once against the local OLT simulator with
+TRANSCRIPT_DIR set and keeps the transcripts as the corpus; a normal run
+feeds them back through ReplaySpawn, so login, prompt handling, parsing and
+CSV output are measured with no network and no OLT latency. A call whose
+commands diverge from the transcript is reported as a failure.
+
+Usage: python -m benchmarks.bench_replay --record
+       python -m benchmarks.bench_replay [--calls a,b] [--repeat N]
+"""
+
+import os
+import sys
+import gc
+import json
+import time
+import shutil
+import tempfile
+import argparse
+from contextlib import redirect_stdout
+from typing import Callable, Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Constants
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "transcripts")
+CORPUS_INDEX = "corpus.json"
+DEFAULT_REPEAT = 5
+NOKIA_HOST = "198.51.100.10"
+PARKS_HOST = "198.51.100.20"
+
+# Ambiente do replay: nenhuma sessão real pode ser aberta
+REPLAY_ENV = {
+    "SSH_BINARY": "false", "SSH_MULTIPLEX": "0",
+    "SSH_USER": "replay", "SSH_PASSWORD": "replay", "PORT": "22",
+    "SSH_USER_PARKS": "replay", "SSH_PASSWORD_PARKS": "replay",
+    "LATENCY_REPORT": "", "TRANSCRIPT_DIR": "", "TRANSCRIPT_REPLAY": "",
+}
+
+
+def nokia_login():
+    from nokia.nokia_ssh import login_olt_ssh
+    return login_olt_ssh(NOKIA_HOST)
+
+
+def parks_login():
+    from parks.parks_ssh import login_ssh
+    return login_ssh(PARKS_HOST)
+
+
+def call_nokia_list_unauthorized(child, args):
+    from nokia.nokia_ssh import list_unauthorized
+    return list_unauthorized(child)
+
+
+def call_nokia_list_onu(child, args):
+    from nokia.nokia_ssh import list_onu
+    return list_onu(child, *args)
+
+
+def call_nokia_list_pon(child, args):
+    from nokia import nokia_ssh
+    nokia_ssh.ONUListApp.run = lambda self: None  # listagem sem a interface textual
+    return nokia_ssh.list_pon(child, *args)
+
+
+def call_parks_list_unauthorized(child, args):
+    from parks.parks_ssh import list_unauthorized
+    return list_unauthorized(child)
+
+
+def call_parks_consult_information(child, args):
+    from parks.parks_ssh import consult_information
+    return consult_information(child, *args)
+
+
+def parks_serial() -> List[str]:
+    """A provisioned ONU of the simulated Parks OLT to consult"""
+    from simulator.state import olt_state
+    with olt_state(PARKS_HOST, "parks") as olt:
+        return [next(iter(olt["onts"]))]
+
+
+CALLS: Dict[str, Tuple[Callable, Callable, Callable[[], List[str]]]] = {
+    "nokia_list_unauthorized": (nokia_login, call_nokia_list_unauthorized, lambda: []),
+    "nokia_list_onu": (nokia_login, call_nokia_list_onu, lambda: ["1", "1"]),
+    "nokia_list_pon": (nokia_login, call_nokia_list_pon, lambda: ["1", "1"]),
+    "parks_list_unauthorized": (parks_login, call_parks_list_unauthorized, lambda: []),
+    "parks_consult_information": (parks_login, call_parks_consult_information, parks_serial),
+}
+
+
+def result_size(result) -> int:
+    """Comparable summary of a call result: item count, or 1/0 for flags and objects"""
+    if isinstance(result, (list, dict, tuple)):
+        return len(result)
+    return int(bool(result))
+
+
+def record(corpus_dir: str, calls: List[str]) -> None:
+    """Run each call on a fresh simulator session and keep its transcript"""
+    from benchmarks.bench_flows import prepare_workdir
+
+    workdir = tempfile.mkdtemp(prefix="porygon-replay-")
+    spool = os.path.join(workdir, "transcripts")
+    cwd = os.getcwd()
+    index = {}
+    try:
+        # O diretório de gravação é lido quando utils.transcript é importado
+        prepare_workdir(workdir, 0)
+        os.environ["TRANSCRIPT_DIR"] = spool
+        os.makedirs(corpus_dir, exist_ok=True)
+        for name in calls:
+            login, call, make_args = CALLS[name]
+            args = make_args()
+            child = login()
+            if child is None:
+                raise RuntimeError(f"Falha no login ao gravar {name}")
+            with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+                result = call(child, args)
+            child.close()
+            del child
+            gc.collect()  # fecha a transcrição (weakref.finalize da sessão)
+
+            recorded = sorted(os.listdir(spool))
+            file_name = f"{name}.jsonl.gz"
+            shutil.move(os.path.join(spool, recorded[-1]), os.path.join(corpus_dir, file_name))
+            for leftover in recorded[:-1]:
+                os.remove(os.path.join(spool, leftover))
+            index[name] = {"file": file_name, "args": args, "result_size": result_size(result)}
+            print(f"✅ {name}: transcrição gravada ({result_size(result)} itens)")
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    index_path = os.path.join(corpus_dir, CORPUS_INDEX)
+    if os.path.exists(index_path):
+        with open(index_path, encoding="utf-8") as f:
+            index = {**json.load(f), **index}
+    with open(index_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2)
+        f.write("\n")
+    print(f"Corpus gravado em {corpus_dir}")
+
+
+def replay(corpus_dir: str, calls: List[str], repeat: int) -> bool:
+    """Replay each recorded call repeat times; False on divergence or a different result"""
+    with open(os.path.join(corpus_dir, CORPUS_INDEX), encoding="utf-8") as f:
+        index = json.load(f)
+    missing = [name for name in calls if name not in index]
+    if missing:
+        print(f"❌ Sem transcrição para: {', '.join(missing)} (rode com --record)")
+        return False
+
+    os.environ.update(REPLAY_ENV)
+    workdir = tempfile.mkdtemp(prefix="porygon-replay-")
+    os.environ["PORYGON_DB"] = os.path.join(workdir, "porygon.db")
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    time.sleep = lambda seconds: None  # as esperas dos drivers não fazem sentido sem OLT
+
+    from utils.transcript import load_transcript, replay_library
+    ok = True
+    print(f"{'chamada':<28} {'comandos':>8} {'KiB lidos':>10} {'tempo (ms)':>11} {'MiB/s':>7} {'diverg.':>8} {'resultado':>10}")
+    print("-" * 88)
+    try:
+        for name in calls:
+            entry = index[name]
+            path = os.path.join(corpus_dir, entry["file"])
+            _, events = load_transcript(path)
+            commands = sum(1 for kind, _, _ in events if kind == "s")
+            read_bytes = sum(len(text.encode("utf-8")) for kind, _, text in events if kind == "r")
+            login, call, _ = CALLS[name]
+
+            best, divergences, size = float("inf"), 0, None
+            for _ in range(repeat):
+                replay_library.add(path)
+                start = time.perf_counter()
+                with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+                    child = login()
+                    result = call(child, entry["args"])
+                best = min(best, time.perf_counter() - start)
+                divergences += child.divergences + (0 if child.replayed else 1)
+                size = result_size(result)
+
+            matches = size == entry["result_size"]
+            ok = ok and matches and not divergences
+            print(f"{name:<28} {commands:>8} {read_bytes / 1024:>10.1f} {best * 1e3:>11.2f} "
+                  f"{read_bytes / best / 2 ** 20:>7.1f} {divergences:>8} {'ok' if matches else 'DIFERENTE':>10}")
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+    return ok
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Benchmark offline dos drivers sobre transcrições gravadas")
+    arg_parser.add_argument("--calls", default=",".join(CALLS), help="chamadas separadas por vírgula")
+    arg_parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="repetições por chamada")
+    arg_parser.add_argument("--corpus", default=CORPUS_DIR, help="diretório das transcrições")
+    arg_parser.add_argument("--record", action="store_true", help="grava o corpus contra o simulador de OLT")
+    args = arg_parser.parse_args()
+
+    calls = [name.strip() for name in args.calls.split(",") if name.strip()]
+    unknown = [name for name in calls if name not in CALLS]
+    if unknown:
+        arg_parser.error(f"chamadas desconhecidas: {', '.join(unknown)}")
+
+    if args.record:
+        record(os.path.abspath(args.corpus), calls)
+        return
+    if not os.path.exists(os.path.join(args.corpus, CORPUS_INDEX)):
+        arg_parser.error(f"corpus inexistente em {args.corpus}; grave-o com --record")
+    sys.exit(0 if replay(os.path.abspath(args.corpus), calls, args.repeat) else 1)
+
+
+if __name__ == "__main__":
+    main()
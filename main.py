@@ -12,12 +12,15 @@ from dataclasses import dataclass
 from dotenv import load_dotenv
 from services.parks_service import *
 from services.nokia_service import *
+from services.fleet_service import unauthorized_fleet_scan
+from utils.instrumentation import operation
 from utils.log import get_logger
 
 # Constants
 VENDOR_NOKIA = "nokia"
 VENDOR_PARKS = "parks"
 EXIT_OPTION = "0"
+FLEET_SCAN_OPTION = "3"
 BACK_OPTION = "B"
 MODELS_OPTION = "6"
 SLEEP_SHORT = 1
@@ -231,7 +234,8 @@ def execute_vendor_function(manager: OLTManager, function: Callable, choice: str
             return
 
         logger.info(f"Executando função: {function.__name__}")
-        function(ip_olt=manager.current_olt)
+        with operation(function.__name__):
+            function(ip_olt=manager.current_olt)
         logger.info(f"Concluído: {function.__name__}")
         input("\nPressione Enter para continuar...")
 
@@ -240,6 +244,21 @@ def execute_vendor_function(manager: OLTManager, function: Callable, choice: str
         print(f"❌ Erro na operação: {str(e)}")
         time.sleep(SLEEP_MEDIUM)
 
+def run_fleet_scan() -> None:
+    """Varre todas as OLTs do config.json em busca de ONUs não autorizadas"""
+    olts = [
+        (config.name, config.ip, config.vendor)
+        for vendor in (VENDOR_NOKIA, VENDOR_PARKS)
+        for config in get_olt_configurations(vendor).values()
+    ]
+    try:
+        with operation("unauthorized_fleet_scan"):
+            unauthorized_fleet_scan(olts)
+    except Exception as e:
+        logger.error(f"Erro na varredura da frota: {str(e)}", exc_info=True)
+        print(f"❌ Erro na varredura: {str(e)}")
+    input("\nPressione Enter para continuar...")
+
 def handle_vendor_menu(manager: OLTManager, vendor: str) -> None:
     """Menu específico para cada fabricante"""
     menu_options = get_vendor_menu_options()
@@ -278,6 +297,7 @@ def main() -> None:
     vendor_options = {
         '1': "NOKIA",
         '2': "PARKS",
+        FLEET_SCAN_OPTION: "ONUs NÃO AUTORIZADAS (TODAS AS OLTs)",
         '0': "Sair"
     }
 
@@ -291,7 +311,9 @@ def main() -> None:
                 print("Saindo...")
                 break
 
-            if choice in vendor_options:
+            if choice == FLEET_SCAN_OPTION:
+                run_fleet_scan()
+            elif choice in vendor_options:
                 vendor = vendor_options[choice].lower()
                 if get_olt_connection(manager, vendor):
                     handle_vendor_menu(manager, vendor)
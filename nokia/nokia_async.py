@@ -0,0 +1,163 @@
+"""
+Nokia OLT asyncio driver module.
+Async counterparts of the SSH/TL1 login and query functions, sharing the
+parsers of nokia_ssh so both paths read the CLI the same way.
+"""
+
+import os
+from typing import List, Optional, Tuple
+
+import pexpect
+from dotenv import load_dotenv
+from utils.log import get_logger
+from utils.async_session import AsyncSession, spawn_ssh_async
+from utils.parsers import parse_unprovisioned_onus
+
+# Constants
+DEFAULT_TIMEOUT = 10
+EXTENDED_TIMEOUT = 30
+CLI_PROMPT = r"typ:isadmin>#"
+TL1_PROMPT = "<"
+
+logger = get_logger(__name__)
+
+# Carrega variáveis do arquivo .env
+load_dotenv()
+
+SSH_USER = os.getenv('SSH_USER')
+SSH_PASSWORD = os.getenv('SSH_PASSWORD')
+SSH_PORT = os.getenv('PORT')
+
+
+async def login_olt_ssh_async(host: str) -> Optional[AsyncSession]:
+    """Estabelece conexão SSH assíncrona com a OLT"""
+    if not all([SSH_USER, host, SSH_PASSWORD, SSH_PORT]):
+        error_msg = "Variáveis de ambiente não configuradas corretamente"
+        logger.error(error_msg)
+        raise ValueError(error_msg)
+
+    session = None
+    try:
+        logger.info(f"Conectando à OLT (async) | Usuário: {SSH_USER} | OLT: {host}")
+        session = await spawn_ssh_async(SSH_USER, host, SSH_PORT, timeout=EXTENDED_TIMEOUT)
+
+        index = await session.expect([
+            "password:",
+            "Are you sure you want to continue connecting",
+            pexpect.TIMEOUT,
+            CLI_PROMPT
+        ], timeout=DEFAULT_TIMEOUT)
+
+        if index == 1:
+            await session.sendline("yes")
+            await session.expect("password:", timeout=DEFAULT_TIMEOUT)
+
+        if index == 3:
+            login_success = 0
+        else:
+            await session.sendline(SSH_PASSWORD)
+            login_success = await session.expect([
+                CLI_PROMPT,
+                pexpect.TIMEOUT,
+                pexpect.EOF
+            ], timeout=DEFAULT_TIMEOUT)
+
+        if login_success != 0:
+            logger.error(f"Falha na autenticação SSH em {host}")
+            await session.close()
+            return None
+
+        await session.send_command("environment inhibit-alarms", "#")
+        await session.send_command("exit", "#")
+        logger.info(f"Autenticado com sucesso na OLT {host} (async)")
+        return session
+
+    except (pexpect.EOF, pexpect.TIMEOUT, pexpect.exceptions.ExceptionPexpect) as e:
+        logger.error(f"Erro de conexão SSH com {host}: {e}")
+        if session:
+            await session.close()
+        return None
+    except BaseException:
+        # Cancelamento (timeout da varredura) no meio do login: encerra o ssh antes de propagar
+        if session:
+            await session.close()
+        raise
+
+
+async def login_olt_tl1_async(host: str) -> Optional[AsyncSession]:
+    """Estabelece conexão TL1 assíncrona com a OLT"""
+    tl1_user = os.getenv('TL1_USER')
+    tl1_passwd = os.getenv('TL1_PASSWORD')
+    tl1_port = os.getenv('TL1_PORT')
+
+    if not all([tl1_user, tl1_passwd, host, tl1_port]):
+        logger.error("Erro de configuração TL1: variáveis de ambiente não encontradas")
+        raise ValueError("Erro de configuração TL1: variáveis de ambiente não encontradas")
+
+    session = None
+    try:
+        logger.info(f"Conectando TL1 (async), usuário: {tl1_user} | OLT: {host}")
+        session = await spawn_ssh_async(tl1_user, host, tl1_port, timeout=EXTENDED_TIMEOUT, protocol="tl1")
+
+        index = await session.expect([
+            "password:",
+            "Are you sure you want to continue connecting",
+            "Permission denied",
+            pexpect.TIMEOUT,
+            "Welcome to ISAM"
+        ], timeout=DEFAULT_TIMEOUT)
+
+        if index == 1:
+            await session.sendline("yes")
+            await session.expect("password:", timeout=DEFAULT_TIMEOUT)
+        elif index in (2, 3):
+            logger.error(f"TL1: Falha na conexão com {host}")
+            await session.close()
+            return None
+
+        if index != 4:
+            await session.sendline(tl1_passwd)
+            if await session.expect([
+                "Welcome to ISAM",
+                "Permission denied",
+                pexpect.TIMEOUT,
+                pexpect.EOF
+            ], timeout=DEFAULT_TIMEOUT) != 0:
+                logger.error(f"TL1: Falha na autenticação em {host}")
+                await session.close()
+                return None
+
+        await session.send_command("", TL1_PROMPT, timeout=5)
+        await session.send_command('INH-MSG-ALL::ALL:::;', "COMPLD")
+        logger.info(f"TL1: Login bem-sucedido em {host} (async)")
+        return session
+
+    except (pexpect.EOF, pexpect.TIMEOUT, pexpect.exceptions.ExceptionPexpect) as e:
+        logger.error(f"Falha na conexão TL1 com {host}: {e}")
+        if session:
+            await session.close()
+        return None
+    except BaseException:
+        # Cancelamento (timeout da varredura) no meio do login: encerra o ssh antes de propagar
+        if session:
+            await session.close()
+        raise
+
+
+async def logoff_tl1_async(session: AsyncSession) -> None:
+    """Encerra a sessão TL1 com LOGOFF antes de finalizar o processo"""
+    try:
+        if session.isalive():
+            await session.send_command("LOGOFF;", "COMPLD", timeout=3)
+    except Exception as e:
+        logger.error(f"Erro no comando LOGOFF: {str(e)}")
+    finally:
+        await session.close()
+
+
+async def list_unauthorized_async(session: AsyncSession) -> List[Tuple[str, str, str]]:
+    """Lista as ONUs não autorizadas na OLT sem bloquear o loop de eventos"""
+    output = await session.send_command("show pon unprovision-onu", CLI_PROMPT, timeout=EXTENDED_TIMEOUT)
+    onu_list = parse_unprovisioned_onus(output)
+    logger.info(f"{session.host}: {len(onu_list)} ONUs não autorizadas")
+    return onu_list
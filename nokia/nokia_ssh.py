@@ -4,17 +4,26 @@ Provides functions for SSH connection, ONU provisioning, and monitoring.
 """
 
 import os
+import logging
 import time
 import re
 import csv
 import pyperclip
 import xml.etree.ElementTree as ET
-from typing import List, Tuple, Optional, Dict, Any
+from typing import List, Tuple, Optional, Dict, Any, Iterator
 from contextlib import contextmanager
 
 import pexpect
 from dotenv import load_dotenv
-from utils.log import get_logger
+from utils.log import get_logger, log_raw
+from utils.session_pool import session_pool, prompt_health_check, drain_output, mark_dirty
+from utils.completion import wait_until
+from utils.ssh_transport import spawn_ssh
+from utils.inventory import record_pon
+from utils.occupancy import occupancy_cache
+from utils.reservations import reserve_position, confirm_reservation, release_reservation, RESERVATION_TTL
+from utils.parsers import (parse_unprovisioned_onus, parse_ont_position, parse_ont_status_table,
+                           parse_ont_equip_id, parse_optics_detail)
 from textual.app import App, ComposeResult
 from textual.widgets import DataTable, Header, Footer
 from rich.text import Text
@@ -24,11 +33,21 @@ from rich.text import Text
 DEFAULT_TIMEOUT = 10
 EXTENDED_TIMEOUT = 30
 STABILIZATION_WAIT_TIME = 3
-DISCOVERY_WAIT_TIME = 5
+XML_END_TAG = "</runtime-data>"
+XML_READ_SIZE = 8192
+XML_PREFIX_WINDOW = 16
 PON_CAPACITY = 128
 MAX_MAC_ADDRESSES = 4
 COMMITTED_MAC_ADDRESSES = 1
 EXTENDED_MAC_ADDRESSES = 10
+SSH_PROTOCOL = "nokia_ssh"
+ONT_READY_TIMEOUT = 20
+READY_POLL_INTERVAL = 2
+READY_POLL_BACKOFF = 1.5
+READY_POLL_MAX_INTERVAL = 8
+# Prompt do ISAM em qualquer nível: typ:isadmin># ou typ:isadmin>configure>...$
+CLI_PROMPT_PATTERN = r"typ:[^\r\n]*?[#$]"
+CLI_ERROR_PATTERN = re.compile(r"(?im)^.*(error\s*:|invalid token|command is not complete|not allowed).*$")
 
 # Logger configuration
 logger = get_logger(__name__)
@@ -39,6 +58,7 @@ load_dotenv()
 SSH_USER = os.getenv('SSH_USER')
 SSH_PASSWORD = os.getenv('SSH_PASSWORD')
 SSH_PORT = os.getenv('PORT')
+NOKIA_PIPELINE = os.getenv('NOKIA_PIPELINE', '1').lower() not in ('0', 'false', 'no')
 
 class ONUListApp(App):
     def __init__(self, data, **kwargs):
@@ -106,14 +126,13 @@ def login_olt_ssh(host: str = None) -> Optional[pexpect.spawn]:
             raise ValueError(error_msg)
 
         logger.info(f"Conectando à OLT | Usuário: {SSH_USER} | OLT: {host}")
-        child = pexpect.spawn(f"ssh {SSH_USER}@{host} -p {SSH_PORT}", 
-                                encoding='utf-8', 
-                                timeout=EXTENDED_TIMEOUT)
+        child = spawn_ssh(SSH_USER, host, SSH_PORT, timeout=EXTENDED_TIMEOUT)
 
         index = child.expect([
             "password:", 
             "Are you sure you want to continue connecting", 
-            pexpect.TIMEOUT
+            pexpect.TIMEOUT,
+            r"typ:isadmin>#"
         ], timeout=DEFAULT_TIMEOUT)
 
         if index == 1:
@@ -121,14 +140,19 @@ def login_olt_ssh(host: str = None) -> Optional[pexpect.spawn]:
             child.sendline("yes")
             child.expect("password:")
 
-        logger.debug("Enviando senha SSH")
-        child.sendline(SSH_PASSWORD)
+        if index == 3:
+            # Canal aberto sobre a conexão mestre já autenticada
+            logger.debug("Sessão SSH multiplexada - autenticação reaproveitada")
+            login_success = 0
+        else:
+            logger.debug("Enviando senha SSH")
+            child.sendline(SSH_PASSWORD)
 
-        login_success = child.expect([
-            r"typ:isadmin>#", 
-            pexpect.TIMEOUT, 
-            pexpect.EOF
-        ], timeout=DEFAULT_TIMEOUT)
+            login_success = child.expect([
+                r"typ:isadmin>#", 
+                pexpect.TIMEOUT, 
+                pexpect.EOF
+            ], timeout=DEFAULT_TIMEOUT)
 
         if login_success == 0:
             logger.info(f"Autenticado com sucesso na OLT {host}")
@@ -158,6 +182,14 @@ def login_olt_ssh(host: str = None) -> Optional[pexpect.spawn]:
     
     return None
 
+def pooled_ssh_session(host: str):
+    """Lend a pooled SSH session for the OLT, logging in only when needed"""
+    return session_pool.session(
+        host, SSH_PROTOCOL,
+        factory=lambda h: login_olt_ssh(host=h),
+        health_check=prompt_health_check("#", command="exit all"),
+    )
+
 def check_onu_position(child: pexpect.spawn, serial: str) -> Optional[Tuple[str, str, str]]:
     """Check ONU position on the OLT"""
     try:
@@ -166,14 +198,14 @@ def check_onu_position(child: pexpect.spawn, serial: str) -> Optional[Tuple[str,
         child.expect("#", timeout=EXTENDED_TIMEOUT )
         output = child.before
 
-        match = re.search(r"(\d+)\/(\d+)\/(\d+)\/(\d+)\/(\d+)", output)
-        if not match:
+        found = parse_ont_position(output)
+        if not found:
             msg = "ONU não encontrada na OLT. Verifique o serial informado."
             logger.warning(msg)
             print(f"❌ {msg}")
             return None
 
-        slot, pon, position = match.group(3), match.group(4), match.group(5)
+        slot, pon, position = found
         logger.info(f"ONU detectada: Slot {slot}, PON {pon}, Posição {position}")
         print("✅ ONU detectada.")
         return slot, pon, position
@@ -199,21 +231,7 @@ def list_unauthorized(child: pexpect.spawn) -> List[Tuple[str, str, str]]:
         time.sleep(STABILIZATION_WAIT_TIME)
         child.expect("#", timeout=DEFAULT_TIMEOUT)
         output = child.before.decode('utf-8', errors='ignore') if isinstance(child.before, bytes) else child.before
-        
-        lines = output.splitlines()
-        for line in lines:
-            if "1/1/" in line:
-                parts = line.strip().split()
-                for idx, part in enumerate(parts):
-                    if "1/1/" in part:
-                        try:
-                            slot = part.split('/')[2]
-                            pon = part.split('/')[3]
-                            serial = parts[idx + 1]
-                            onu_list.append((serial.strip(), slot, pon))
-                        except (IndexError, ValueError) as e:
-                            logger.warning(f"Erro ao processar linha: '{line}' -> {e}")
-                            continue
+        onu_list = parse_unprovisioned_onus(output)
         
         # Exibe a lista formatada
         if onu_list:
@@ -246,12 +264,11 @@ def return_signal_temp(child: pexpect.spawn, slot: str, pon: str, position: str)
         child.sendline(f"show equipment ont optics 1/1/{slot}/{pon}/{position} detail")
         child.expect("#", timeout=DEFAULT_TIMEOUT)
         sinal_temp = child.before.strip()
-        logger.debug(f"Saída do comando optics: {sinal_temp}")
+        log_raw(logger, "Saída do comando optics", sinal_temp)
 
-        match = re.search(r"rx-signal-level\s*:\s*(-\d+\.\d{2}).*?ont-temperature\s*:\s*(\d{2})", sinal_temp, re.DOTALL)
-        if match:
-            rx_signal = match.group(1)
-            temperature = match.group(2)
+        reading = parse_optics_detail(sinal_temp)
+        if reading:
+            rx_signal, temperature = reading
             logger.info(f"Sinal: {rx_signal} dBm | Temperatura: {temperature} ºC")
             print(f"Sinal: {rx_signal}dBm\nTemperatura: {temperature}ºC")
             return True
@@ -269,29 +286,54 @@ def return_signal_temp(child: pexpect.spawn, slot: str, pon: str, position: str)
         print(f"❌ Erro: {e}")
         return False
 
-def checkfreeposition(child: pexpect.spawn, slot: str, pon: str) -> int:
-    """Check free position on PON"""
-    logger.info(f"Verificando posição livre na PON {slot}/{pon}")
-    posocupadas = []
-    capacidade_pon = range(1, PON_CAPACITY + 1)  # 1 até 128 inclusive
-
+def verify_onu_position(child: pexpect.spawn, serial_ssh: str, slot: str, pon: str, position: str) -> bool:
+    """Confirm with one targeted query that the serial is at the given ONT position"""
+    ont_path = f"1/1/{slot}/{pon}/{position}"
     try:
-        child.sendline(f'show equipment ont status pon 1/1/{slot}/{pon}')
-        child.expect('#', timeout=DEFAULT_TIMEOUT)
+        child.sendline(f"show equipment ont status pon 1/1/{slot}/{pon} | match exact:{ont_path}")
+        child.expect("#", timeout=DEFAULT_TIMEOUT)
+        expected = serial_ssh.replace(":", "").upper()
+        return any(
+            row.ont_path == ont_path and row.serial.replace(":", "").upper() == expected
+            for row in parse_ont_status_table(child.before)
+        )
+    except pexpect.exceptions.ExceptionPexpect as e:
+        logger.warning(f"Falha ao confirmar posição da ONT {ont_path}: {e}")
+        return False
 
-        saida = child.before.decode() if isinstance(child.before, bytes) else child.before
-        linhas = saida.splitlines()
+def occupied_positions(child: pexpect.spawn, slot: str, pon: str) -> List[int]:
+    """List the ONT positions currently in use on a PON"""
+    child.sendline(f'show equipment ont status pon 1/1/{slot}/{pon}')
+    child.expect('#', timeout=DEFAULT_TIMEOUT)
 
-        for line in linhas:
-            if f'1/1/{slot}/{pon}/' in line:
-                try:
-                    partes = line.split()
-                    if len(partes) >= 2:
-                        ont_path = partes[1]  # Ex: '1/1/1/1/1'
-                        pos = int(ont_path.split('/')[4])
-                        posocupadas.append(pos)
-                except (IndexError, ValueError):
-                    continue
+    saida = child.before.decode() if isinstance(child.before, bytes) else child.before
+    prefixo = f'1/1/{slot}/{pon}/'
+    return [row.position for row in parse_ont_status_table(saida) if row.ont_path.startswith(prefixo)]
+
+def checkfreeposition(child: pexpect.spawn, slot: str, pon: str, ip_olt: Optional[str] = None) -> int:
+    """Check free position on PON.
+
+    With ip_olt the position comes from the cached PON bitmap, skipping positions
+    leased by other flows, and is leased and marked as assigned; confirm_position
+    keeps it after provisioning and release_position gives it back.
+    """
+    logger.info(f"Verificando posição livre na PON {slot}/{pon}")
+
+    try:
+        if ip_olt:
+            chave = (ip_olt, str(slot), str(pon))
+            carregar = lambda: occupied_positions(child, slot, pon)
+            # Lista a PON antes de reservar: a transação de reserva não espera pela OLT
+            occupancy_cache.load(chave, carregar)
+            menorposlivre = reserve_position(
+                ip_olt, slot, pon,
+                choose=lambda reservadas: occupancy_cache.allocate(chave, carregar, exclude=reservadas),
+            )
+            logger.info(f"Menor posição livre encontrada: {menorposlivre}")
+            return menorposlivre
+
+        capacidade_pon = range(1, PON_CAPACITY + 1)  # 1 até 128 inclusive
+        posocupadas = occupied_positions(child, slot, pon)
 
         posicoes_livres = sorted(set(capacidade_pon) - set(posocupadas))
         if not posicoes_livres:
@@ -305,6 +347,51 @@ def checkfreeposition(child: pexpect.spawn, slot: str, pon: str) -> int:
         logger.error(f"Erro ao validar posição livre: {e}")
         raise
 
+def confirm_position(ip_olt: str, slot: str, pon: str, position: str) -> None:
+    """Keep the lease of a provisioned position until other flows re-read the PON"""
+    confirm_reservation(ip_olt, slot, pon, int(position))
+
+def hold_position(ip_olt: str, slot: str, pon: str, position: str, hold: float = RESERVATION_TTL) -> None:
+    """Extend the lease of a position allocated now but provisioned later (queued for TL1)"""
+    confirm_reservation(ip_olt, slot, pon, int(position), hold=hold)
+
+def release_position(ip_olt: str, slot: str, pon: str, position: str) -> None:
+    """Return a position to the cached PON bitmap and drop its lease"""
+    occupancy_cache.release((ip_olt, str(slot), str(pon)), int(position))
+    release_reservation(ip_olt, slot, pon, int(position))
+
+def invalidate_pon_occupancy(ip_olt: str, slot: str, pon: str) -> None:
+    """Drop the cached bitmap so the next allocation re-reads the PON from the OLT"""
+    occupancy_cache.invalidate((ip_olt, str(slot), str(pon)))
+
+def ont_oper_up(child: pexpect.spawn, slot: str, pon: str, position: str) -> bool:
+    """Check whether the ONT reports oper-status up on the PON status table"""
+    ont_path = f"1/1/{slot}/{pon}/{position}"
+    try:
+        child.sendline(f"show equipment ont status pon 1/1/{slot}/{pon} | match exact:{ont_path}")
+        child.expect("#", timeout=DEFAULT_TIMEOUT)
+        for row in parse_ont_status_table(child.before):
+            if row.ont_path == ont_path:
+                return row.oper_status.lower() == "up"
+        return False
+    except pexpect.exceptions.ExceptionPexpect as e:
+        logger.warning(f"Falha ao consultar estado da ONT {ont_path}: {e}")
+        return False
+
+def wait_ont_ready_ssh(child: pexpect.spawn, slot: str, pon: str, position: str,
+                       timeout: int = ONT_READY_TIMEOUT) -> bool:
+    """Poll the ONT oper-status with backoff until it is up or the deadline expires"""
+    logger.info(f"Aguardando ONT 1/1/{slot}/{pon}/{position} ficar UP (até {timeout}s)")
+    start = time.monotonic()
+    is_ready = bool(wait_until(lambda: ont_oper_up(child, slot, pon, position), timeout,
+                               interval=READY_POLL_INTERVAL, backoff=READY_POLL_BACKOFF,
+                               max_interval=READY_POLL_MAX_INTERVAL))
+    if is_ready:
+        logger.info(f"ONT UP após {time.monotonic() - start:.1f}s")
+    else:
+        logger.warning(f"ONT 1/1/{slot}/{pon}/{position} não ficou UP em {timeout}s")
+    return is_ready
+
 def add_to_pon(child: pexpect.spawn, slot: str, pon: str, position: str, 
                 serial: str, name: str, desc2: str) -> bool:
     """Add ONU to PON for initial provisioning"""
@@ -328,9 +415,10 @@ def add_to_pon(child: pexpect.spawn, slot: str, pon: str, position: str,
         logger.info("Enviando comando: exit all")
         child.expect("#")  # Espera pelo prompt #
         
+        if not wait_ont_ready_ssh(child, slot, pon, position):
+            print("❗ A ONU não ficou UP no tempo limite")
+            return False
         logger.info("ONU está UP e pronta para uso.")
-        logger.info("Aguardando 20 segundos para estabilidade...")
-        time.sleep(20)
         
         return True
         
@@ -348,14 +436,13 @@ def onu_model(child: pexpect.spawn, slot: str, pon: str, position: str) -> Optio
         output = child.before.strip()
         
         # Procura pelo padrão do modelo no output
-        match = re.search(r"equip-id\s*:\s*([^\n\r]+?)(?=\s{2,}|$)", output, re.MULTILINE)
+        model = parse_ont_equip_id(output)
 
-        if not match:
+        if not model:
             logger.warning("Modelo da ONU não encontrado na saída do comando")
             print("❗ Modelo da ONU não encontrado")
             return None
             
-        model = match.group(1).strip()
         logger.info(f"Modelo detectado: {model}")
         print(f"✅ Modelo detectado: {model}")
         return model
@@ -373,6 +460,92 @@ def onu_model(child: pexpect.spawn, slot: str, pon: str, position: str) -> Optio
         print(f"❗ Erro inesperado: {str(e)}")
         return None
 
+def _command_output(child: pexpect.spawn) -> str:
+    return child.before.decode('utf-8', errors='ignore') if isinstance(child.before, bytes) else child.before
+
+def _echo_pattern(cmd: str) -> str:
+    """Pattern of a command's echo, tolerant to the CLI re-wrapping the line at spaces"""
+    return r"\s+".join(re.escape(word) for word in cmd.split())
+
+def _recover_cli(child: pexpect.spawn, pending: List[str], prompt_pending: bool) -> None:
+    """Read through the commands still in flight and return to the base prompt.
+
+    The session is flagged dirty when the CLI doesn't answer, so the pool
+    closes it instead of lending it with unread output.
+    """
+    try:
+        for cmd in pending:
+            child.expect(_echo_pattern(cmd), timeout=DEFAULT_TIMEOUT)
+            prompt_pending = True
+        if prompt_pending:
+            child.expect(CLI_PROMPT_PATTERN, timeout=DEFAULT_TIMEOUT)
+        child.sendline("exit all")
+        child.expect(_echo_pattern("exit all"), timeout=DEFAULT_TIMEOUT)
+        child.expect(r"#\s*$", timeout=DEFAULT_TIMEOUT)
+    except (pexpect.TIMEOUT, pexpect.EOF) as e:
+        logger.warning(f"Não foi possível restaurar o prompt após falha, descartando a sessão: {e}")
+        mark_dirty(child)
+
+def run_command_block(child: pexpect.spawn, comandos: List[Tuple[str, str]],
+                      pipeline: Optional[bool] = None) -> bool:
+    """Run a block of (command, description) pairs, pipelined when enabled.
+
+    Each command's output is the text between its echo and the next prompt
+    (or the next command's echo), so a command printing an extra prompt or
+    none still has its errors blamed on the right line.
+
+    Pipelined mode writes the whole block at once: when a line fails, the
+    lines after it were already sent and still run on the OLT before the
+    session is brought back to the base prompt. With NOKIA_PIPELINE=0 the
+    block stops at the first rejected line.
+    """
+    if pipeline is None:
+        pipeline = NOKIA_PIPELINE
+
+    if pipeline:
+        child.send("".join(f"{cmd}{child.linesep}" for cmd, _ in comandos))
+        logger.info(f"Bloco de {len(comandos)} comandos enviado em pipeline")
+
+    def fail(idx: int, echoed: int, prompt_pending: bool) -> bool:
+        """Recover the CLI after line idx failed; echoed = echoes already read"""
+        cmd, descricao = comandos[idx - 1]
+        print(f"Houve um problema durante: {descricao} (linha {idx}: {cmd})")
+        pending = [c for c, _ in comandos[echoed:]] if pipeline else []
+        _recover_cli(child, pending, prompt_pending)
+        return False
+
+    echoed = 0
+    for idx, (cmd, descricao) in enumerate(comandos, start=1):
+        next_echo = _echo_pattern(comandos[idx][0]) if pipeline and idx < len(comandos) else None
+        try:
+            if not pipeline:
+                child.sendline(cmd)
+            logger.info(f"Enviando comando: {descricao} -> {cmd}")
+            if echoed < idx:
+                child.expect(_echo_pattern(cmd), timeout=DEFAULT_TIMEOUT)
+                echoed = idx
+                # Saída após o prompt da linha anterior ainda pertence a ela
+                late = CLI_ERROR_PATTERN.search(_command_output(child)) if idx > 1 else None
+                if late:
+                    logger.error(f"OLT rejeitou a linha {idx - 1} '{comandos[idx - 2][0]}': {late.group(0).strip()}")
+                    return fail(idx - 1, echoed, True)
+            patterns = [CLI_PROMPT_PATTERN] + ([next_echo] if next_echo else [])
+            if child.expect(patterns, timeout=DEFAULT_TIMEOUT) == 1:
+                # Sem prompt próprio: a saída vai até o eco da linha seguinte
+                echoed = idx + 1
+        except (pexpect.TIMEOUT, pexpect.EOF) as e:
+            logger.error(f"Erro ao executar comando '{descricao}' (linha {idx}): {e}")
+            return fail(idx, echoed, echoed == idx)
+
+        error = CLI_ERROR_PATTERN.search(_command_output(child))
+        if error:
+            logger.error(f"OLT rejeitou a linha {idx} '{cmd}' ({descricao}): {error.group(0).strip()}")
+            return fail(idx, echoed, echoed > idx)
+
+        logger.info(f"Comando concluído com sucesso: {descricao}")
+
+    return True
+
 def auth_group01_ssh(child: pexpect.spawn, slot: str, pon: str, position: str, vlan: str) -> bool:
     """SSH authentication for Group 01 ONUs"""
     logger.info("Iniciando autorização do grupo 01 via SSH")
@@ -383,27 +556,19 @@ def auth_group01_ssh(child: pexpect.spawn, slot: str, pon: str, position: str, v
         logger.warning(f"Problema ao esperar: {e}")
 
     comandos = [
-        (f"configure equipment ont slot 1/1/{slot}/{pon}/{position}/1 plndnumdataports 1 plndnumvoiceports 0 planned-card-type ethernet admin-state up", "$", "Configurar slot da ONT"),
-        (f"configure interface port uni:1/1/{slot}/{pon}/{position}/1/1 admin-up", "#", "Habilitar porta UNI"),
-        (f"configure qos interface 1/1/{slot}/{pon}/{position}/1/1 upstream-queue 0 bandwidth-profile name:HSI_1G_UP", "#", "Configurar QoS na porta UNI"),
-        ("exit all", "#", "Sair do modo de configuração"),
-        (f"configure bridge port 1/1/{slot}/{pon}/{position}/1/1 max-unicast-mac {MAX_MAC_ADDRESSES} max-committed-mac {COMMITTED_MAC_ADDRESSES}", "$", "Configurar limite de MACs na bridge"),
-        (f"configure bridge port 1/1/{slot}/{pon}/{position}/1/1 vlan-id {vlan} tag untagged", "$", "Atribuir VLAN à porta bridge (untagged)"),
-        ("exit all", "#", "Sair do modo de configuração"),
-        (f"configure bridge port 1/1/{slot}/{pon}/{position}/1/1 pvid {vlan}", "#", "Definir PVID na porta bridge"),
-        ("pvid-tagging-flag onu", "#", "Configurar pvid-tagging-flag para ONU"),
+        (f"configure equipment ont slot 1/1/{slot}/{pon}/{position}/1 plndnumdataports 1 plndnumvoiceports 0 planned-card-type ethernet admin-state up", "Configurar slot da ONT"),
+        (f"configure interface port uni:1/1/{slot}/{pon}/{position}/1/1 admin-up", "Habilitar porta UNI"),
+        (f"configure qos interface 1/1/{slot}/{pon}/{position}/1/1 upstream-queue 0 bandwidth-profile name:HSI_1G_UP", "Configurar QoS na porta UNI"),
+        ("exit all", "Sair do modo de configuração"),
+        (f"configure bridge port 1/1/{slot}/{pon}/{position}/1/1 max-unicast-mac {MAX_MAC_ADDRESSES} max-committed-mac {COMMITTED_MAC_ADDRESSES}", "Configurar limite de MACs na bridge"),
+        (f"configure bridge port 1/1/{slot}/{pon}/{position}/1/1 vlan-id {vlan} tag untagged", "Atribuir VLAN à porta bridge (untagged)"),
+        ("exit all", "Sair do modo de configuração"),
+        (f"configure bridge port 1/1/{slot}/{pon}/{position}/1/1 pvid {vlan}", "Definir PVID na porta bridge"),
+        ("pvid-tagging-flag onu", "Configurar pvid-tagging-flag para ONU"),
     ]
 
-    for cmd, prompt, descricao in comandos:
-        try:
-            child.sendline(cmd)
-            logger.info(f"Enviando comando: {descricao} -> {cmd}")
-            child.expect(prompt, timeout=DEFAULT_TIMEOUT)
-            logger.info(f"Comando concluído com sucesso: {descricao}")
-        except Exception as e:
-            logger.error(f"Erro ao executar comando '{descricao}': {e}")
-            print(f"Houve um problema durante: {descricao}")
-            return False
+    if not run_command_block(child, comandos):
+        return False
 
     logger.info("Configuração do grupo 01 concluída com sucesso.")
     return True
@@ -418,27 +583,19 @@ def auth_group02_ssh(child: pexpect.spawn, slot: str, pon: str, position: str, v
         logger.warning(f"Problema ao aguardar: {e}")
 
     comandos = [
-        (f"configure equipment ont slot 1/1/{slot}/{pon}/{position}/1 plndnumdataports 1 plndnumvoiceports 0 planned-card-type ethernet admin-state up", "$", "Configurar slot da ONT"),
-        (f"configure interface port uni:1/1/{slot}/{pon}/{position}/1/1 admin-up", "#", "Habilitar porta UNI"),
-        (f"configure qos interface 1/1/{slot}/{pon}/{position}/1/1 upstream-queue 0 bandwidth-profile name:HSI_1G_UP", "#", "Configurar QoS na porta UNI"),
-        ("exit all", "#", "Sair do modo de configuração"),
-        (f"configure bridge port 1/1/{slot}/{pon}/{position}/1/1 max-unicast-mac {MAX_MAC_ADDRESSES} max-committed-mac {COMMITTED_MAC_ADDRESSES}", "$", "Configurar limite de MACs na bridge"),
-        (f"configure bridge port 1/1/{slot}/{pon}/{position}/1/1 vlan-id {vlan} tag untagged", "$", "Atribuir VLAN à porta bridge (untagged)"),
-        ("exit all", "#", "Sair do modo de configuração"),
-        (f"configure bridge port 1/1/{slot}/{pon}/{position}/1/1 pvid {vlan}", "#", "Definir PVID na porta bridge"),
-        ("pvid-tagging-flag olt", "#", "Configurar pvid-tagging-flag para OLT"),
+        (f"configure equipment ont slot 1/1/{slot}/{pon}/{position}/1 plndnumdataports 1 plndnumvoiceports 0 planned-card-type ethernet admin-state up", "Configurar slot da ONT"),
+        (f"configure interface port uni:1/1/{slot}/{pon}/{position}/1/1 admin-up", "Habilitar porta UNI"),
+        (f"configure qos interface 1/1/{slot}/{pon}/{position}/1/1 upstream-queue 0 bandwidth-profile name:HSI_1G_UP", "Configurar QoS na porta UNI"),
+        ("exit all", "Sair do modo de configuração"),
+        (f"configure bridge port 1/1/{slot}/{pon}/{position}/1/1 max-unicast-mac {MAX_MAC_ADDRESSES} max-committed-mac {COMMITTED_MAC_ADDRESSES}", "Configurar limite de MACs na bridge"),
+        (f"configure bridge port 1/1/{slot}/{pon}/{position}/1/1 vlan-id {vlan} tag untagged", "Atribuir VLAN à porta bridge (untagged)"),
+        ("exit all", "Sair do modo de configuração"),
+        (f"configure bridge port 1/1/{slot}/{pon}/{position}/1/1 pvid {vlan}", "Definir PVID na porta bridge"),
+        ("pvid-tagging-flag olt", "Configurar pvid-tagging-flag para OLT"),
     ]
 
-    for cmd, prompt, descricao in comandos:
-        try:
-            child.sendline(cmd)
-            logger.info(f"Enviando comando: {descricao} -> {cmd}")
-            child.expect(prompt, timeout=DEFAULT_TIMEOUT)
-            logger.info(f"Comando concluído com sucesso: {descricao}")
-        except Exception as e:
-            logger.error(f"Erro ao executar comando '{descricao}': {e}")
-            print(f"Houve um problema durante: {descricao}")
-            return False
+    if not run_command_block(child, comandos):
+        return False
 
     logger.info("Configuração do grupo 02 concluída com sucesso.")
     return True
@@ -453,29 +610,21 @@ def auth_group03_ssh(child: pexpect.spawn, slot: str, pon: str, position: str, v
         logger.warning(f"Problema ao aguardar: {e}")
 
     comandos = [
-        (f"configure qos interface ont:1/1/{slot}/{pon}/{position} ds-queue-sharing", "$", "Configurar qos da ONT"),
-        ("exit all", "#", "Sair do modo de configuração"),
-        (f"configure equipment ont slot 1/1/{slot}/{pon}/{position}/1 plndnumdataports 1 plndnumvoiceports 0 planned-card-type ethernet admin-state up", "$", "Configurar slot da ONT"),
-        (f"configure interface port uni:1/1/{slot}/{pon}/{position}/1/1 admin-up", "#", "Habilitar porta UNI"),
-        (f"configure qos interface 1/1/{slot}/{pon}/{position}/1/1 upstream-queue 0 bandwidth-profile name:HSI_1G_UP", "#", "Configurar QoS na porta UNI"),
-        (f"configure qos interface 1/1/{slot}/{pon}/{position} queue 0 shaper-profile name:HSI_1G_DOWN", "#", "Configurar QoS na porta UNI"),
-        ("exit all", "#", "Sair do modo de configuração"),
-        (f"configure bridge port 1/1/{slot}/{pon}/{position}/1/1 max-unicast-mac {EXTENDED_MAC_ADDRESSES}", "$", "Configurar limite de MACs na bridge"),
-        (f"configure bridge port 1/1/{slot}/{pon}/{position}/1/1 vlan-id {vlan} tag untagged", "$", "Atribuir VLAN à porta bridge (untagged)"),
-        ("exit all", "#", "Sair do modo de configuração"),
-        (f"configure bridge port 1/1/{slot}/{pon}/{position}/1/1 pvid {vlan}", "#", "Definir PVID na porta bridge"),
+        (f"configure qos interface ont:1/1/{slot}/{pon}/{position} ds-queue-sharing", "Configurar qos da ONT"),
+        ("exit all", "Sair do modo de configuração"),
+        (f"configure equipment ont slot 1/1/{slot}/{pon}/{position}/1 plndnumdataports 1 plndnumvoiceports 0 planned-card-type ethernet admin-state up", "Configurar slot da ONT"),
+        (f"configure interface port uni:1/1/{slot}/{pon}/{position}/1/1 admin-up", "Habilitar porta UNI"),
+        (f"configure qos interface 1/1/{slot}/{pon}/{position}/1/1 upstream-queue 0 bandwidth-profile name:HSI_1G_UP", "Configurar QoS na porta UNI"),
+        (f"configure qos interface 1/1/{slot}/{pon}/{position} queue 0 shaper-profile name:HSI_1G_DOWN", "Configurar QoS na porta UNI"),
+        ("exit all", "Sair do modo de configuração"),
+        (f"configure bridge port 1/1/{slot}/{pon}/{position}/1/1 max-unicast-mac {EXTENDED_MAC_ADDRESSES}", "Configurar limite de MACs na bridge"),
+        (f"configure bridge port 1/1/{slot}/{pon}/{position}/1/1 vlan-id {vlan} tag untagged", "Atribuir VLAN à porta bridge (untagged)"),
+        ("exit all", "Sair do modo de configuração"),
+        (f"configure bridge port 1/1/{slot}/{pon}/{position}/1/1 pvid {vlan}", "Definir PVID na porta bridge"),
     ]
 
-    for cmd, prompt, descricao in comandos:
-        try:
-            child.sendline(cmd)
-            logger.info(f"Enviando comando: {descricao} -> {cmd}")
-            child.expect(prompt, timeout=DEFAULT_TIMEOUT)
-            logger.info(f"Comando concluído com sucesso: {descricao}")
-        except Exception as e:
-            logger.error(f"Erro ao executar comando '{descricao}': {e}")
-            print(f"Houve um problema durante: {descricao}")
-            return False
+    if not run_command_block(child, comandos):
+        return False
 
     logger.info("Configuração do grupo 03 concluída com sucesso.")
     return True
@@ -492,28 +641,19 @@ def auth_especific_model_AN5506_ssh(child: pexpect.spawn, slot: str, pon: str, p
     try:
         print("Provisionando a ONU no modo correto para o Hardware...")
         comandos = [
-            (f"configure qos interface ont:1/1/{slot}/{pon}/{position} ds-queue-sharing", "#", "Configurar qos da ONT"),
-            (f"configure equipment ont slot 1/1/{slot}/{pon}/{position}/1 plndnumdataports 1 plndnumvoiceports 0 planned-card-type ethernet admin-state up", "$", "Configurar slot da ONT"),
-            (f"configure qos interface 1/1/{slot}/{pon}/{position}/1/1 upstream-queue 0 bandwidth-profile name:HSI_1G_UP", "#", "Configurar QoS upstream"),
-            (f"configure qos interface ont:1/1/{slot}/{pon}/{position} queue 0 shaper-profile name:HSI_1G_DOWN", "#", "Configurar QoS downstream"),
-            (f"configure interface port uni:1/1/{slot}/{pon}/{position}/1/1 admin-up", "#", "Habilitar porta UNI"),
-            (f"configure bridge port 1/1/{slot}/{pon}/{position}/1/1 max-unicast-mac {EXTENDED_MAC_ADDRESSES}", "$", "Configurar limite de MACs"),
-            (f"configure bridge port 1/1/{slot}/{pon}/{position}/1/1 vlan-id {vlan} tag untagged", "$", "Atribuir VLAN"),
-            (f"configure bridge port 1/1/{slot}/{pon}/{position}/1/1 pvid {vlan}", "#", "Definir PVID na porta bridge"),
-            ("exit all", "#", "Sair do modo de configuração"),
+            (f"configure qos interface ont:1/1/{slot}/{pon}/{position} ds-queue-sharing", "Configurar qos da ONT"),
+            (f"configure equipment ont slot 1/1/{slot}/{pon}/{position}/1 plndnumdataports 1 plndnumvoiceports 0 planned-card-type ethernet admin-state up", "Configurar slot da ONT"),
+            (f"configure qos interface 1/1/{slot}/{pon}/{position}/1/1 upstream-queue 0 bandwidth-profile name:HSI_1G_UP", "Configurar QoS upstream"),
+            (f"configure qos interface ont:1/1/{slot}/{pon}/{position} queue 0 shaper-profile name:HSI_1G_DOWN", "Configurar QoS downstream"),
+            (f"configure interface port uni:1/1/{slot}/{pon}/{position}/1/1 admin-up", "Habilitar porta UNI"),
+            (f"configure bridge port 1/1/{slot}/{pon}/{position}/1/1 max-unicast-mac {EXTENDED_MAC_ADDRESSES}", "Configurar limite de MACs"),
+            (f"configure bridge port 1/1/{slot}/{pon}/{position}/1/1 vlan-id {vlan} tag untagged", "Atribuir VLAN"),
+            (f"configure bridge port 1/1/{slot}/{pon}/{position}/1/1 pvid {vlan}", "Definir PVID na porta bridge"),
+            ("exit all", "Sair do modo de configuração"),
         ]
 
-        for cmd, prompt, descricao in comandos:
-            try:
-                child.sendline(cmd)
-                logger.info(f"Enviando comando: {descricao} -> {cmd}")
-                child.expect(prompt, timeout=DEFAULT_TIMEOUT)
-                logger.info(f"Comando concluído com sucesso: {descricao}")
-                time.sleep(1)
-            except Exception as e:
-                logger.error(f"Erro ao executar comando '{descricao}': {e}")
-                print(f"Houve um problema durante: {descricao}")
-                return False
+        if not run_command_block(child, comandos):
+            return False
 
     except Exception as e:
         logger.error(f"Erro no bloco de reprovisionamento: {e}")
@@ -537,7 +677,7 @@ def unauthorized(child: pexpect.spawn, serial_ssh: str, slot: str, pon: str, pos
                 child.sendline(cmd)
                 child.expect("#", timeout=DEFAULT_TIMEOUT)
                 if "error" in child.before.lower():
-                    logger.error(f"Erro no comando: {cmd} - Saída: {child.before}")
+                    log_raw(logger, f"Erro no comando: {cmd} - Saída", child.before, logging.ERROR)
                     print(f"❌ Falha ao executar comando na OLT")
                     return False
             except pexpect.TIMEOUT:
@@ -571,107 +711,170 @@ def format_ssh_serial(serial: str) -> str:
         logger.error(f"Erro ao formatar o serial '{serial}': {e}")
         return ""
 
-def list_onu(child: pexpect.spawn, slot: str, pon: str) -> bool:
-    """List ONUs on a specific PON and save to CSV"""
+def iter_xml_instances(child: pexpect.spawn, command: str,
+                       timeout: int = EXTENDED_TIMEOUT) -> Iterator[ET.Element]:
+    """Send an xml show command and yield each <instance> as soon as it closes.
+
+    The pexpect stream is fed to an XMLPullParser chunk by chunk and every
+    yielded element is detached from the tree afterwards, so memory stays
+    constant regardless of the PON/slot size. Returns once the prompt that
+    follows </runtime-data> has been consumed.
+    """
+    drain_output(child)
+    child.sendline(command)
+    parser = ET.XMLPullParser(events=("start", "end"))
+    stack: List[ET.Element] = []
+    pending = ""
+    started = False
+    tail = ""
+
+    while True:
+        if not started:
+            start_index = pending.find("<?xml")
+            if start_index == -1:
+                if re.search(r"typ:isadmin>#", pending):
+                    raise ValueError(f"XML não encontrado na resposta da OLT para '{command}'")
+                # Descarta o eco do comando, mantendo um possível início parcial
+                pending = pending[-XML_PREFIX_WINDOW:]
+            else:
+                started = True
+                pending = pending[start_index:]
+
+        if started and pending:
+            window = tail + pending
+            end_index = window.find(XML_END_TAG)
+            if end_index != -1:
+                cut = end_index + len(XML_END_TAG) - len(tail)
+                parser.feed(pending[:cut])
+                child.buffer = window[end_index + len(XML_END_TAG):]
+            else:
+                parser.feed(pending)
+                tail = window[-len(XML_END_TAG):]
+
+            for event, elem in parser.read_events():
+                if event == "start":
+                    stack.append(elem)
+                    continue
+                stack.pop()
+                if elem.tag == "instance":
+                    yield elem
+                    if stack:
+                        stack[-1].remove(elem)
+
+            if end_index != -1:
+                parser.close()
+                child.expect(r"typ:isadmin>#", timeout=DEFAULT_TIMEOUT)
+                return
+
+        chunk = child.read_nonblocking(size=XML_READ_SIZE, timeout=timeout)
+        pending = chunk if started else pending + chunk
+
+def list_onu(child: pexpect.spawn, slot: str, pon: str, ip_olt: Optional[str] = None) -> bool:
+    """List ONUs on a specific PON and save to CSV (and to the inventory when ip_olt is given)"""
+    os.makedirs("csv", exist_ok=True)
+    file_path = os.path.join("csv", f"onulist_slot{slot}_pon{pon}.csv")
+    partial_path = f"{file_path}.partial"
+    total = 0
+    members = []
+
     try:
         logger.info(f"Iniciando listagem das ONUs da PON 1/1/{slot}/{pon}")
-        child.sendline(f"show equipment ont status pon 1/1/{slot}/{pon} xml")
-        time.sleep(DISCOVERY_WAIT_TIME)
-        child.expect("#", timeout=15)
-        output = child.before
-        logger.debug("Saída recebida da OLT:\n" + output)
-
-        # Extract XML content
-        start_index = output.find("<?xml")
-        if start_index == -1:
-            logger.error("Início do XML ('<?xml') não encontrado na saída.")
-            print("❌ XML não encontrado na resposta da OLT")
-            return False
-
-        end_tag = "</runtime-data>"
-        end_index = output.find(end_tag, start_index)
-        if end_index == -1:
-            logger.error("Tag de fechamento do XML não encontrada na saída.")
-            print("❌ XML incompleto na resposta da OLT")
-            return False
 
-        xml_content = output[start_index:end_index + len(end_tag)]
-        logger.debug(f"Conteúdo XML extraído:\n{xml_content}")
+        # Grava cada ONU assim que sua <instance> fecha no fluxo da OLT
+        with open(partial_path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["SERIAL", "PON", "POSITION", "NAME", "MODEL"])
 
-        # Parse XML
-        try:
-            root = ET.fromstring(xml_content)
-        except ET.ParseError as e:
-            logger.error(f"Falha ao fazer parse do XML: {e}, conteúdo XML:\n{xml_content}")
-            print("❌ Erro ao interpretar o XML")
-            return False
+            for instance in iter_xml_instances(child, f"show equipment ont status pon 1/1/{slot}/{pon} xml"):
+                serial = instance.findtext(".//info[@name='sernum']", default="").strip()
+                ont_id = instance.findtext(".//res-id[@name='ont']", default="").strip()
+                position = ont_id.split('/')[-1] if ont_id else ""
+                name = instance.findtext(".//info[@name='desc1']", default="").strip().replace('"', '')
+                model = instance.findtext(".//info[@name='desc2']", default="").strip()
 
-        # Process ONU data
-        data = []
-        for instance in root.findall(".//instance"):
-            serial = instance.findtext(".//info[@name='sernum']", default="").strip()
-            ont_id = instance.findtext(".//res-id[@name='ont']", default="").strip()
-            position = ont_id.split('/')[-1] if ont_id else ""
-            name = instance.findtext(".//info[@name='desc1']", default="").strip().replace('"', '')
-            model = instance.findtext(".//info[@name='desc2']", default="").strip()  
-
-            if not serial or serial.lower() == "undefined":
-                continue
+                if not serial or serial.lower() == "undefined":
+                    continue
 
-            data.append([serial.replace(":", ""), pon, position, name, model])
-            logger.debug(f"ONU - SERIAL: {serial}, PON: {pon}, POSIÇÃO: {position}, NAME: {name}, MODEL: {model}")
+                writer.writerow([serial.replace(":", ""), pon, position, name, model])
+                members.append((serial, position, name, model))
+                total += 1
+                logger.debug("ONU - SERIAL: %s, PON: %s, POSIÇÃO: %s, NAME: %s, MODEL: %s", serial, pon, position, name, model)
 
-        if not data:
+        if not total:
+            os.remove(partial_path)
             logger.warning(f"Nenhuma ONU encontrada na PON 1/1/{slot}/{pon}")
             print(f"⚠️ Nenhuma ONU encontrada na PON 1/1/{slot}/{pon}")
             return False
 
-        # Create CSV file
-        os.makedirs("csv", exist_ok=True)
-        file_path = os.path.join("csv", f"onulist_slot{slot}_pon{pon}.csv")
-
-        with open(file_path, "w", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow(["SERIAL", "PON", "POSITION", "NAME", "MODEL"])
-            writer.writerows(data)
-
-        logger.info(f"✅ CSV gerado com sucesso: {file_path} ({len(data)} ONUs)")
+        os.replace(partial_path, file_path)
+        if ip_olt:
+            record_pon(ip_olt, "nokia", slot, pon, members)
+        logger.info(f"✅ CSV gerado com sucesso: {file_path} ({total} ONUs)")
         print(f"✅ CSV gerado: {file_path}")
         return True
 
+    except ET.ParseError as e:
+        logger.error(f"Falha ao fazer parse do XML: {e}")
+        print("❌ Erro ao interpretar o XML")
     except pexpect.TIMEOUT:
         logger.error(f"Timeout ao esperar resposta da OLT na PON 1/1/{slot}/{pon}")
         print("❌ Timeout na comunicação com a OLT")
-        return False
     except pexpect.ExceptionPexpect as e:
         logger.error(f"Erro de comunicação com a OLT: {e}", exc_info=True)
         print("❌ Erro de comunicação com a OLT")
-        return False
     except Exception as e:
         logger.error(f"Erro inesperado: {e}", exc_info=True)
         print("❌ Erro inesperado ao listar ONUs")
-        return False
 
-def list_pon(child: pexpect.spawn, slot: str, pon: str) -> bool:
-    """List PON status with detailed ONU information"""
-    try:
-        print(f"Iniciando listagem da PON 1/1/{slot}/{pon}")
-        child.sendline(f"show equipment ont status pon 1/1/{slot}/{pon} xml")
-        time.sleep(DISCOVERY_WAIT_TIME)
-        child.expect("#", timeout=EXTENDED_TIMEOUT)
-        output = child.before
+    if os.path.exists(partial_path):
+        os.remove(partial_path)
+    return False
 
-        start_index = output.find("<?xml")
-        end_index = output.find("</runtime-data>") + len("</runtime-data>")
-        if start_index == -1 or end_index == -1:
-            print("❌ XML não encontrado ou incompleto")
-            return False
+def query_pon_optics(child: pexpect.spawn, slot: str, pon: str) -> Dict[str, Tuple[str, str]]:
+    """Fetch rx signal and temperature of every ONT of a PON with a single query.
 
-        xml_content = output[start_index:end_index]
-        root = ET.fromstring(xml_content)
-        data = []
+    Returns {position: (rx_signal, temperature)}.
+    """
+    optics: Dict[str, Tuple[str, str]] = {}
+    try:
+        for instance in iter_xml_instances(child, f"show equipment ont optics 1/1/{slot}/{pon} xml"):
+            ont_id = instance.findtext(".//res-id[@name='ont']", default="").strip()
+            if not ont_id:
+                continue
+            rx_signal = instance.findtext(".//info[@name='rx-signal-level']", default="").strip()
+            temperature = instance.findtext(".//info[@name='ont-temperature']", default="").strip()
+            try:
+                rx_signal = f"{float(rx_signal):.2f}"
+            except ValueError:
+                rx_signal = rx_signal or "N/A"
+            try:
+                temperature = str(int(float(temperature)))
+            except ValueError:
+                temperature = temperature or "N/A"
+            optics[ont_id.split('/')[-1]] = (rx_signal, temperature)
+    except (pexpect.TIMEOUT, ET.ParseError) as e:
+        logger.warning(f"Consulta óptica da PON 1/1/{slot}/{pon} falhou: {e}")
+        drain_output(child)
+        return optics
+
+    logger.info(f"Óticos de {len(optics)} ONTs obtidos em uma consulta na PON 1/1/{slot}/{pon}")
+    return optics
+
+def query_ont_optics(child: pexpect.spawn, slot: str, pon: str, position: str) -> Tuple[str, str]:
+    """Fetch rx signal and temperature of a single ONT (fallback path)"""
+    drain_output(child)
+    child.sendline(f"show equipment ont optics 1/1/{slot}/{pon}/{position} detail")
+    child.expect([r"#", pexpect.TIMEOUT], timeout=EXTENDED_TIMEOUT)
+    reading = parse_optics_detail(child.before)
+    return tuple(reading) if reading else ("N/A", "N/A")
+
+def list_pon(child: pexpect.spawn, slot: str, pon: str, ip_olt: Optional[str] = None) -> bool:
+    """List PON status with detailed ONU information (and refresh the inventory when ip_olt is given)"""
+    try:
+        print(f"Iniciando listagem da PON 1/1/{slot}/{pon}")
+        statuses = []
 
-        for instance in root.findall(".//instance"):
+        for instance in iter_xml_instances(child, f"show equipment ont status pon 1/1/{slot}/{pon} xml"):
             ont_id = instance.findtext(".//res-id[@name='ont']")
             position = ont_id.split('/')[-1] if ont_id else ""
             serial = instance.findtext(".//info[@name='sernum']", default="").replace(":", "")
@@ -684,28 +887,27 @@ def list_pon(child: pexpect.spawn, slot: str, pon: str) -> bool:
             if not serial or serial.lower() == "undefined":
                 continue
 
-            # Get optical information for each ONU
-            try:
-                # Clear buffer
-                try:
-                    child.read_nonblocking(size=1024, timeout=1)
-                except:
-                    pass
+            print(f"✅ ONU {position}")
+            statuses.append([position, serial, name, modo, admin_status, oper_status, distance])
 
-                child.sendline(f"show equipment ont optics 1/1/{slot}/{pon}/{position} detail")
-                child.expect([r"#", pexpect.TIMEOUT], timeout=EXTENDED_TIMEOUT)
-                optics_output = child.before
+        if ip_olt:
+            record_pon(ip_olt, "nokia", slot, pon, [(serial, position, name, modo) for position, serial, name, modo, *_ in statuses])
 
-                match = re.search(r"rx-signal-level\s*:\s*(-\d+\.\d{2}).*?ont-temperature\s*:\s*(\d{2})", optics_output, re.DOTALL)
-                rx_signal = match.group(1) if match else "N/A"
-                temperature = match.group(2) if match else "N/A"
+        optics = query_pon_optics(child, slot, pon)
+        data = []
 
-            except Exception as optics_err:
-                print(f"⚠️ Falha ao obter óticos da ONU {position}: {optics_err}")
-                rx_signal = "Erro"
-                temperature = "Erro"
+        for position, serial, name, modo, admin_status, oper_status, distance in statuses:
+            if position in optics:
+                rx_signal, temperature = optics[position]
+            else:
+                # ONT ausente na consulta da PON: consulta individual
+                try:
+                    rx_signal, temperature = query_ont_optics(child, slot, pon, position)
+                except Exception as optics_err:
+                    print(f"⚠️ Falha ao obter óticos da ONU {position}: {optics_err}")
+                    rx_signal = "Erro"
+                    temperature = "Erro"
 
-            print(f"✅ ONU {position}")
             data.append([position, serial, name, modo, admin_status, oper_status, rx_signal, temperature, distance])
 
         if not data:
@@ -12,12 +12,21 @@ from contextlib import contextmanager
 import pexpect
 from dotenv import load_dotenv
 from utils.log import get_logger
+from utils.session_pool import session_pool, prompt_health_check
+from utils.completion import wait_until
+from utils.ssh_transport import spawn_ssh
 
 # Constants
 DEFAULT_TIMEOUT = 10
 CONFIGURATION_WAIT_TIME = 90
 STABILIZATION_WAIT_TIME = 3
-WIFI_PARAMS_TO_DELETE = ['6', '7', '8', '9']
+WIFI_PARAMS = ['6', '7', '8', '9']
+PPPOE_PARAMS = ['1', '2', '3']
+TL1_PROTOCOL = "nokia_tl1"
+ONT_READY_STATE = "IS-NR"
+READY_POLL_INTERVAL = 5
+READY_POLL_BACKOFF = 1.5
+READY_POLL_MAX_INTERVAL = 15
 
 # Configura o logger para este módulo
 logger = get_logger(__name__)
@@ -35,6 +44,77 @@ def countdown_timer(seconds: int) -> None:
         time.sleep(1)
     print("\nContinuando...")
 
+def ont_ready_tl1(child: pexpect.spawn, slot: str, pon: str, position: str) -> bool:
+    """Check via RTRV-ONT whether the ONT is in service (IS-NR)"""
+    try:
+        child.sendline(f"RTRV-ONT::ONT-1-1-{slot}-{pon}-{position};")
+        if child.expect(["COMPLD", "DENY", pexpect.TIMEOUT], timeout=DEFAULT_TIMEOUT) != 0:
+            return False
+        child.expect(";", timeout=DEFAULT_TIMEOUT)
+        return ONT_READY_STATE in child.before
+    except pexpect.exceptions.ExceptionPexpect as e:
+        logger.warning(f"Falha ao consultar estado da ONT {slot}/{pon}/{position}: {e}")
+        return False
+
+def hgu_params_applied(child: pexpect.spawn, slot: str, pon: str, position: str, params: List[str]) -> bool:
+    """Check via RTRV-HGUTR069-SPARAM that every TR-069 parameter of the ONT is applied (IS-NR)"""
+    for param in params:
+        aid = f"HGUTR069SPARAM-1-1-{slot}-{pon}-{position}-{param}"
+        try:
+            child.sendline(f"RTRV-HGUTR069-SPARAM::{aid};")
+            if child.expect(["COMPLD", "DENY", pexpect.TIMEOUT], timeout=DEFAULT_TIMEOUT) != 0:
+                return False
+            child.expect(";", timeout=DEFAULT_TIMEOUT)
+            if ONT_READY_STATE not in child.before:
+                return False
+        except pexpect.exceptions.ExceptionPexpect as e:
+            logger.warning(f"Falha ao consultar o parâmetro TR-069 {aid}: {e}")
+            return False
+    return True
+
+def _wait_with_progress(check, message: str, timeout: int) -> bool:
+    """Poll check() with backoff, showing the elapsed time, until it passes or the deadline expires"""
+    start = time.monotonic()
+
+    def ready() -> bool:
+        mins, secs = divmod(int(time.monotonic() - start), 60)
+        sys.stdout.write(f"\r{message}: {mins:02d}:{secs:02d}")
+        sys.stdout.flush()
+        return check()
+
+    is_ready = bool(wait_until(ready, timeout, interval=READY_POLL_INTERVAL,
+                               backoff=READY_POLL_BACKOFF, max_interval=READY_POLL_MAX_INTERVAL))
+    print()
+    return is_ready
+
+def wait_ont_ready_tl1(child: pexpect.spawn, slot: str, pon: str, position: str,
+                       timeout: int = CONFIGURATION_WAIT_TIME) -> bool:
+    """Poll the ONT state with backoff until it is in service or the deadline expires"""
+    start = time.monotonic()
+    is_ready = _wait_with_progress(lambda: ont_ready_tl1(child, slot, pon, position),
+                                   "Aguardando ONT ficar pronta", timeout)
+    if is_ready:
+        print("ONT pronta, continuando...")
+        logger.info(f"ONT {slot}/{pon}/{position} em serviço após {time.monotonic() - start:.1f}s")
+    else:
+        print("❌ ONT não entrou em serviço no tempo limite")
+        logger.error(f"ONT {slot}/{pon}/{position} não ficou em serviço em {timeout}s")
+    return is_ready
+
+def wait_hgu_config_tl1(child: pexpect.spawn, slot: str, pon: str, position: str, params: List[str],
+                        timeout: int = CONFIGURATION_WAIT_TIME) -> bool:
+    """Poll the TR-069 parameters with backoff until the ONT applied all of them or the deadline expires"""
+    start = time.monotonic()
+    applied = _wait_with_progress(lambda: hgu_params_applied(child, slot, pon, position, params),
+                                  "Aguardando ONT aplicar a configuração", timeout)
+    if applied:
+        logger.info(f"Parâmetros TR-069 {','.join(params)} da ONT {slot}/{pon}/{position} "
+                    f"aplicados após {time.monotonic() - start:.1f}s")
+    else:
+        print("❌ ONT não aplicou a configuração TR-069 no tempo limite")
+        logger.error(f"ONT {slot}/{pon}/{position} não aplicou os parâmetros TR-069 {','.join(params)} em {timeout}s")
+    return applied
+
 def login_olt_tl1(host: str) -> Optional[pexpect.spawn]:
     """Estabelece conexão TL1 com a OLT"""
     try:
@@ -51,16 +131,15 @@ def login_olt_tl1(host: str) -> Optional[pexpect.spawn]:
         logger.info(f"Conectando TL1, usuário: {tl1_user} | OLT: {host}")
         
         # Conexão TL1
-        child = pexpect.spawn(f"ssh {tl1_user}@{host} -p {tl1_port}", 
-                              encoding='utf-8', 
-                              timeout=30)
+        child = spawn_ssh(tl1_user, host, tl1_port, timeout=30, protocol="tl1")
 
         # Verifica resposta do SSH
         index = child.expect([
             "password:", 
             "Are you sure you want to continue connecting", 
             "Permission denied",  
-            pexpect.TIMEOUT
+            pexpect.TIMEOUT,
+            "Welcome to ISAM"
         ], timeout=DEFAULT_TIMEOUT)
 
         if index == 1:
@@ -76,16 +155,21 @@ def login_olt_tl1(host: str) -> Optional[pexpect.spawn]:
             print("❌ Erro: Timeout na conexão SSH.")
             return None
         
-        logger.info("TL1: Enviando credenciais de acesso")
-        child.sendline(tl1_passwd)
-
-        # Aguarda a resposta do login
-        login_success = child.expect([
-            "Welcome to ISAM", 
-            "Permission denied", 
-            pexpect.TIMEOUT, 
-            pexpect.EOF
-        ], timeout=DEFAULT_TIMEOUT)
+        if index == 4:
+            # Canal aberto sobre a conexão mestre já autenticada
+            logger.info("TL1: Sessão multiplexada - autenticação reaproveitada")
+            login_success = 0
+        else:
+            logger.info("TL1: Enviando credenciais de acesso")
+            child.sendline(tl1_passwd)
+
+            # Aguarda a resposta do login
+            login_success = child.expect([
+                "Welcome to ISAM", 
+                "Permission denied", 
+                pexpect.TIMEOUT, 
+                pexpect.EOF
+            ], timeout=DEFAULT_TIMEOUT)
 
         if login_success == 1:
             logger.error("TL1: Falha na autenticação após envio da senha")
@@ -120,6 +204,28 @@ def login_olt_tl1(host: str) -> Optional[pexpect.spawn]:
         print(f"❌ Erro inesperado TL1: {str(e)}")
         return None
 
+def logoff_tl1(child: pexpect.spawn) -> None:
+    """Encerra a sessão TL1 com LOGOFF antes de finalizar o processo"""
+    try:
+        if child.isalive():
+            child.sendline('LOGOFF;')
+            child.expect("COMPLD", timeout=3)
+            logger.info("Comando LOGOFF enviado com sucesso")
+    except Exception as e:
+        logger.error(f"Erro no comando LOGOFF: {str(e)}")
+    finally:
+        child.terminate(force=True)
+
+session_pool.register_closer(TL1_PROTOCOL, logoff_tl1)
+
+def pooled_tl1_session(host: str):
+    """Lend a pooled TL1 session for the OLT, logging in only when needed"""
+    return session_pool.session(
+        host, TL1_PROTOCOL,
+        factory=lambda h: login_olt_tl1(host=h),
+        health_check=prompt_health_check("<"),
+    )
+
 def auth_bridge_tl1(child: pexpect.spawn, serial: str, vlan: str, name: str, 
                    slot: str, pon: str, position: str, desc2: str) -> bool:
     """Autoriza e configura uma ONT em modo bridge via TL1"""
@@ -152,13 +258,10 @@ def auth_bridge_tl1(child: pexpect.spawn, serial: str, vlan: str, name: str,
         print("❌ Erro inesperado ao autorizar ou desbloquear a ONT.")
         return False
 
-    # Aguarda o tempo de configuração
-    try:
-        logger.info("CONFIGURANDO, aguarde a conclusão em 1,5 minutos...")
-        countdown_timer(CONFIGURATION_WAIT_TIME)
-        logger.info("Tempo de configuração concluído")
-    except Exception as e:
-        logger.warning(f"Problema no timer de contagem regressiva: {e}")
+    # Aguarda a ONT entrar em serviço
+    logger.info(f"CONFIGURANDO, aguardando a ONT ficar pronta (até {CONFIGURATION_WAIT_TIME}s)...")
+    if not wait_ont_ready_tl1(child, slot, pon, position):
+        return False
 
     # Comandos adicionais de configuração
     comandos = [
@@ -169,7 +272,6 @@ def auth_bridge_tl1(child: pexpect.spawn, serial: str, vlan: str, name: str,
         (f"SET-VLANPORT::ONTL2UNI-1-1-{slot}-{pon}-{position}-1-1:::MAXNUCMACADR=32,CMITMAXNUMMACADDR=10;", "SET-VLANPORT (MAC Address)"),
         (f"ENT-VLANEGPORT::ONTL2UNI-1-1-{slot}-{pon}-{position}-1-1:::0,{vlan}:PORTTRANSMODE=UNTAGGED;", "ENT-VLANEGPORT"),
         (f"SET-VLANPORT::ONTL2UNI-1-1-{slot}-{pon}-{position}-1-1:::DEFAULTCVLAN={vlan};", "SET-VLANPORT (Default VLAN)"),
-        ("LOGOFF;", "LOGOFF"),
     ]
 
     for cmd, descricao in comandos:
@@ -250,8 +352,13 @@ def auth_router_tl1(child: pexpect.spawn, vlan: str, name: str, desc2: str,
                 print(f"❌ Erro inesperado ao {description.lower()}.")
                 return False
 
+        # A configuração WiFi só pode seguir quando a ONT aplicou a configuração PPPoE
+        if not wait_ont_ready_tl1(child, slot, pon, position):
+            return False
+        if not wait_hgu_config_tl1(child, slot, pon, position, PPPOE_PARAMS):
+            return False
+
         logger.info("✅ Provisionamento concluído com sucesso.")
-        countdown_timer(CONFIGURATION_WAIT_TIME)
         return True
 
     except Exception as e:
@@ -268,12 +375,14 @@ def config_wifi(child: pexpect.spawn, slot: str, pon: str, position: str,
     success = True
 
     # Comandos para deletar parâmetros antigos
-    for param in WIFI_PARAMS_TO_DELETE:
+    for param in WIFI_PARAMS:
         try:
             cmd = f"DLT-HGUTR069-SPARAM::HGUTR069SPARAM-1-1-{slot}-{pon}-{position}-{param};"
             child.sendline(cmd)
-            child.expect("COMPLD", timeout=3)
-            logger.info(f"Parâmetro WiFi {param} removido com sucesso")
+            if child.expect(["COMPLD", "DENY"], timeout=3) == 0:
+                logger.info(f"Parâmetro WiFi {param} removido com sucesso")
+            else:
+                logger.info(f"Parâmetro WiFi {param} não existe para ser removido (ONU possivelmente nova)")
         except pexpect.exceptions.TIMEOUT:
             logger.info(f"Parâmetro WiFi {param} não existe para ser removido (ONU possivelmente nova)")
         except Exception as e:
@@ -307,15 +416,7 @@ def config_wifi(child: pexpect.spawn, slot: str, pon: str, position: str,
             logger.error(f"❌ Erro ao configurar {description}: {str(e)}")
             success = False
 
-    # Enviar LOGOFF
-    try:
-        child.sendline('LOGOFF;')
-        child.expect("COMPLD", timeout=3)
-        logger.info("Comando LOGOFF enviado com sucesso")
-    except Exception as e:
-        logger.error(f"Erro no comando LOGOFF: {str(e)}")
-
-    return success
+    return success and wait_hgu_config_tl1(child, slot, pon, position, WIFI_PARAMS)
 
 def format_tl1_serial(serial: str) -> str:
     """Format serial for TL1 protocol"""
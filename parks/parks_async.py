@@ -0,0 +1,63 @@
+import os
+import pexpect
+from dotenv import load_dotenv
+from utils.log import get_logger
+from utils.async_session import spawn_ssh_async
+from parks.parks_ssh import blacklist_to_dict, COMMAND_TIMEOUT
+from utils.parsers import parse_blacklist
+
+# Configura o logger para este módulo
+logger = get_logger(__name__)
+
+# Carrega variáveis do arquivo .env
+load_dotenv()
+
+ssh_userp = os.getenv('SSH_USER_PARKS')
+ssh_passwdp = os.getenv('SSH_PASSWORD_PARKS')
+
+LOGIN_TIMEOUT = 10
+
+
+async def login_ssh_async(host):
+    """Versão assíncrona de login_ssh: retorna uma AsyncSession ou None"""
+    logger.info(f"Conectando ao host (async): {host}")
+    session = None
+    try:
+        session = await spawn_ssh_async(ssh_userp, host, timeout=30)
+        index = await session.expect(["password:", "Are you sure you want to continue connecting", pexpect.TIMEOUT, r"#"], timeout=LOGIN_TIMEOUT)
+        if index == 1:
+            await session.sendline("yes")
+            await session.expect("password:", timeout=LOGIN_TIMEOUT)
+        if index == 3:
+            login_success = 0
+        else:
+            await session.sendline(ssh_passwdp)
+            login_success = await session.expect([r"#", pexpect.TIMEOUT, pexpect.EOF], timeout=LOGIN_TIMEOUT)
+
+        if login_success != 0:
+            logger.error(f"Não foi possível autenticar na OLT {host}")
+            await session.close()
+            return None
+
+        await session.send_command("terminal length 0", "#")
+        logger.info(f"Conexão estabelecida com sucesso à OLT {host} (async)")
+        return session
+
+    except (pexpect.EOF, pexpect.TIMEOUT, pexpect.exceptions.ExceptionPexpect) as e:
+        logger.error(f"Falha na conexão SSH com {host}: {e}")
+        if session:
+            await session.close()
+        return None
+    except BaseException:
+        # Cancelamento (timeout da varredura) no meio do login: encerra o ssh antes de propagar
+        if session:
+            await session.close()
+        raise
+
+
+async def list_unauthorized_async(session):
+    """Versão assíncrona de list_unauthorized"""
+    output = await session.send_command('show gpon blacklist', '#', timeout=COMMAND_TIMEOUT)
+    onu_dict = blacklist_to_dict(parse_blacklist(output.strip()))
+    logger.info(f"{session.host}: {len(onu_dict)} ONUs na blacklist")
+    return onu_dict if onu_dict else None
@@ -1,12 +1,17 @@
 import pexpect
 import os
-import time
 import csv
 import re
 from dotenv import load_dotenv
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
-from utils.log import get_logger
+from utils.log import get_logger, log_raw
+from utils.session_pool import session_pool, drain_output, HEALTH_CHECK_TIMEOUT
+from utils.completion import wait_until
+from utils.ssh_transport import spawn_ssh
+from utils.inventory import record_pon
+from utils.parsers import parse_blacklist, parse_onu_models, parse_onu_summary, parse_alias_config
 
 # Configura o logger para este módulo
 logger = get_logger(__name__)
@@ -17,16 +22,36 @@ load_dotenv()
 ssh_userp = os.getenv('SSH_USER_PARKS')
 ssh_passwdp = os.getenv('SSH_PASSWORD_PARKS')
 
+SSH_PROTOCOL = "parks_ssh"
+COMMAND_TIMEOUT = 30
+SAVE_TIMEOUT = 60
+ONU_READY_TIMEOUT = 60
+READY_POLL_INTERVAL = 2
+RESET_SETTLE_TIMEOUT = 10
+# Prompt ancorado no início da linha e no fim da saída: um '#' dentro de um alias não encerra a leitura
+CLI_PROMPT = r"\r\n\S+#\s*$"
+CONSULT_DEADLINE = 120
+CONSULT_RETRY_INTERVAL = 1
+CONSULT_RETRY_BACKOFF = 2
+CONSULT_RETRY_MAX_INTERVAL = 15
+CONSULT_RETRY_JITTER = 0.25
+RAW_PREVIEW_CHARS = 200
+ALIAS_WORKERS = int(os.getenv('PARKS_ALIAS_WORKERS', 4))
+
 def login_ssh(host=None):
     logger.info(f"Conectando ao host: {host}")
     try:
-        child = pexpect.spawn(f"ssh {ssh_userp}@{host}", encoding='utf-8', timeout=30)
-        index = child.expect(["password:", "Are you sure you want to continue connecting", pexpect.TIMEOUT], timeout=10)
+        child = spawn_ssh(ssh_userp, host, timeout=30)
+        index = child.expect(["password:", "Are you sure you want to continue connecting", pexpect.TIMEOUT, r"#"], timeout=10)
         if index == 1:
             child.sendline("yes")
             child.expect("password:")
-        child.sendline(ssh_passwdp)
-        login_success = child.expect([r"#", pexpect.TIMEOUT, pexpect.EOF], timeout=10)
+        if index == 3:
+            # Canal aberto sobre a conexão mestre já autenticada
+            login_success = 0
+        else:
+            child.sendline(ssh_passwdp)
+            login_success = child.expect([r"#", pexpect.TIMEOUT, pexpect.EOF], timeout=10)
 
         if login_success == 0:
             logger.info(f"Conexão estabelecida com sucesso à OLT {host}")
@@ -36,6 +61,8 @@ def login_ssh(host=None):
         else:
             logger.error("Não foi possível autenticar na OLT")
             print("❌ Falha na autenticação")
+            child.terminate(force=True)
+            return None
     
         return child
     
@@ -55,6 +82,44 @@ def login_ssh(host=None):
         print(error_msg)
         return None
 
+def run_command(child, command, error_message, timeout=COMMAND_TIMEOUT):
+    """Envia um comando e aguarda o prompt da CLI; falha se a OLT responder com erro"""
+    child.sendline(command)
+    if child.expect(["#", "ERROR"], timeout=timeout) != 0:
+        raise Exception(error_message)
+
+def save_configuration(child, command="copy r s"):
+    """Salva a configuração e aguarda a confirmação e o retorno do prompt"""
+    child.sendline(command)
+    if child.expect(["Configuration saved.", "ERROR"], timeout=SAVE_TIMEOUT) != 0:
+        raise Exception("Falha ao salvar configuração")
+    child.expect("#", timeout=COMMAND_TIMEOUT)
+
+def session_health_check(child):
+    """Verifica se a sessão está viva e volta ao modo privilegiado se ficou em configuração"""
+    if not child.isalive():
+        return False
+    try:
+        # Saída deixada pelo uso anterior não pode passar por prompt
+        drain_output(child)
+        for _ in range(3):
+            child.sendline("")
+            if child.expect([r"\(config[^)]*\)#\s*$", r"#\s*$"], timeout=HEALTH_CHECK_TIMEOUT) == 1:
+                return True
+            child.sendline("exit")
+            child.expect("#", timeout=HEALTH_CHECK_TIMEOUT)
+        return False
+    except (pexpect.TIMEOUT, pexpect.EOF):
+        return False
+
+def pooled_ssh_session(host):
+    """Empresta uma sessão SSH do pool, autenticando apenas quando necessário"""
+    return session_pool.session(host, SSH_PROTOCOL, factory=login_ssh, health_check=session_health_check)
+
+def blacklist_to_dict(entries):
+    """Converte os registros da blacklist em {serial: {'slot', 'pon'}}"""
+    return {entry.serial: {'slot': entry.slot, 'pon': entry.pon} for entry in entries}
+
 def list_unauthorized(child):
     try:
         # Envia o comando e captura a saída
@@ -62,32 +127,7 @@ def list_unauthorized(child):
         child.expect('#')
         output = child.before.strip()
 
-        # Dicionário para armazenar os dados
-        onu_dict = {}
-        
-        for line in output.splitlines():
-            line = line.strip()
-            
-            if not line.startswith(('0 |', '1 |', '2 |', '3 |', '4 |', '5 |', '6 |', '7 |', '8 |', '9 |')):
-                continue
-            
-            parts = [part.strip() for part in line.split('|')]
-            
-            if len(parts) < 3:
-                continue
-            
-            slot, port, serial = parts[0], parts[1], parts[2]
-            
-            if (not slot.isdigit() or int(slot) > 64 or
-                not port.isdigit() or int(port) > 128 or
-                not serial or len(serial) < 6 or ' ' in serial):
-                continue
-            
-            # Adiciona ao dicionário: serial como chave, slot e port como valores
-            onu_dict[serial] = {
-                'slot': slot,
-                'pon': port
-            }
+        onu_dict = blacklist_to_dict(parse_blacklist(output))
 
         return onu_dict if onu_dict else None
 
@@ -95,7 +135,7 @@ def list_unauthorized(child):
         logger.error(f"Erro ao listar ONUs não autorizadas: {e}")
         return None
 
-def consult_information(child, serial, max_attempts=20, delay_between_attempts=5):
+def consult_information(child, serial, deadline=CONSULT_DEADLINE):
     try:
         serial = serial.strip().lower()
         logger.info(f"Iniciando consulta para ONU {serial}")
@@ -116,79 +156,68 @@ def consult_information(child, serial, max_attempts=20, delay_between_attempts=5
         }
 
         comando = f"show gpon onu {serial} summary"
-        attempt = 1
-        output = None
+        attempts = 0
+        outcome = {}
 
-        while attempt <= max_attempts:
+        def attempt_summary():
+            nonlocal attempts
+            attempts += 1
             try:
-                logger.info(f"Tentativa {attempt}/{max_attempts} - Enviando comando: {comando}")
-                
+                logger.info(f"Tentativa {attempts} - Enviando comando: {comando}")
                 child.sendline(comando)
-                time.sleep(15)
-                
+
                 # Padrões para verificação
                 patterns = ["#", "% Unknown command", pexpect.TIMEOUT, pexpect.EOF]
-                result = child.expect(patterns, timeout=20)
-                
+                result = child.expect(patterns, timeout=COMMAND_TIMEOUT)
+
                 # Tratamento específico para comando desconhecido
-                if result == 1: 
-                    logger.error("Comando não reconhecido pela OLT")
-                    print("\nErro: ONU/ONT não encontrada na OLT selecionada (comando inválido)")
-                    return None
-                
-                elif result != 0: 
+                if result == 1:
+                    outcome["error"] = "unknown"
+                    return True
+                elif result != 0:
                     raise Exception("Timeout ou fim de conexão")
-                
+
                 output = child.before.strip()
-                logger.debug(f"Resposta bruta recebida: {output[:200]}...")
+                log_raw(logger, "Resposta bruta recebida", output, limit=RAW_PREVIEW_CHARS)
 
                 # Verificações de resposta
                 if "not found" in output.lower():
-                    logger.warning(f"ONU {serial} não encontrada na OLT")
-                    print("\nAviso: ONU/ONT não encontrada na OLT")
-                    return None
-                
+                    outcome["error"] = "not_found"
+                    return True
+
                 if "Serial" in output and "Interface" in output:
-                    break
+                    outcome["output"] = output
+                    return True
 
                 raise Exception("Resposta incompleta ou inválida")
 
             except Exception as e:
-                logger.warning(f"Falha na tentativa {attempt}: {str(e)}")
-                attempt += 1
-                if attempt <= max_attempts:
-                    time.sleep(delay_between_attempts)
-                continue
-
-        if attempt > max_attempts:
-            logger.error(f"Falha após {max_attempts} tentativas")
+                logger.warning(f"Falha na tentativa {attempts}: {str(e)}")
+                return False
+
+        # Lê a resposta imediatamente; só repete com saída incompleta,
+        # com backoff exponencial e jitter até o prazo total
+        if not wait_until(attempt_summary, timeout=deadline, interval=CONSULT_RETRY_INTERVAL,
+                          backoff=CONSULT_RETRY_BACKOFF, max_interval=CONSULT_RETRY_MAX_INTERVAL,
+                          jitter=CONSULT_RETRY_JITTER):
+            logger.error(f"Falha após {attempts} tentativas em {deadline}s")
             print("\nErro: Limite de tentativas excedido")
             return None
 
-        # Processamento dos dados
-        for line in output.splitlines():
-            line = line.strip()
-            
-            if line.startswith("Alias"):
-                data_template["alias"] = line.split(":")[1].strip()
-            
-            elif line.startswith("Interface"):
-                data_template["pon"] = line.split(":")[1].strip()
+        if outcome.get("error") == "unknown":
+            logger.error("Comando não reconhecido pela OLT")
+            print("\nErro: ONU/ONT não encontrada na OLT selecionada (comando inválido)")
+            return None
 
-            elif line.startswith("Model"):
-                data_template["model"] = line.split(":")[1].strip()
-            
-            elif line.startswith("Power Level"):
-                power_str = line.split(":")[1].strip()
-                data_template["power_level"] = power_str.split()[0].strip()
-            
-            elif line.startswith("Distance"):
-                distance_str = line.split(":")[1].strip()
-                data_template["distance_km"] = round(int(distance_str.split()[0]) / 1000, 2)
-            
-            elif line.startswith("Status"):
-                status_str = line.split(":")[1].strip()
-                data_template["status"] = status_str.split()[0].strip()
+        if outcome.get("error") == "not_found":
+            logger.warning(f"ONU {serial} não encontrada na OLT")
+            print("\nAviso: ONU/ONT não encontrada na OLT")
+            return None
+
+        output = outcome["output"]
+
+        # Processamento dos dados
+        data_template.update(parse_onu_summary(output)._asdict())
 
         logger.info(f"Consulta concluída para ONU {serial}")
         return data_template
@@ -203,24 +232,16 @@ def add_onu_to_pon(child, serial, pon):
         logger.info(f"Iniciando adição da ONU {serial} na PON {pon}")
         
         # Comandos de configuração
-        child.sendline("configure terminal")
-        child.expect("#")
-        time.sleep(5)
-        child.sendline(f"interface gpon1/{pon}")
-        child.expect("#")
-        time.sleep(5)
-        child.sendline(f"onu add serial-number {serial}")
-        child.expect("#")
-        time.sleep(10)
+        run_command(child, "configure terminal", "Falha ao entrar em modo de configuração")
+        run_command(child, f"interface gpon1/{pon}", f"Falha ao acessar interface gpon1/{pon}")
+        run_command(child, f"onu add serial-number {serial}", f"Falha ao adicionar ONU {serial}")
         logger.info(f"onu add serial-number {serial}")
-        child.sendline("exit")
-        child.expect("#")
-        child.sendline("exit")
-        child.expect("#")
-        time.sleep(10) 
+        add_output = child.before
+        run_command(child, "exit", "Falha ao sair da interface")
+        run_command(child, "exit", "Falha ao sair do modo de configuração")
         
         # Verifica se foi bem-sucedido
-        if child.before.find("% Serial already exists.") != -1:
+        if add_output.find("% Serial already exists.") != -1:
             logger.error(f"ONU {serial} já se encontra na PON {pon}")
             return False
         else:
@@ -231,56 +252,57 @@ def add_onu_to_pon(child, serial, pon):
         logger.error(f"Erro durante adição da ONU: {str(e)}")
         return False
 
+def wait_onu_ready(child, serial, timeout=ONU_READY_TIMEOUT):
+    """Aguarda a ONU recém-adicionada reportar o modelo no summary, em vez de um tempo fixo"""
+    def onu_reported():
+        child.sendline(f"show gpon onu {serial} summary")
+        if child.expect(["#", pexpect.TIMEOUT], timeout=COMMAND_TIMEOUT) != 0:
+            return False
+        return bool(parse_onu_summary(child.before).model)
+
+    logger.info(f"Aguardando a ONU {serial} ficar pronta (limite de {timeout}s)")
+    if wait_until(onu_reported, timeout, interval=READY_POLL_INTERVAL):
+        logger.info(f"ONU {serial} pronta")
+        return True
+
+    logger.warning(f"ONU {serial} não ficou pronta em {timeout}s")
+    return False
+
 def auth_bridge(child, serial, pon, nome, profile, vlan):
     try:
         logger.info(f"Iniciando autorização bridge para ONU {serial} na PON {pon} - Nome: {nome}, Profile: {profile}, VLAN: {vlan}")
         
         # Entrar no modo de configuração
-        child.sendline("configure terminal")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao entrar em modo de configuração")
+        run_command(child, "configure terminal", "Falha ao entrar em modo de configuração")
         logger.info("Modo de configuração acessado com sucesso")
         
         # Acessar interface GPON
         logger.info(f"Acessando interface gpon1/{pon}")
-        child.sendline(f"interface gpon1/{pon}")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception(f"Falha ao acessar interface gpon1/{pon}")
+        run_command(child, f"interface gpon1/{pon}", f"Falha ao acessar interface gpon1/{pon}")
         logger.info(f"Interface gpon1/{pon} acessada com sucesso")
         
         # Configurar alias
         logger.info(f"Configurando alias '{nome}' para ONU {serial}")
-        child.sendline(f"onu {serial} alias {nome}")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception(f"Falha ao configurar alias para ONU {serial}")
+        run_command(child, f"onu {serial} alias {nome}", f"Falha ao configurar alias para ONU {serial}")
         logger.info("Alias configurado com sucesso")
         
         # Configurar profile
         logger.info(f"Configurando profile {profile} para ONU {serial}")
-        child.sendline(f"onu {serial} flow {profile}")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception(f"Falha ao configurar profile {profile} para ONU {serial}")
+        run_command(child, f"onu {serial} flow {profile}", f"Falha ao configurar profile {profile} para ONU {serial}")
         logger.info("Profile configurado com sucesso")
         
         # Configurar VLAN
         logger.info(f"Configurando VLAN {vlan} para ONU {serial}")
-        child.sendline(f"onu {serial} vlan _{vlan} uni-port 1")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception(f"Falha ao configurar VLAN {vlan} para ONU {serial}")
+        run_command(child, f"onu {serial} vlan _{vlan} uni-port 1", f"Falha ao configurar VLAN {vlan} para ONU {serial}")
         logger.info("VLAN configurada com sucesso")
         
         # Sair das configurações
-        child.sendline("exit")
-        child.expect("#")
-        child.sendline("exit")
-        child.expect("#")
+        run_command(child, "exit", "Falha ao sair da interface")
+        run_command(child, "exit", "Falha ao sair do modo de configuração")
         
         # Salvar configuração
         logger.info("Salvando configuração no OLT")
-        child.sendline("copy r s")
-        time.sleep(10)
-        if child.expect(["Configuration saved.", "ERROR"], timeout=60) != 0:
-            raise Exception("Falha ao salvar configuração")
+        save_configuration(child)
         logger.info("Configuração salva com sucesso")
         
         logger.info(f"ONU {serial} autorizada em modo bridge com sucesso - PON: {pon}, Nome: {nome}, Profile: {profile}, VLAN: {vlan}")
@@ -299,78 +321,52 @@ def auth_router_default(child, serial, nome, vlan, pon, profile, login_pppoe, se
         
         # Entrar no modo de configuração
         logger.info("Entrando no modo de configuração")
-        child.sendline("configure terminal")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao entrar no modo de configuração")
+        run_command(child, "configure terminal", "Falha ao entrar no modo de configuração")
         
         # Acessar interface GPON
         logger.info(f"Acessando interface gpon1/{pon}")
-        child.sendline(f"interface gpon1/{pon}")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception(f"Falha ao acessar interface gpon1/{pon}")
+        run_command(child, f"interface gpon1/{pon}", f"Falha ao acessar interface gpon1/{pon}")
         
         # Definir apelido da ONU
         logger.info(f"Definindo apelido '{nome}' para ONU {serial}")
-        child.sendline(f"onu {serial} alias {nome}")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception(f"Falha ao definir apelido para ONU {serial}")
+        run_command(child, f"onu {serial} alias {nome}", f"Falha ao definir apelido para ONU {serial}")
         
         # Configurar autenticação PPPoE automática
         logger.info("Configurando autenticação automática PPPoE")
-        child.sendline(f"onu {serial} iphost 1 pppoe auth auto")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao configurar autenticação PPPoE")
+        run_command(child, f"onu {serial} iphost 1 pppoe auth auto", "Falha ao configurar autenticação PPPoE")
         
         # Configurar PPPoE always-on
         logger.info("Configurando PPPoE always-on")
-        child.sendline(f"onu {serial} iphost 1 pppoe contrigger alwayson idletimer 0")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao configurar PPPoE always-on")
+        run_command(child, f"onu {serial} iphost 1 pppoe contrigger alwayson idletimer 0", "Falha ao configurar PPPoE always-on")
         
         # Habilitar NAT
         logger.info("Habilitando NAT")
-        child.sendline(f"onu {serial} iphost 1 pppoe nat enable")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao habilitar NAT")
+        run_command(child, f"onu {serial} iphost 1 pppoe nat enable", "Falha ao habilitar NAT")
         
         # Aplicar perfil de serviço
         logger.info(f"Aplicando perfil de serviço {profile}")
-        child.sendline(f"onu {serial} flow-profile {profile}")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception(f"Falha ao aplicar perfil {profile}")
+        run_command(child, f"onu {serial} flow-profile {profile}", f"Falha ao aplicar perfil {profile}")
         
         # Definir credenciais PPPoE
         logger.info("Configurando credenciais PPPoE (usuário oculto)")
-        child.sendline(f"onu {serial} iphost 1 pppoe username {login_pppoe} password {senha_pppoe}")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao configurar credenciais PPPoE")
+        run_command(child, f"onu {serial} iphost 1 pppoe username {login_pppoe} password {senha_pppoe}", "Falha ao configurar credenciais PPPoE")
         
         # Desabilitar FEC upstream
         logger.info("Desabilitando FEC upstream")
-        child.sendline(f"onu {serial} upstream-fec disabled")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao desabilitar FEC upstream")
+        run_command(child, f"onu {serial} upstream-fec disabled", "Falha ao desabilitar FEC upstream")
         
         # Tradução de VLAN
         logger.info(f"Configurando tradução de VLAN: _{vlan}")
-        child.sendline(f"onu {serial} vlan-translation-profile _{vlan} iphost 1")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao configurar tradução de VLAN")
-        time.sleep(2)
+        run_command(child, f"onu {serial} vlan-translation-profile _{vlan} iphost 1", "Falha ao configurar tradução de VLAN")
         
         # Sair da configuração
         logger.info("Saindo do modo de configuração")
-        child.sendline("exit")
-        child.expect("#")
-        child.sendline("exit")
-        child.expect("#")
+        run_command(child, "exit", "Falha ao sair da interface")
+        run_command(child, "exit", "Falha ao sair do modo de configuração")
         
         # Salvar configuração
         logger.info("Salvando configuração")
-        child.sendline("copy r s")
-        time.sleep(10)
-        if child.expect(["Configuration saved.", "ERROR"], timeout=60) != 0:
-            raise Exception("Falha ao salvar configuração")
+        save_configuration(child)
         
         logger.info(f"ONU {serial} autorizada no modo roteador com sucesso")
         return True
@@ -386,71 +382,41 @@ def auth_router_121AC(child, serial, pon, nome, profile, vlan):
 
         # 1. Entrar no modo de configuração
         logger.info("Entrando no modo de configuração")
-        child.sendline("configure terminal")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao entrar em modo de configuração")
-        time.sleep(5)
+        run_command(child, "configure terminal", "Falha ao entrar em modo de configuração")
 
         # 2. Acessar interface GPON
         logger.info(f"Acessando interface gpon1/{pon}")
-        child.sendline(f"interface gpon1/{pon}")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception(f"Falha ao acessar interface gpon1/{pon}")
-        time.sleep(5)
+        run_command(child, f"interface gpon1/{pon}", f"Falha ao acessar interface gpon1/{pon}")
 
         # 3. Configurar alias
         logger.info(f"Configurando alias '{nome}'")
-        child.sendline(f"onu {serial} alias {nome}")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao configurar alias")
-        time.sleep(5)
+        run_command(child, f"onu {serial} alias {nome}", "Falha ao configurar alias")
 
         # 4. Configurar perfil ethernet
         logger.info("Configurando perfil ethernet automático (portas 1-2)")
-        child.sendline(f"onu {serial} ethernet-profile auto-on uni-port 1-2")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao configurar perfil ethernet")
-        time.sleep(5)
+        run_command(child, f"onu {serial} ethernet-profile auto-on uni-port 1-2", "Falha ao configurar perfil ethernet")
 
         # 5. Aplicar perfil de fluxo
         logger.info(f"Aplicando perfil de fluxo {profile}")
-        child.sendline(f"onu {serial} flow-profile {profile}")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao aplicar perfil de fluxo")
-        time.sleep(5)
+        run_command(child, f"onu {serial} flow-profile {profile}", "Falha ao aplicar perfil de fluxo")
 
         # 6. Desabilitar FEC upstream
         logger.info("Desabilitando FEC upstream")
-        child.sendline(f"onu {serial} upstream-fec disabled")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao desabilitar FEC upstream")
-        time.sleep(5)
+        run_command(child, f"onu {serial} upstream-fec disabled", "Falha ao desabilitar FEC upstream")
 
         # 7. Configurar tradução de VLAN
         logger.info(f"Configurando tradução de VLAN _{vlan} para iphost 1")
-        child.sendline(f"onu {serial} vlan-translation-profile _{vlan} iphost 1")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao configurar tradução de VLAN")
-        time.sleep(5)
+        run_command(child, f"onu {serial} vlan-translation-profile _{vlan} iphost 1", "Falha ao configurar tradução de VLAN")
 
         # 8. Sair da configuração
         logger.info("Saindo das configurações")
-        child.sendline("exit")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao sair da interface")
-        time.sleep(5)
+        run_command(child, "exit", "Falha ao sair da interface")
 
-        child.sendline("exit")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao sair do modo de configuração")
-        time.sleep(5)
+        run_command(child, "exit", "Falha ao sair do modo de configuração")
 
         # 9. Salvar configuração
         logger.info("Salvando configuração no OLT")
-        child.sendline("copy r s")
-        if child.expect(["Configuration saved.", "ERROR"], timeout=60) != 0:
-            raise Exception("Falha ao salvar configuração")
-        time.sleep(10)
+        save_configuration(child)
 
         logger.info(f"ONU {serial} autorizada com sucesso no perfil 121AC")
         return True
@@ -466,99 +432,57 @@ def auth_router_config2(child, serial, pon, nome, vlan, profile, login_pppoe, se
 
         # 1. Modo de configuração
         logger.info("Entrando no modo de configuração")
-        child.sendline("configure terminal")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao entrar em modo de configuração")
-        time.sleep(2)
+        run_command(child, "configure terminal", "Falha ao entrar em modo de configuração")
 
         # 2. Acessar interface GPON
         logger.info(f"Acessando interface gpon1/{pon}")
-        child.sendline(f"interface gpon1/{pon}")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception(f"Falha ao acessar interface GPON {pon}")
-        time.sleep(2)
+        run_command(child, f"interface gpon1/{pon}", f"Falha ao acessar interface GPON {pon}")
 
         # 3. Configurar alias
         logger.info(f"Configurando alias: {nome}")
-        child.sendline(f"onu {serial} alias {nome}")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao configurar alias")
-        time.sleep(2)
+        run_command(child, f"onu {serial} alias {nome}", "Falha ao configurar alias")
 
         # 4. Perfil Ethernet automático
         logger.info("Configurando perfil Ethernet (portas 1-4)")
-        child.sendline(f"onu {serial} ethernet-profile auto-on uni-port 1-4")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao configurar perfil Ethernet")
-        time.sleep(2)
+        run_command(child, f"onu {serial} ethernet-profile auto-on uni-port 1-4", "Falha ao configurar perfil Ethernet")
 
         # 5. Configuração PPPoE
         logger.info("Configurando autenticação PPPoE automática")
-        child.sendline(f"onu {serial} iphost 1 pppoe auth auto")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao configurar PPPoE auto")
-        time.sleep(2)
+        run_command(child, f"onu {serial} iphost 1 pppoe auth auto", "Falha ao configurar PPPoE auto")
 
         # 6. PPPoE Always-On
         logger.info("Configurando PPPoE Always-On")
-        child.sendline(f"onu {serial} iphost 1 pppoe contrigger alwayson idletimer 0")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao configurar PPPoE Always-On")
-        time.sleep(2)
+        run_command(child, f"onu {serial} iphost 1 pppoe contrigger alwayson idletimer 0", "Falha ao configurar PPPoE Always-On")
 
         # 7. Habilitar NAT
         logger.info("Habilitando NAT")
-        child.sendline(f"onu {serial} iphost 1 pppoe nat enable")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao habilitar NAT")
-        time.sleep(2)
+        run_command(child, f"onu {serial} iphost 1 pppoe nat enable", "Falha ao habilitar NAT")
 
         # 8. Aplicar perfil de fluxo
         logger.info(f"Aplicando perfil de fluxo: {profile}")
-        child.sendline(f"onu {serial} flow-profile {profile}")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao aplicar perfil de fluxo")
-        time.sleep(2)
+        run_command(child, f"onu {serial} flow-profile {profile}", "Falha ao aplicar perfil de fluxo")
 
         # 9. Credenciais PPPoE (com log seguro)
         logger.info("Configurando credenciais PPPoE (usuário oculto)")
-        child.sendline(f"onu {serial} iphost 1 pppoe username {login_pppoe} password {senha_pppoe}")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao configurar credenciais PPPoE")
-        time.sleep(2)
+        run_command(child, f"onu {serial} iphost 1 pppoe username {login_pppoe} password {senha_pppoe}", "Falha ao configurar credenciais PPPoE")
 
         # 10. Desabilitar FEC upstream
         logger.info("Desabilitando FEC upstream")
-        child.sendline(f"onu {serial} upstream-fec disabled")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao desabilitar FEC")
-        time.sleep(2)
+        run_command(child, f"onu {serial} upstream-fec disabled", "Falha ao desabilitar FEC")
 
         # 11. Tradução de VLAN
         logger.info(f"Configurando tradução de VLAN: _{vlan}")
-        child.sendline(f"onu {serial} vlan-translation-profile _{vlan} iphost 1")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao configurar tradução de VLAN")
-        time.sleep(2)
+        run_command(child, f"onu {serial} vlan-translation-profile _{vlan} iphost 1", "Falha ao configurar tradução de VLAN")
 
         # 12. Sair da configuração
         logger.info("Saindo das configurações")
-        child.sendline("exit")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao sair da interface")
-        time.sleep(2)
+        run_command(child, "exit", "Falha ao sair da interface")
 
-        child.sendline("exit")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao sair do modo de configuração")
-        time.sleep(2)
+        run_command(child, "exit", "Falha ao sair do modo de configuração")
 
         # 13. Salvar configuração
         logger.info("Salvando configuração no OLT")
-        child.sendline("copy r s")
-        if child.expect(["Configuration saved.", "ERROR"], timeout=60) != 0:
-            raise Exception("Falha ao salvar configuração")
-        time.sleep(10)
+        save_configuration(child)
 
         logger.info(f"Config3 aplicada com sucesso para ONU {serial}")
         return True
@@ -574,92 +498,53 @@ def auth_router_Fiberlink501Rev2(child, serial, pon, nome, profile, login_pppoe,
 
         # 1. Modo de configuração
         logger.info("Entrando no modo de configuração")
-        child.sendline("configure terminal")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao entrar em modo de configuração")
-        time.sleep(2)
+        run_command(child, "configure terminal", "Falha ao entrar em modo de configuração")
 
         # 2. Acessar interface GPON
         logger.info(f"Acessando interface gpon1/{pon}")
-        child.sendline(f"interface gpon1/{pon}")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception(f"Falha ao acessar interface GPON {pon}")
-        time.sleep(2)
+        run_command(child, f"interface gpon1/{pon}", f"Falha ao acessar interface GPON {pon}")
 
         # 3. Configurar alias
         logger.info(f"Configurando alias: {nome}")
-        child.sendline(f"onu {serial} alias {nome}")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao configurar alias")
-        time.sleep(2)
+        run_command(child, f"onu {serial} alias {nome}", "Falha ao configurar alias")
 
         # 4. Perfil Ethernet automático
         logger.info("Configurando perfil Ethernet (portas 1-2)")
-        child.sendline(f"onu {serial} ethernet-profile auto-on uni-port 1-2")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao configurar perfil Ethernet")
-        time.sleep(2)
+        run_command(child, f"onu {serial} ethernet-profile auto-on uni-port 1-2", "Falha ao configurar perfil Ethernet")
 
         # 5. Aplicar perfil de fluxo
         logger.info(f"Aplicando perfil de fluxo: {profile}")
-        child.sendline(f"onu {serial} flow-profile {profile}")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao aplicar perfil de fluxo")
-        time.sleep(2)
+        run_command(child, f"onu {serial} flow-profile {profile}", "Falha ao aplicar perfil de fluxo")
 
         # 6. Configuração PPPoE automática
         logger.info("Configurando autenticação PPPoE automática")
-        child.sendline(f"onu {serial} iphost 1 pppoe auth auto")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao configurar PPPoE auto")
-        time.sleep(2)
+        run_command(child, f"onu {serial} iphost 1 pppoe auth auto", "Falha ao configurar PPPoE auto")
 
         # 7. PPPoE Always-On com timer
         logger.info("Configurando PPPoE Always-On (timer 1200s)")
-        child.sendline(f"onu {serial} iphost 1 pppoe contrigger alwayson idletimer 1200")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao configurar PPPoE Always-On")
-        time.sleep(2)
+        run_command(child, f"onu {serial} iphost 1 pppoe contrigger alwayson idletimer 1200", "Falha ao configurar PPPoE Always-On")
 
         # 8. Habilitar NAT
         logger.info("Habilitando NAT")
-        child.sendline(f"onu {serial} iphost 1 pppoe nat enable")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao habilitar NAT")
-        time.sleep(2)
+        run_command(child, f"onu {serial} iphost 1 pppoe nat enable", "Falha ao habilitar NAT")
 
         # 9. Credenciais PPPoE (com log seguro)
         logger.info("Configurando credenciais PPPoE (usuário oculto)")
-        child.sendline(f"onu {serial} iphost 1 pppoe username {login_pppoe} password {senha_pppoe}")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao configurar credenciais PPPoE")
-        time.sleep(2)
+        run_command(child, f"onu {serial} iphost 1 pppoe username {login_pppoe} password {senha_pppoe}", "Falha ao configurar credenciais PPPoE")
 
         # 10. Desabilitar FEC upstream
         logger.info("Desabilitando FEC upstream")
-        child.sendline(f"onu {serial} upstream-fec disabled")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao desabilitar FEC")
-        time.sleep(2)
+        run_command(child, f"onu {serial} upstream-fec disabled", "Falha ao desabilitar FEC")
 
         # 11. Sair da configuração
         logger.info("Saindo das configurações")
-        child.sendline("exit")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao sair da interface")
-        time.sleep(2)
+        run_command(child, "exit", "Falha ao sair da interface")
 
-        child.sendline("exit")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao sair do modo de configuração")
-        time.sleep(2)
+        run_command(child, "exit", "Falha ao sair do modo de configuração")
 
         # 12. Salvar configuração
         logger.info("Salvando configuração no OLT")
-        child.sendline("copy r s")
-        if child.expect(["Configuration saved.", "ERROR"], timeout=60) != 0:
-            raise Exception("Falha ao salvar configuração")
-        time.sleep(10)
+        save_configuration(child)
 
         logger.info(f"Fiberlink501Rev2 aplicado com sucesso para ONU {serial}")
         return True
@@ -675,85 +560,49 @@ def auth_router_Fiberlink611(child, serial, pon, nome, vlan, profile, login_pppo
 
         # 1. Entrar no modo de configuração
         logger.info("Entrando no modo de configuração")
-        child.sendline("configure terminal")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao entrar em modo de configuração")
-        time.sleep(2)
+        run_command(child, "configure terminal", "Falha ao entrar em modo de configuração")
 
         # 2. Acessar interface GPON
         logger.info(f"Acessando interface gpon1/{pon}")
-        child.sendline(f"interface gpon1/{pon}")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception(f"Falha ao acessar interface GPON {pon}")
-        time.sleep(2)
+        run_command(child, f"interface gpon1/{pon}", f"Falha ao acessar interface GPON {pon}")
 
         # 3. Configurar alias
         logger.info(f"Configurando alias: {nome}")
-        child.sendline(f"onu {serial} alias {nome}")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao configurar alias")
-        time.sleep(2)
+        run_command(child, f"onu {serial} alias {nome}", "Falha ao configurar alias")
 
         # 4. Configurar autenticação PPPoE automática
         logger.info("Configurando autenticação PPPoE automática")
-        child.sendline(f"onu {serial} iphost 1 pppoe auth auto")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao configurar PPPoE automático")
-        time.sleep(2)
+        run_command(child, f"onu {serial} iphost 1 pppoe auth auto", "Falha ao configurar PPPoE automático")
 
         # 5. Configurar PPPoE Always-On
         logger.info("Configurando PPPoE Always-On (timer 0)")
-        child.sendline(f"onu {serial} iphost 1 pppoe contrigger alwayson idletimer 0")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao configurar PPPoE Always-On")
-        time.sleep(2)
+        run_command(child, f"onu {serial} iphost 1 pppoe contrigger alwayson idletimer 0", "Falha ao configurar PPPoE Always-On")
 
         # 6. Habilitar NAT
         logger.info("Habilitando NAT")
-        child.sendline(f"onu {serial} iphost 1 pppoe nat enable")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao habilitar NAT")
-        time.sleep(2)
+        run_command(child, f"onu {serial} iphost 1 pppoe nat enable", "Falha ao habilitar NAT")
 
         # 7. Aplicar perfil de fluxo
         logger.info(f"Aplicando perfil de fluxo: {profile}")
-        child.sendline(f"onu {serial} flow-profile {profile}")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao aplicar perfil de fluxo")
-        time.sleep(2)
+        run_command(child, f"onu {serial} flow-profile {profile}", "Falha ao aplicar perfil de fluxo")
 
         # 8. Configurar credenciais PPPoE (com log seguro)
         logger.info("Configurando credenciais PPPoE (usuário oculto)")
-        child.sendline(f"onu {serial} iphost 1 pppoe username {login_pppoe} password {senha_pppoe}")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao configurar credenciais PPPoE")
-        time.sleep(2)
+        run_command(child, f"onu {serial} iphost 1 pppoe username {login_pppoe} password {senha_pppoe}", "Falha ao configurar credenciais PPPoE")
 
         # 9. Configurar tradução de VLAN
         logger.info(f"Configurando tradução de VLAN: _{vlan}")
-        child.sendline(f"onu {serial} vlan-translation-profile _{vlan} iphost 1")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao configurar tradução de VLAN")
-        time.sleep(2)
+        run_command(child, f"onu {serial} vlan-translation-profile _{vlan} iphost 1", "Falha ao configurar tradução de VLAN")
 
         # 10. Sair da configuração
         logger.info("Saindo das configurações")
-        child.sendline("exit")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao sair da interface")
-        time.sleep(2)
+        run_command(child, "exit", "Falha ao sair da interface")
 
-        child.sendline("exit")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao sair do modo de configuração")
-        time.sleep(2)
+        run_command(child, "exit", "Falha ao sair do modo de configuração")
 
         # 11. Salvar configuração
         logger.info("Salvando configuração no OLT")
-        child.sendline("copy r s")
-        if child.expect(["Configuration saved.", "ERROR"], timeout=60) != 0:
-            raise Exception("Falha ao salvar configuração")
-        time.sleep(10)
+        save_configuration(child)
 
         logger.info(f"Fiberlink611 aplicado com sucesso para ONU {serial}")
         return True
@@ -768,28 +617,18 @@ def unauthorized(child, pon, serial):
         logger.info(f"Iniciando desautorização da ONU {serial} na PON {pon}")
         
         # Entrar no modo de configuração
-        child.sendline("configure terminal")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao entrar em modo de configuração")
+        run_command(child, "configure terminal", "Falha ao entrar em modo de configuração")
         
         logger.info(f"Acessando interface gpon1/{pon}")
-        child.sendline(f"interface gpon1/{pon}")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception(f"Falha ao acessar interface gpon1/{pon}")
+        run_command(child, f"interface gpon1/{pon}", f"Falha ao acessar interface gpon1/{pon}")
         
         # Desautorizar ONU
         logger.info(f"Desautorizando ONU {serial}")
-        child.sendline(f"no onu {serial}")
-        time.sleep(10)
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception(f"Falha ao desautorizar ONU {serial}")
+        run_command(child, f"no onu {serial}", f"Falha ao desautorizar ONU {serial}")
         
         # Salvar configuração
         logger.info("Salvando configuração no OLT")
-        child.sendline("do copy r s")
-        time.sleep(10)
-        if child.expect(["Configuration saved.", "ERROR"], timeout=60) != 0:
-            raise Exception("Falha ao salvar configuração")
+        save_configuration(child, "do copy r s")
         
         logger.info(f"ONU {serial} desautorizada com sucesso na PON gpon1/{pon}")
         return True
@@ -804,29 +643,18 @@ def reboot(child, pon, serial):
         logger.info(f"Iniciando reboot da ONU {serial} na PON {pon}")
         
         # Entrar no modo de configuração
-        child.sendline("configure terminal")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao entrar em modo de configuração")
+        run_command(child, "configure terminal", "Falha ao entrar em modo de configuração")
         
         # Acessar interface GPON
-        child.sendline(f"interface gpon1/{pon}")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception(f"Falha ao acessar interface gpon1/{pon}")
+        run_command(child, f"interface gpon1/{pon}", f"Falha ao acessar interface gpon1/{pon}")
     
         # Resetar ONU
-        child.sendline(f"onu reset {serial}")
-        time.sleep(10)
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception(f"Falha ao resetar ONU {serial}")
+        run_command(child, f"onu reset {serial}", f"Falha ao resetar ONU {serial}")
         
         # Sair da configuração
-        child.sendline("exit")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao sair da interface")
+        run_command(child, "exit", "Falha ao sair da interface")
         
-        child.sendline("exit")
-        if child.expect(["#", "ERROR"], timeout=30) != 0:
-            raise Exception("Falha ao sair do modo de configuração")
+        run_command(child, "exit", "Falha ao sair do modo de configuração")
 
         logger.info(f"Reboot da ONU {serial} concluído com sucesso")
         return True
@@ -836,6 +664,63 @@ def reboot(child, pon, serial):
         logger.error(error_msg)
         return False
 
+def wait_onu_reset(child, serial, timeout=RESET_SETTLE_TIMEOUT):
+    """Aguarda a OLT reportar a ONU fora do ar após o reset, em vez de um tempo fixo"""
+    def onu_dropped():
+        child.sendline(f"show gpon onu {serial} summary")
+        if child.expect(["#", pexpect.TIMEOUT], timeout=COMMAND_TIMEOUT) != 0:
+            return False
+        status = parse_onu_summary(child.before).status or ""
+        return not status.lower().startswith("active")
+
+    if wait_until(onu_dropped, timeout, interval=READY_POLL_INTERVAL):
+        logger.info(f"Reset da ONU {serial} confirmado pela OLT")
+        return True
+
+    logger.warning(f"OLT não confirmou o reset da ONU {serial} em {timeout}s")
+    return False
+
+def fetch_pon_aliases(child, pon):
+    """Obtém os alias de todas as ONUs da PON lendo a running-config da interface.
+
+    Retorna {serial: alias}, ou None se a OLT não aceitar o comando.
+    """
+    child.sendline(f"show running-config interface gpon1/{pon}")
+    if child.expect([CLI_PROMPT, "ERROR"], timeout=COMMAND_TIMEOUT) != 0:
+        child.expect(CLI_PROMPT, timeout=COMMAND_TIMEOUT)
+        return None
+    output = child.before.decode() if isinstance(child.before, bytes) else child.before
+
+    # Sem o cabeçalho da seção a saída não é a running-config esperada
+    if not re.search(rf"^\s*interface gpon1/{re.escape(str(pon))}\s*$", output, re.MULTILINE):
+        return None
+
+    return parse_alias_config(output)
+
+def fetch_onu_alias(child, serial):
+    """Obtém o alias de uma ONU via 'show gpon onu <serial> summary'"""
+    child.sendline(f"show gpon onu {serial} summary")
+    child.expect("#", timeout=10)
+    output = child.before.decode() if isinstance(child.before, bytes) else child.before
+    return parse_onu_summary(output).alias or ""
+
+def fetch_aliases_parallel(ip_olt, serials, workers=ALIAS_WORKERS):
+    """Distribui as consultas de alias por ONU entre várias sessões do pool"""
+    if not serials:
+        return {}
+    workers = max(1, min(workers, len(serials)))
+    chunks = [serials[i::workers] for i in range(workers)]
+
+    def worker(chunk):
+        with pooled_ssh_session(ip_olt) as child:
+            return {serial: fetch_onu_alias(child, serial) for serial in chunk}
+
+    aliases = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for result in executor.map(worker, chunks):
+            aliases.update(result)
+    return aliases
+
 def list_onu(child, pon, ip_olt):
     try:
         now = datetime.now().strftime("%Y-%m-%d_%H-%M")
@@ -848,40 +733,27 @@ def list_onu(child, pon, ip_olt):
         child.expect("#", timeout=10)
         output = child.before.decode() if isinstance(child.before, bytes) else child.before
 
-        matches = []
-        for line in output.splitlines():
-            if any(x in line.lower() for x in ["serial", "model"]):
-                continue
-            parts = [p.strip() for p in line.strip().split('|') if p.strip()]
-            if len(parts) >= 2:
-                serial = parts[0]
-                model = parts[1]
-                matches.append((serial, model))
-            elif len(parts) == 1 and re.match(r"^\w{12}$", parts[0]):
-                serial = parts[0]
-                model = ""
-                matches.append((serial, model))
+        matches = parse_onu_models(output)
 
         if not matches:
             logger.warning("Nenhuma ONU encontrada na PON %s", pon)
             return []
 
-        onu_data = []
-        for serial, model in matches:
-            # Busca alias da ONU via comando adicional
-            command2 = f"show gpon onu {serial} summary"
-            child.sendline(command2)
-            child.expect("#", timeout=10)
-            output2 = child.before.decode() if isinstance(child.before, bytes) else child.before
+        aliases = fetch_pon_aliases(child, pon)
+        if aliases is None:
+            logger.warning("Consulta em lote de alias indisponível, consultando por ONU em paralelo")
+            aliases = fetch_aliases_parallel(ip_olt, [serial for serial, _ in matches])
 
-            alias_match = re.search(r"Alias\s+:\s+(.+)", output2)
-            alias = alias_match.group(1).strip() if alias_match else ""
-
-            onu_data.append({
+        onu_data = [
+            {
                 "serial": serial.strip(),
                 "model": model.strip(),
-                "alias": alias.strip()
-            })
+                "alias": aliases.get(serial.strip(), "").strip()
+            }
+            for serial, model in matches
+        ]
+
+        record_pon(ip_olt, "parks", None, pon, [(onu["serial"], None, onu["alias"], onu["model"]) for onu in onu_data])
 
         os.makedirs("csv", exist_ok=True)
 
@@ -0,0 +1,141 @@
+"""
+Fleet Service module for operations spanning every configured OLT.
+Fans read-only queries out concurrently over the async drivers and merges
+the results into a single report.
+"""
+
+import os
+import time
+import asyncio
+from typing import List, Tuple, Dict, Any
+
+from dotenv import load_dotenv
+from nokia.nokia_async import login_olt_ssh_async, list_unauthorized_async as nokia_list_unauthorized_async
+from parks.parks_async import login_ssh_async, list_unauthorized_async as parks_list_unauthorized_async
+from utils.log import get_logger
+
+# Constants
+VENDOR_NOKIA = "nokia"
+VENDOR_PARKS = "parks"
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_OLT_TIMEOUT = 120
+
+# Logger principal
+logger = get_logger(__name__)
+
+# Carrega variáveis de ambiente
+load_dotenv()
+
+FLEET_SCAN_WORKERS = int(os.getenv('FLEET_SCAN_WORKERS', DEFAULT_MAX_WORKERS))
+FLEET_SCAN_TIMEOUT = float(os.getenv('FLEET_SCAN_TIMEOUT', DEFAULT_OLT_TIMEOUT))
+
+# (nome da OLT, IP, fabricante)
+OLTTarget = Tuple[str, str, str]
+
+
+async def _scan_nokia(ip: str) -> List[Tuple[str, str, str]]:
+    """Return (serial, slot, pon) for every unprovisioned ONU of a Nokia OLT"""
+    session = await login_olt_ssh_async(ip)
+    if not session:
+        raise Exception(f"Falha na conexão SSH com a OLT {ip}")
+    try:
+        return await nokia_list_unauthorized_async(session)
+    finally:
+        await session.close()
+
+
+async def _scan_parks(ip: str) -> List[Tuple[str, str, str]]:
+    """Return (serial, slot, pon) for every blacklisted ONU of a Parks OLT"""
+    session = await login_ssh_async(ip)
+    if not session:
+        raise Exception(f"Falha na conexão SSH com a OLT {ip}")
+    try:
+        onu_dict = await parks_list_unauthorized_async(session) or {}
+        return [(serial, info['slot'], info['pon']) for serial, info in onu_dict.items()]
+    finally:
+        await session.close()
+
+
+SCANNERS = {
+    VENDOR_NOKIA: _scan_nokia,
+    VENDOR_PARKS: _scan_parks,
+}
+
+
+async def _scan_olt(semaphore: asyncio.Semaphore, name: str, ip: str, vendor: str,
+                    timeout: float) -> Dict[str, Any]:
+    """Scan one OLT, capturing its failure instead of aborting the fleet"""
+    async with semaphore:
+        start = time.monotonic()
+        try:
+            onus = await asyncio.wait_for(SCANNERS[vendor](ip), timeout=timeout)
+            error = None
+        except asyncio.TimeoutError:
+            onus, error = [], f"Timeout após {timeout:.0f}s"
+        except Exception as e:
+            onus, error = [], str(e)
+
+        elapsed = time.monotonic() - start
+        if error:
+            logger.error(f"Varredura da OLT {name} ({ip}) falhou em {elapsed:.1f}s: {error}")
+        else:
+            logger.info(f"Varredura da OLT {name} ({ip}) concluída em {elapsed:.1f}s: {len(onus)} ONUs")
+        return {"olt": name, "ip": ip, "vendor": vendor, "onus": onus, "error": error, "elapsed": elapsed}
+
+
+async def scan_unauthorized_fleet(olts: List[OLTTarget], max_workers: int = FLEET_SCAN_WORKERS,
+                                  timeout: float = FLEET_SCAN_TIMEOUT) -> List[Dict[str, Any]]:
+    """Scan every OLT concurrently, at most max_workers sessions at a time"""
+    semaphore = asyncio.Semaphore(max(1, max_workers))
+    tasks = [
+        _scan_olt(semaphore, name, ip, vendor, timeout)
+        for name, ip, vendor in olts
+        if vendor in SCANNERS
+    ]
+    return await asyncio.gather(*tasks)
+
+
+def unauthorized_fleet_scan(olts: List[OLTTarget]) -> List[Tuple[str, str, str, str]]:
+    """Lista as ONUs não autorizadas de todas as OLTs em uma única tabela"""
+    targets = [(name, ip, vendor) for name, ip, vendor in olts if ip]
+    for name, ip, vendor in olts:
+        if not ip:
+            logger.warning(f"OLT {name} sem IP configurado, ignorada na varredura")
+            print(f"⚠️ IP não configurado para a OLT: {name} (ignorada)")
+
+    if not targets:
+        print("❌ Nenhuma OLT com IP configurado.")
+        return []
+
+    print(f"\nVarrendo {len(targets)} OLTs (até {FLEET_SCAN_WORKERS} simultâneas)...")
+    logger.info(f"Iniciando varredura da frota: {len(targets)} OLTs")
+    start = time.monotonic()
+    results = asyncio.run(scan_unauthorized_fleet(targets))
+    elapsed = time.monotonic() - start
+
+    rows = [
+        (result["olt"], serial, slot, pon)
+        for result in results
+        for serial, slot, pon in result["onus"]
+    ]
+    rows.sort()
+
+    if rows:
+        print("------------------------------------------------------------")
+        print(f"{'OLT':<20} | {'Serial':<16} | {'Slot':<4} | PON")
+        print("------------------------------------------------------------")
+        for olt, serial, slot, pon in rows:
+            print(f"{olt:<20} | {serial:<16} | {slot:<4} | {pon}")
+        print("------------------------------------------------------------")
+    else:
+        print("Nenhuma ONU não autorizada encontrada na frota.")
+
+    failures = [result for result in results if result["error"]]
+    for result in failures:
+        print(f"❌ {result['olt']} ({result['ip']}): {result['error']}")
+
+    print(f"Total de ONUs não autorizadas: {len(rows)} | "
+          f"OLTs consultadas: {len(results) - len(failures)}/{len(results)} | "
+          f"Tempo total: {elapsed:.1f}s\n")
+    logger.info(f"Varredura da frota concluída em {elapsed:.1f}s: {len(rows)} ONUs, {len(failures)} falhas")
+    return rows
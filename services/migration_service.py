@@ -0,0 +1,116 @@
+"""
+Migration Service module for bulk ONU migrations.
+Runs the work of a migration partitioned by slot/PON over a bounded pool of
+workers, each one with its own OLT session, and reports live throughput.
+ONUs of the same PON stay in one worker, in order; distinct PONs run in
+parallel and take their positions through the reservation table.
+"""
+
+import os
+import time
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from dotenv import load_dotenv
+from utils.log import get_logger
+
+# Constants
+DEFAULT_MIGRATION_WORKERS = 4
+
+# Logger principal
+logger = get_logger(__name__)
+
+# Carrega variáveis de ambiente
+load_dotenv()
+
+MIGRATION_WORKERS = int(os.getenv('MIGRATION_WORKERS', DEFAULT_MIGRATION_WORKERS))
+
+PartitionKey = Tuple[str, str]  # (slot, PON)
+MigrationResult = Tuple[List[Dict], List[Dict]]  # (migradas, não migradas)
+
+
+class MigrationProgress:
+    """Thread-safe counters of a migration with a live ONUs/min line"""
+
+    def __init__(self, total: int) -> None:
+        self.total = total
+        self.migrated = 0
+        self.failed = 0
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+
+    def rate(self) -> float:
+        """Migrated ONUs per minute since the start"""
+        elapsed = time.monotonic() - self.started
+        return self.migrated * 60 / elapsed if elapsed > 0 else 0.0
+
+    def _show(self) -> None:
+        print(f"\rMigradas: {self.migrated}/{self.total} | Falhas: {self.failed} | "
+              f"{self.rate():.1f} ONUs/min", end="", flush=True)
+
+    def success(self) -> None:
+        with self._lock:
+            self.migrated += 1
+            self._show()
+
+    def failure(self) -> None:
+        with self._lock:
+            self.failed += 1
+            self._show()
+
+    def finish(self) -> None:
+        with self._lock:
+            self._show()
+            print()
+        logger.info(f"Migração: {self.migrated} migradas, {self.failed} falhas, {self.rate():.1f} ONUs/min")
+
+
+def failure_record(item: Dict, error: str) -> Dict:
+    """Row of csv/not_migrated.csv"""
+    return {
+        'serial': item.get('serial', '').upper().strip(),
+        'error': error,
+        'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+def partition_by_pon(tasks: Iterable[Tuple[str, str, Dict]]) -> Dict[PartitionKey, List[Dict]]:
+    """Group (slot, pon, item) tasks by slot/PON, keeping the CSV order inside each PON"""
+    partitions: Dict[PartitionKey, List[Dict]] = defaultdict(list)
+    for slot, pon, item in tasks:
+        partitions[(slot, pon)].append(item)
+    return partitions
+
+
+def run_partitions(partitions: Dict[PartitionKey, List[Dict]],
+                   worker: Callable[[PartitionKey, List[Dict], MigrationProgress], MigrationResult],
+                   progress: MigrationProgress,
+                   max_workers: int = MIGRATION_WORKERS) -> MigrationResult:
+    """Run worker(key, items, progress) for every partition on a bounded thread pool"""
+    migrated: List[Dict] = []
+    not_migrated: List[Dict] = []
+    if not partitions:
+        return migrated, not_migrated
+
+    workers = max(1, min(max_workers, len(partitions)))
+    logger.info(f"Migrando {sum(map(len, partitions.values()))} ONUs em {len(partitions)} PONs com {workers} sessões paralelas")
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(worker, key, items, progress): key for key, items in partitions.items()}
+        for future in as_completed(futures):
+            slot, pon = futures[future]
+            try:
+                ok, failed = future.result()
+                migrated.extend(ok)
+                not_migrated.extend(failed)
+            except Exception as e:
+                # Falha do worker inteiro (ex.: sessão não abriu): todas as ONUs da PON ficam pendentes
+                logger.error(f"Falha no worker da PON {slot}/{pon}: {e}")
+                for item in partitions[(slot, pon)]:
+                    not_migrated.append(failure_record(item, str(e)))
+                    progress.failure()
+
+    return migrated, not_migrated
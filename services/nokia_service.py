@@ -12,6 +12,10 @@ from contextlib import contextmanager
 
 from nokia.nokia_ssh import *
 from nokia.nokia_tl1 import *
+from utils.inventory import lookup_onu, record_onu, remove_onu
+from utils.lookup_tables import nokia_vlan, nokia_vlan_table
+from services.migration_service import MigrationProgress, failure_record, partition_by_pon, run_partitions
+from utils.journal import MigrationJournal, journal_path, STEP_ALLOCATED, STEP_ADDED, STEP_MIGRATED, STEP_FAILED
 from utils.log import get_logger
 
 # Constants
@@ -21,6 +25,8 @@ ROUTER_MODELS = ["NOKIA: G-1425G-A, G-1425G-B, G-1426G-A"]
 MODEL_GROUP01 = {"TX-6610", "R1v2", "XZ000-G3", "Fiberlink100"}
 MODEL_GROUP02 = {"PON110_V3.0", "RTL9602C", "DM985-100", "HG8310M", "110Gb", "SH901"}
 MODEL_GROUP03 = {"XZ000-G7", "AN5506-01-A"}
+AN5506_MODEL = "AN5506-01-A"
+AN5506_VARIANTS = {'1': "small", '2': "big"}
 NOKIA_SERIAL_PREFIX = "ALCL"
 MAX_RETRIES = 3
 WIFI_PASSWORD_MIN_LENGTH = 8
@@ -29,7 +35,6 @@ SSID_MAX_LENGTH = 32
 NAME_MAX_LENGTH = 63
 REMOTE_ACCESS_PASSWORD_LENGTH = 10
 COUNTDOWN_WAIT_TIME = 15
-STABILIZATION_WAIT_TIME = 10
 
 # Logger principal
 logger = get_logger(__name__)
@@ -39,47 +44,27 @@ logger.info("Sistema iniciado")
 
 @contextmanager
 def ssh_connection(ip_olt: str):
-    """Context manager for SSH connections with proper cleanup"""
-    conexao = None
+    """Context manager lending a pooled SSH session"""
     try:
-        logger.info(f"Conectando à OLT {ip_olt} via SSH...")
-        conexao = login_olt_ssh(host=ip_olt)
-        if not conexao:
-            raise Exception(f"Falha na conexão SSH com a OLT {ip_olt}")
-        logger.info("Conexão SSH estabelecida com sucesso")
-        yield conexao
+        logger.info(f"Obtendo sessão SSH para a OLT {ip_olt}...")
+        with pooled_ssh_session(ip_olt) as conexao:
+            logger.info("Sessão SSH pronta para uso")
+            yield conexao
     except Exception as e:
         logger.error(f"Erro na conexão SSH: {str(e)}")
         raise
-    finally:
-        if conexao:
-            try:
-                conexao.terminate()
-                logger.info("Conexão SSH encerrada com sucesso")
-            except Exception as e:
-                logger.warning(f"Erro ao encerrar conexão SSH: {str(e)}")
 
 @contextmanager
 def tl1_connection(ip_olt: str):
-    """Context manager for TL1 connections with proper cleanup"""
-    conexao = None
+    """Context manager lending a pooled TL1 session"""
     try:
-        logger.info(f"Conectando à OLT {ip_olt} via TL1...")
-        conexao = login_olt_tl1(host=ip_olt)
-        if not conexao:
-            raise Exception(f"Falha na conexão TL1 com a OLT {ip_olt}")
-        logger.info("Conexão TL1 estabelecida com sucesso")
-        yield conexao
+        logger.info(f"Obtendo sessão TL1 para a OLT {ip_olt}...")
+        with pooled_tl1_session(ip_olt) as conexao:
+            logger.info("Sessão TL1 pronta para uso")
+            yield conexao
     except Exception as e:
         logger.error(f"Erro na conexão TL1: {str(e)}")
         raise
-    finally:
-        if conexao:
-            try:
-                conexao.terminate()
-                logger.info("Conexão TL1 encerrada com sucesso")
-            except Exception as e:
-                logger.warning(f"Erro ao encerrar conexão TL1: {str(e)}")
 
 def get_user_input(prompt: str, validator=None, required: bool = True) -> str:
     """Get validated user input with proper error handling"""
@@ -123,11 +108,24 @@ def validate_remote_password(password: str) -> bool:
     """Validate remote access password format"""
     return len(password) == REMOTE_ACCESS_PASSWORD_LENGTH
 
-def get_onu_position_info(conexao, serial: str) -> Tuple[str, str, str]:
-    """Get ONU position information with error handling"""
+def get_onu_position_info(conexao, serial: str, ip_olt: Optional[str] = None) -> Tuple[str, str, str]:
+    """Get ONU position, answered by the local inventory when possible.
+
+    An indexed position is confirmed with one targeted query; on a miss or a
+    stale entry the whole-OLT search runs and the result is indexed.
+    """
     try:
         serial_ssh = format_ssh_serial(serial)
         logger.debug(f"Serial formatado para SSH: {serial_ssh}")
+
+        if ip_olt:
+            entry = lookup_onu(ip_olt, serial)
+            if entry and entry.slot and entry.position:
+                if verify_onu_position(conexao, serial_ssh, entry.slot, entry.pon, entry.position):
+                    logger.info(f"ONU encontrada no inventário - Slot: {entry.slot}, PON: {entry.pon}, Posição: {entry.position}")
+                    return entry.slot, entry.pon, entry.position
+                logger.info(f"Inventário desatualizado para {serial}, consultando a OLT")
+                remove_onu(ip_olt, serial)
         
         logger.info("Consultando posição da ONU...")
         result = check_onu_position(conexao, serial_ssh)
@@ -137,6 +135,8 @@ def get_onu_position_info(conexao, serial: str) -> Tuple[str, str, str]:
             
         slot, pon, position = result
         logger.info(f"ONU encontrada - Slot: {slot}, PON: {pon}, Posição: {position}")
+        if ip_olt:
+            record_onu(ip_olt, "nokia", serial, slot, pon, position)
         return slot, pon, position
         
     except Exception as e:
@@ -172,13 +172,10 @@ def save_csv_data(filepath: str, data: List[Dict], fieldnames: List[str]) -> Non
         logger.error(f"Erro ao salvar arquivo CSV {filepath}: {str(e)}")
         raise
 
-def get_vlan_from_csv(slot: str, pon: str, csv_path: str = './csv/nokia.csv') -> str:
-    """Get VLAN from CSV or user input"""
+def get_vlan_from_csv(slot: str, pon: str) -> str:
+    """Get VLAN from the indexed CSV table or user input"""
     try:
-        vlan_data = load_csv_data(csv_path)
-        vlan_lookup = {(row['CARD'], str(row['PON'])): row['VLAN'] for row in vlan_data}
-        
-        vlan = vlan_lookup.get((slot, str(pon)))
+        vlan = nokia_vlan(slot, pon)
         if vlan:
             logger.info(f"VLAN encontrada no CSV: {vlan}")
             return vlan
@@ -229,38 +226,61 @@ def get_pppoe_credentials() -> Tuple[str, str]:
     
     return user, password
 
-def provision_onu_by_model(conexao, model: str, slot: str, pon: str, position: str, vlan: str) -> bool:
-    """Provision ONU based on model with proper error handling"""
+def model_supported(model: Optional[str]) -> bool:
+    """Whether the model belongs to one of the provisioning groups"""
+    return model in MODEL_GROUP01 or model in MODEL_GROUP02 or model in MODEL_GROUP03
+
+def ask_an5506_variant() -> str:
+    """Ask whether the Fiberhome AN5506-01-A is the small or the big variant"""
+    print("1 - Pequeno")
+    print("2 - Grande")
+    while True:
+        escolha_modelo = input("Escolha 1 ou 2: ").strip()
+        if escolha_modelo in AN5506_VARIANTS:
+            return AN5506_VARIANTS[escolha_modelo]
+        print("Escolha inválida. Tente novamente.")
+
+def provision_onu_by_model(conexao, model: str, slot: str, pon: str, position: str, vlan: str,
+                           variant: Optional[str] = None) -> bool:
+    """Provision ONU based on model with proper error handling.
+
+    The AN5506-01-A variant (small or big) is asked interactively unless given.
+    """
     try:
         if model in MODEL_GROUP01:
-            auth_group01_ssh(conexao, slot, pon, position, vlan)
+            if not auth_group01_ssh(conexao, slot, pon, position, vlan):
+                logger.error("Falha no provisionamento (Grupo 01)")
+                return False
             logger.info("Provisionamento concluído com sucesso (Grupo 01)")
             return True
 
         if model in MODEL_GROUP02:
-            auth_group02_ssh(conexao, slot, pon, position, vlan)
+            if not auth_group02_ssh(conexao, slot, pon, position, vlan):
+                logger.error("Falha no provisionamento (Grupo 02)")
+                return False
             logger.info("Provisionamento concluído com sucesso (Grupo 02)")
             return True
 
         if model in MODEL_GROUP03:
-            if model == "AN5506-01-A":
-                print("\nEsta Fiberhome AN5506-01-A é do modelo:")
-                print("1 - Pequeno")
-                print("2 - Grande")
-                while True:
-                    escolha_modelo = input("Escolha 1 ou 2: ").strip()
-                    if escolha_modelo == '1':
-                        auth_group03_ssh(conexao, slot, pon, position, vlan, model="small")
-                        logger.info("Provisionamento concluído com sucesso (Grupo 03 - Pequeno)")
-                        return True
-                    elif escolha_modelo == '2':
-                        auth_especific_model_AN5506_ssh(conexao, slot, pon, position, vlan, model="big")
-                        logger.info("Provisionamento concluído com sucesso (Grupo 03 - Grande)")
-                        return True
-                    else:
-                        print("Escolha inválida. Tente novamente.")
+            if model == AN5506_MODEL:
+                if variant is None:
+                    print("\nEsta Fiberhome AN5506-01-A é do modelo:")
+                    variant = ask_an5506_variant()
+                if variant == "small":
+                    if not auth_group03_ssh(conexao, slot, pon, position, vlan, model="small"):
+                        logger.error("Falha no provisionamento (Grupo 03 - Pequeno)")
+                        return False
+                    logger.info("Provisionamento concluído com sucesso (Grupo 03 - Pequeno)")
+                    return True
+                if not auth_especific_model_AN5506_ssh(conexao, slot, pon, position, vlan, model="big"):
+                    logger.error("Falha no provisionamento (Grupo 03 - Grande)")
+                    return False
+                logger.info("Provisionamento concluído com sucesso (Grupo 03 - Grande)")
+                return True
             else:
-                auth_group03_ssh(conexao, slot, pon, position, vlan)
+                if not auth_group03_ssh(conexao, slot, pon, position, vlan):
+                    logger.error("Falha no provisionamento (Grupo 03)")
+                    return False
                 logger.info("Provisionamento concluído com sucesso (Grupo 03)")
                 return True
 
@@ -276,7 +296,7 @@ def handle_incompatible_model(conexao, serial: str, slot: str, pon: str, positio
     try:
         logger.warning(f"Modelo incompatível: {model}. Excluindo ONU/ONT.")
         print("Modelo não compatível, excluindo ONU/ONT")
-        countdown_timer(COUNTDOWN_WAIT_TIME)
+        wait_ont_ready_ssh(conexao, slot, pon, position, timeout=COUNTDOWN_WAIT_TIME)
         logger.info("Prosseguindo...")
         
         serial_ssh = format_ssh_serial(serial)
@@ -298,7 +318,9 @@ def process_nokia_onu(conexao_tl1, item: Dict, slot: str, pon: str, position: st
         if item.get('mode', 'bridge').lower() == 'bridge':
             logger.info("Provisionamento em modo Bridge")
             desc2 = "BRIDGE"
-            auth_bridge_tl1(conexao_tl1, serial_tl1, vlan, name, slot, pon, position, desc2)
+            if not auth_bridge_tl1(conexao_tl1, serial_tl1, vlan, name, slot, pon, position, desc2):
+                logger.error(f"Falha ao autorizar a ONT {serial} em modo Bridge")
+                return False
         else:
             logger.info("Provisionamento em modo Router")
             desc2 = "ROUTER"
@@ -307,9 +329,12 @@ def process_nokia_onu(conexao_tl1, item: Dict, slot: str, pon: str, position: st
             user_pppoe = item.get('pppoe_user', '').strip()
             password_pppoe = item.get('pppoe_pass', '').strip()
 
-            auth_router_tl1(conexao_tl1, vlan, name, desc2, user_pppoe, password_pppoe, slot, pon, position, serial_tl1)
-            if ssid and ssidpassword:
-                config_wifi(conexao_tl1, slot, pon, position, ssid, ssidpassword)
+            if not auth_router_tl1(conexao_tl1, vlan, name, desc2, user_pppoe, password_pppoe, slot, pon, position, serial_tl1):
+                logger.error(f"Falha ao autorizar a ONT {serial} em modo Router")
+                return False
+            if ssid and ssidpassword and not config_wifi(conexao_tl1, slot, pon, position, ssid, ssidpassword):
+                logger.error(f"Falha ao configurar o WiFi da ONT {serial}")
+                return False
         
         return True
         
@@ -325,8 +350,19 @@ def process_standard_onu(conexao, item: Dict, slot: str, pon: str, position: str
         
         serial_ssh = format_ssh_serial(serial)
         desc2 = "Bridge"
-        add_to_pon(conexao, slot, pon, position, serial_ssh, name, desc2)
-        time.sleep(STABILIZATION_WAIT_TIME)
+        if not add_to_pon(conexao, slot, pon, position, serial_ssh, name, desc2):
+            return False
+
+        return configure_standard_onu(conexao, item, slot, pon, position, vlan)
+        
+    except Exception as e:
+        logger.error(f"Erro ao processar ONU padrão: {str(e)}")
+        raise
+
+def configure_standard_onu(conexao, item: Dict, slot: str, pon: str, position: str, vlan: str) -> bool:
+    """Configure the service of a standard ONU already added to its position"""
+    try:
+        serial_ssh = format_ssh_serial(item.get('serial', '').upper().strip())
 
         # Use model from CSV if available, otherwise detect automatically
         model = item.get('model', '').strip()
@@ -336,15 +372,24 @@ def process_standard_onu(conexao, item: Dict, slot: str, pon: str, position: str
         else:
             logger.info(f"Modelo informado via CSV: {model}")
 
-        if not provision_onu_by_model(conexao, model, slot, pon, position, vlan):
+        if not model_supported(model):
             logger.warning(f"Modelo incompatível: {model}. Excluindo ONU.")
             unauthorized(conexao, serial_ssh, slot, pon, position)
             raise Exception(f"Modelo {model} não compatível")
+
+        # Roda nos workers da migração: a variante vem do CSV ou da pergunta feita antes deles
+        variant = item.get('variant', '').strip().lower() or None
+        if model == AN5506_MODEL and variant not in AN5506_VARIANTS.values():
+            raise Exception(f"Variante da {AN5506_MODEL} não definida (coluna 'variant': small ou big)")
+
+        if not provision_onu_by_model(conexao, model, slot, pon, position, vlan, variant=variant):
+            logger.error(f"Falha ao configurar o serviço da ONU {serial_ssh}")
+            return False
         
         return True
         
     except Exception as e:
-        logger.error(f"Erro ao processar ONU padrão: {str(e)}")
+        logger.error(f"Erro ao configurar ONU padrão: {str(e)}")
         raise
 
 def onu_list_nokia(ip_olt: str) -> None:
@@ -376,13 +421,15 @@ def unauthorized_complete_nokia(ip_olt: str) -> bool:
         logger.info(f"Serial informado: {serial}")
         
         with ssh_connection(ip_olt) as conexao:
-            slot, pon, position = get_onu_position_info(conexao, serial)
+            slot, pon, position = get_onu_position_info(conexao, serial, ip_olt)
             
             logger.info("Executando desautorização...")
             serial_ssh = format_ssh_serial(serial)
             success = unauthorized(conexao, serial_ssh, slot, pon, position)
             
             if success:
+                remove_onu(ip_olt, serial)
+                release_position(ip_olt, slot, pon, position)
                 logger.info("✅ ONU desautorizada com sucesso")
                 print("✅ ONU desautorizada com sucesso")
                 return True
@@ -408,7 +455,7 @@ def consult_information_complete_nokia(ip_olt: str) -> None:
         logger.info(f"Serial informado: {serial}")
         
         with ssh_connection(ip_olt) as conexao:
-            slot, pon, position = get_onu_position_info(conexao, serial)
+            slot, pon, position = get_onu_position_info(conexao, serial, ip_olt)
             
             logger.info("Obtendo sinal...")
             if not return_signal_temp(conexao, slot, pon, position):
@@ -438,7 +485,7 @@ def reboot_complete_nokia(ip_olt: str) -> None:
         
         # Get position info using SSH
         with ssh_connection(ip_olt) as conexao_ssh:
-            slot, pon, position = get_onu_position_info(conexao_ssh, serial)
+            slot, pon, position = get_onu_position_info(conexao_ssh, serial, ip_olt)
         
         # Execute reboot using TL1
         with tl1_connection(ip_olt) as conexao_tl1:
@@ -475,7 +522,7 @@ def grant_remote_access_wan_complete(ip_olt: str) -> None:
         
         # Get position info using SSH
         with ssh_connection(ip_olt) as conexao:
-            slot, pon, position = get_onu_position_info(conexao, serial)
+            slot, pon, position = get_onu_position_info(conexao, serial, ip_olt)
         
         # Configure remote access using TL1
         with tl1_connection(ip_olt) as conexao_tl1:
@@ -505,7 +552,7 @@ def configure_wifi(ip_olt: str) -> None:
         
         # Get position info using SSH
         with ssh_connection(ip_olt) as conexao:
-            slot, pon, position = get_onu_position_info(conexao, serial)
+            slot, pon, position = get_onu_position_info(conexao, serial, ip_olt)
         
         # Configure WiFi using TL1
         with tl1_connection(ip_olt) as conexao_tl1:
@@ -572,7 +619,7 @@ def provision_nokia(ip_olt: str) -> None:
 
             # Check free positions on PON
             try:
-                position = checkfreeposition(conexao, slot, pon)
+                position = checkfreeposition(conexao, slot, pon, ip_olt)
                 logger.info(f"Posição livre encontrada: {position}")
             except Exception as e:
                 logger.error(f"Erro ao verificar posições livres: {str(e)}")
@@ -583,18 +630,29 @@ def provision_nokia(ip_olt: str) -> None:
             vlan = get_vlan_from_csv(slot, pon)
 
             # Check if it's an ALCL ONU (Nokia)
-            if serial.startswith(NOKIA_SERIAL_PREFIX):
-                _handle_nokia_ont_provisioning(ip_olt, conexao, serial, vlan, name, slot, pon, position)
+            try:
+                if serial.startswith(NOKIA_SERIAL_PREFIX):
+                    provisioned = _handle_nokia_ont_provisioning(ip_olt, conexao, serial, vlan, name, slot, pon, position)
+                else:
+                    provisioned = _handle_standard_onu_provisioning(conexao, serial, vlan, name, slot, pon, position)
+            except Exception:
+                # Estado da posição incerto: recarrega a PON na próxima alocação
+                invalidate_pon_occupancy(ip_olt, slot, pon)
+                raise
+
+            if provisioned:
+                record_onu(ip_olt, "nokia", serial, slot, pon, position, name=name)
+                confirm_position(ip_olt, slot, pon, position)
             else:
-                _handle_standard_onu_provisioning(conexao, serial, vlan, name, slot, pon, position)
+                invalidate_pon_occupancy(ip_olt, slot, pon)
 
     except Exception as e:
         logger.error(f"Erro durante provisionamento: {str(e)}", exc_info=True)
         print(f"❌ Erro inesperado: {str(e)}")
 
 def _handle_nokia_ont_provisioning(ip_olt: str, conexao_ssh, serial: str, vlan: str, 
-                                name: str, slot: str, pon: str, position: str) -> None:
-    """Handle Nokia ONT provisioning"""
+                                name: str, slot: str, pon: str, position: str) -> bool:
+    """Handle Nokia ONT provisioning; returns whether the ONT was authorized"""
     logger.info("ONT Nokia ALCL detectada")
     print("\nONT Nokia detectada - Escolha o modo de provisionamento:")
     print("1 - Bridge")
@@ -606,10 +664,7 @@ def _handle_nokia_ont_provisioning(ip_olt: str, conexao_ssh, serial: str, vlan:
         required=True
     )
 
-    # Close SSH connection and start TL1
-    conexao_ssh.terminate()
-    logger.info("Finalizada sessão SSH")
-    
+    # A sessão SSH continua aberta no pool; o canal TL1 usa o transporte multiplexado
     with tl1_connection(ip_olt) as conexao_tl1:
         logger.info("Iniciada sessão TL1")
         serial_tl1 = format_tl1_serial(serial)
@@ -617,8 +672,11 @@ def _handle_nokia_ont_provisioning(ip_olt: str, conexao_ssh, serial: str, vlan:
         if mode == '1':
             logger.info("Provisionamento em modo Bridge")
             desc2 = "BRIDGE"
-            auth_bridge_tl1(conexao_tl1, serial_tl1, vlan, name, slot, pon, position, desc2)
+            if not auth_bridge_tl1(conexao_tl1, serial_tl1, vlan, name, slot, pon, position, desc2):
+                print("❌ Falha ao provisionar a ONT em modo bridge")
+                return False
             print("ONU provisionada em modo bridge")
+            return True
         else:
             logger.info("Provisionamento em modo Router")
             desc2 = "ROUTER"
@@ -630,7 +688,9 @@ def _handle_nokia_ont_provisioning(ip_olt: str, conexao_ssh, serial: str, vlan:
             user_pppoe, password_pppoe = get_pppoe_credentials()
 
             logger.info("Iniciando provisionamento em modo Router")
-            auth_router_tl1(conexao_tl1, vlan, name, desc2, user_pppoe, password_pppoe, slot, pon, position, serial_tl1)
+            if not auth_router_tl1(conexao_tl1, vlan, name, desc2, user_pppoe, password_pppoe, slot, pon, position, serial_tl1):
+                print("❌ Falha ao provisionar a ONT em modo router")
+                return False
             
             result = config_wifi(conexao_tl1, slot, pon, position, ssid, ssidpassword)
             if result:
@@ -640,10 +700,11 @@ def _handle_nokia_ont_provisioning(ip_olt: str, conexao_ssh, serial: str, vlan:
             
             print("ONT Autorizada em modo router!")
             logger.info("ONT autorizada com sucesso!")
+            return True
 
 def _handle_standard_onu_provisioning(conexao, serial: str, vlan: str, name: str, 
-                                    slot: str, pon: str, position: str) -> None:
-    """Handle standard ONU provisioning"""
+                                    slot: str, pon: str, position: str) -> bool:
+    """Handle standard ONU provisioning; returns whether the ONU stayed provisioned"""
     # Format serial for SSH
     serial_ssh = format_ssh_serial(serial)
     logger.info(f"Serial formatado: {serial_ssh}")
@@ -653,8 +714,8 @@ def _handle_standard_onu_provisioning(conexao, serial: str, vlan: str, name: str
     desc2 = "Bridge"
     logger.info(f"Dados para provisionamento - Serial: {serial_ssh}, Slot: {slot}, PON: {pon}, Posição: {position}, VLAN: {vlan}, Nome: {name}, Desc: {desc2}")
 
-    add_to_pon(conexao, slot, pon, position, serial_ssh, name, desc2)
-    time.sleep(STABILIZATION_WAIT_TIME)
+    if not add_to_pon(conexao, slot, pon, position, serial_ssh, name, desc2):
+        return False
     
     try:
         model = onu_model(conexao, slot, pon, position)
@@ -662,101 +723,270 @@ def _handle_standard_onu_provisioning(conexao, serial: str, vlan: str, name: str
     except Exception as e:
         logger.error(f"Erro ao obter modelo da ONU: {str(e)}")
         print("❗ Modelo da ONU não encontrado")
-        return
+        return False
 
-    if not provision_onu_by_model(conexao, model, slot, pon, position, vlan):
+    if not model_supported(model):
         handle_incompatible_model(conexao, serial, slot, pon, position, model)
-    else:
-        logger.info("Provisionamento concluído com sucesso!")
-        print("Provisionamento concluído com sucesso!")
+        return False
+
+    if not provision_onu_by_model(conexao, model, slot, pon, position, vlan):
+        print("❗ Falha ao configurar o serviço da ONU")
+        return False
+
+    logger.info("Provisionamento concluído com sucesso!")
+    print("Provisionamento concluído com sucesso!")
+    return True
                     
+def _migrated_record(serial: str, slot: str, pon: str, position: str, name: str, vlan: str) -> Dict:
+    """Row of csv/migrated.csv"""
+    return {
+        'serial': serial,
+        'slot': slot,
+        'pon': pon,
+        'position': position,
+        'name': name,
+        'vlan': vlan,
+        'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+def _migrate_pon(ip_olt: str, slot: str, pon: str, items: List[Dict], progress: MigrationProgress,
+                 nokia_onts: List[Tuple[Dict, str, str, str, str]], journal: MigrationJournal,
+                 resumed: Dict[str, Dict]) -> Tuple[List[Dict], List[Dict]]:
+    """Migrate the ONUs of one PON, in order, over a dedicated SSH session.
+
+    Nokia ONTs (ALCL) only get their position here; they are queued in nokia_onts
+    as (item, slot, pon, position, vlan) for the TL1 batch. ONUs in resumed were
+    already added before an interruption and continue from their journaled position.
+    """
+    migrated_onus = []
+    not_migrated_onus = []
+
+    with ssh_connection(ip_olt) as conexao:
+        for item in items:
+            serial = item.get('serial', '').upper().strip()
+            name = item.get('name', 'CLIENTE').strip()
+            position = None
+            try:
+                vlan = nokia_vlan(slot, pon)
+                if not vlan:
+                    raise Exception(f"VLAN não encontrada para slot {slot} e PON {pon}")
+
+                logger.info(f"Processando ONU {serial} - Slot: {slot}, PON: {pon}, Nome: {name}, VLAN: {vlan}")
+
+                if serial in resumed:
+                    position = resumed[serial]['position']
+                    logger.info(f"Retomando ONU {serial} já adicionada na posição {position}")
+                else:
+                    position = checkfreeposition(conexao, slot, pon, ip_olt)
+                    logger.info(f"Posição livre encontrada: {position}")
+                    journal.record(serial, STEP_ALLOCATED, slot=slot, pon=pon, position=position)
+
+                    if serial.startswith(NOKIA_SERIAL_PREFIX):
+                        # A posição só é usada no lote TL1, depois de todas as PONs: a reserva precisa durar até lá
+                        hold_position(ip_olt, slot, pon, position)
+                        nokia_onts.append((item, slot, pon, position, vlan))
+                        continue
+
+                    if not add_to_pon(conexao, slot, pon, position, format_ssh_serial(serial), name, "Bridge"):
+                        raise Exception(f"ONU {serial} não ficou pronta na posição {position}")
+                    journal.record(serial, STEP_ADDED, slot=slot, pon=pon, position=position)
+
+                if not configure_standard_onu(conexao, item, slot, pon, position, vlan):
+                    raise Exception(f"Falha ao configurar o serviço da ONU {serial}")
+
+                record_onu(ip_olt, "nokia", serial, slot, pon, position, name=name)
+                confirm_position(ip_olt, slot, pon, position)
+                migrated_onus.append(_migrated_record(serial, slot, pon, position, name, vlan))
+                journal.record(serial, STEP_MIGRATED, slot=slot, pon=pon, position=position, name=name, vlan=vlan)
+                progress.success()
+
+            except Exception as e:
+                logger.error(f"Erro ao migrar ONU {serial}: {str(e)}")
+                if position:
+                    invalidate_pon_occupancy(ip_olt, slot, pon)
+                not_migrated_onus.append(failure_record(item, str(e)))
+                journal.record(serial, STEP_FAILED, error=str(e))
+                progress.failure()
+
+    return migrated_onus, not_migrated_onus
+
+def _hold_queued_positions(ip_olt: str, pendentes: List[Tuple[Dict, str, str, str, str]]) -> float:
+    """Renew the leases of the positions still waiting for the TL1 batch"""
+    for _, slot, pon, position, _ in pendentes:
+        hold_position(ip_olt, slot, pon, position)
+    return time.monotonic()
+
+def _migrate_nokia_onts(ip_olt: str, nokia_onts: List[Tuple[Dict, str, str, str, str]],
+                        progress: MigrationProgress, journal: MigrationJournal) -> Tuple[List[Dict], List[Dict]]:
+    """Provision every queued Nokia ONT (ALCL) through one TL1 session"""
+    migrated_onus = []
+    not_migrated_onus = []
+    if not nokia_onts:
+        return migrated_onus, not_migrated_onus
+
+    logger.info(f"Provisionando {len(nokia_onts)} ONTs Nokia em uma única sessão TL1")
+    pendentes = list(nokia_onts)
+    held_at = _hold_queued_positions(ip_olt, pendentes)
+    try:
+        with tl1_connection(ip_olt) as conexao_tl1:
+            while pendentes:
+                if time.monotonic() - held_at > RESERVATION_TTL / 2:
+                    held_at = _hold_queued_positions(ip_olt, pendentes)
+                item, slot, pon, position, vlan = pendentes.pop(0)
+                serial = item.get('serial', '').upper().strip()
+                name = item.get('name', 'CLIENTE').strip()
+                try:
+                    if not process_nokia_onu(conexao_tl1, item, slot, pon, position, vlan):
+                        raise Exception(f"Falha ao provisionar a ONT {serial} via TL1")
+                    record_onu(ip_olt, "nokia", serial, slot, pon, position, name=name)
+                    confirm_position(ip_olt, slot, pon, position)
+                    migrated_onus.append(_migrated_record(serial, slot, pon, position, name, vlan))
+                    journal.record(serial, STEP_MIGRATED, slot=slot, pon=pon, position=position, name=name, vlan=vlan)
+                    progress.success()
+                except Exception as e:
+                    logger.error(f"Erro ao migrar ONT {serial}: {str(e)}")
+                    invalidate_pon_occupancy(ip_olt, slot, pon)
+                    not_migrated_onus.append(failure_record(item, str(e)))
+                    journal.record(serial, STEP_FAILED, error=str(e))
+                    progress.failure()
+    except Exception as e:
+        # Sessão TL1 indisponível: as ONTs restantes ficam para o próximo ciclo
+        logger.error(f"Falha na sessão TL1 do lote de ONTs Nokia: {str(e)}")
+        for item, slot, pon, position, vlan in pendentes:
+            invalidate_pon_occupancy(ip_olt, slot, pon)
+            not_migrated_onus.append(failure_record(item, str(e)))
+            journal.record(item.get('serial', '').upper().strip(), STEP_FAILED, error=str(e))
+            progress.failure()
+
+    return migrated_onus, not_migrated_onus
+
+def _load_migration_journal(ip_olt: str) -> Tuple[MigrationJournal, Dict[str, Dict]]:
+    """Open the OLT migration journal, offering to resume an interrupted run"""
+    journal = MigrationJournal(journal_path(ip_olt))
+    if not journal.exists():
+        return journal, {}
+
+    states = journal.replay()
+    concluidas = sum(1 for state in states.values() if STEP_MIGRATED in state['steps'])
+    print(f"Migração interrompida encontrada: {concluidas} ONUs concluídas, {len(states) - concluidas} em andamento ou com falha")
+    resposta = get_user_input(
+        "Deseja retomar a migração anterior? (s/n): ",
+        validator=lambda x: x.lower() in ('s', 'n'),
+        required=True
+    )
+    if resposta.lower() == 's':
+        logger.info(f"Retomando migração a partir do journal {journal.path}")
+        return journal, states
+
+    journal.archive()
+    return journal, {}
+
+def _resolve_an5506_variants(migration_data: List[Dict]) -> None:
+    """Ask once, before the parallel workers, the variant of AN5506-01-A rows without a 'variant' column.
+
+    Rows without a model may be detected as AN5506-01-A, so they get the answer too.
+    """
+    sem_variante = [item for item in migration_data
+                    if item.get('variant', '').strip().lower() not in AN5506_VARIANTS.values()
+                    and item.get('model', '').strip() in ('', AN5506_MODEL)]
+    if not sem_variante:
+        return
+    print(f"\n{len(sem_variante)} ONUs do CSV podem ser Fiberhome AN5506-01-A sem a coluna 'variant'.")
+    print("Variante a usar para as AN5506-01-A encontradas entre elas:")
+    variant = ask_an5506_variant()
+    logger.info(f"Variante {variant} aplicada a {len(sem_variante)} ONUs sem a coluna 'variant'")
+    for item in sem_variante:
+        item['variant'] = variant
+
 def mass_migration_nokia(ip_olt: str) -> None:
-    """Mass migration of ONUs based on CSV migration file"""
+    """Mass migration of ONUs based on CSV migration file, in parallel per slot/PON.
+
+    Every step is journaled per ONU; an interrupted run can be resumed, skipping
+    the serials already migrated.
+    """
     try:
         # Load migration data from CSV
         migration_data = load_csv_data('csv/migration.csv')
-        vlan_data = load_csv_data('csv/nokia.csv')
-        
-        vlan_lookup = {(row['CARD'], row['PON']): row['VLAN'] for row in vlan_data}
+        nokia_vlan_table.validate()
+        journal, states = _load_migration_journal(ip_olt)
         
         migrated_onus = []
         not_migrated_onus = []
         already_processed = {}
 
-        with ssh_connection(ip_olt) as conexao:
-            while True:
-                logger.info("Listando ONUs não autorizadas...")
-                unauthorized_onu = list_unauthorized(conexao)
-
-                if not unauthorized_onu:
-                    logger.warning("Nenhuma ONU ou ONT pedindo autorização")
-                    print("Nenhuma ONU ou ONT pedindo autorização...")
-                    break
-
-                unauth_dict = {onu[0].upper(): (onu[1], onu[2]) for onu in unauthorized_onu}
-                pendentes = [item for item in migration_data if item['serial'].upper().strip() not in already_processed]
+        # ONUs concluídas na execução interrompida não custam nada nesta
+        for serial, state in states.items():
+            if STEP_MIGRATED in state['steps']:
+                migrated_onus.append(_migrated_record(serial, state['slot'], state['pon'], state['position'],
+                                                      state['name'], state['vlan']))
+                already_processed[serial] = 'migrated'
+        # ONUs já adicionadas na OLT, que continuam da configuração do serviço
+        added = {serial: state for serial, state in states.items()
+                 if STEP_ADDED in state['steps'] and serial not in already_processed}
 
-                if not pendentes:
-                    logger.info("Nenhum serial restante para tentar migração")
-                    break
-
-                logger.info(f"Iniciando novo ciclo de tentativa para {len(pendentes)} ONUs")
-                algum_migrado_nesse_ciclo = False
+        progress = MigrationProgress(total=len(migration_data) - len(already_processed))
+        _resolve_an5506_variants(migration_data)
 
-                for item in pendentes:
-                    serial = item.get('serial', '').upper().strip()
-                    if not serial:
-                        continue
+        while True:
+            logger.info("Listando ONUs não autorizadas...")
+            with ssh_connection(ip_olt) as conexao:
+                unauthorized_onu = list_unauthorized(conexao)
 
-                    if serial in unauth_dict:
-                        try:
-                            slot, pon = unauth_dict[serial]
-                            name = item.get('name', 'CLIENTE').strip()
-                            vlan = vlan_lookup.get((slot, pon))
-                            if not vlan:
-                                raise Exception(f"VLAN não encontrada para slot {slot} e PON {pon}")
-
-                            logger.info(f"Processando ONU {serial} - Slot: {slot}, PON: {pon}, Nome: {name}, VLAN: {vlan}")
-
-                            position = checkfreeposition(conexao, slot, pon)
-                            logger.info(f"Posição livre encontrada: {position}")
-
-                            if serial.startswith(NOKIA_SERIAL_PREFIX):
-                                # Switch to TL1 for Nokia ONTs
-                                conexao.terminate()
-                                with tl1_connection(ip_olt) as conexao_tl1:
-                                    process_nokia_onu(conexao_tl1, item, slot, pon, position, vlan)
-                                conexao = login_olt_ssh(host=ip_olt)
-                            else:
-                                process_standard_onu(conexao, item, slot, pon, position, vlan)
-
-                            migrated_onus.append({
-                                'serial': serial,
-                                'slot': slot,
-                                'pon': pon,
-                                'position': position,
-                                'name': name,
-                                'vlan': vlan,
-                                'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                            })
-                            already_processed[serial] = 'migrated'
-                            algum_migrado_nesse_ciclo = True
-
-                        except Exception as e:
-                            logger.error(f"Erro ao migrar ONU {serial}: {str(e)}")
-                            not_migrated_onus.append({
-                                'serial': serial,
-                                'error': str(e),
-                                'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                            })
-                            already_processed[serial] = 'error'
-                    else:
-                        logger.warning(f"Serial {serial} não encontrado na lista de ONUs não autorizadas")
-                        already_processed[serial] = 'not_found'
-
-                if not algum_migrado_nesse_ciclo:
-                    logger.info("Nenhuma ONU migrada nesse ciclo. Encerrando tentativas.")
-                    break
+            unauth_dict = {onu[0].upper(): (onu[1], onu[2]) for onu in unauthorized_onu}
+            pendentes = [item for item in migration_data if item['serial'].upper().strip() not in already_processed]
+
+            if not pendentes:
+                logger.info("Nenhum serial restante para tentar migração")
+                break
+
+            logger.info(f"Iniciando novo ciclo de tentativa para {len(pendentes)} ONUs")
+
+            tarefas = []
+            resumed = {}
+            for item in pendentes:
+                serial = item.get('serial', '').upper().strip()
+                if not serial:
+                    continue
+
+                if serial in unauth_dict:
+                    slot, pon = unauth_dict[serial]
+                    tarefas.append((slot, pon, item))
+                elif serial in added:
+                    # Some da lista de não autorizadas por já estar adicionada na posição
+                    resumed[serial] = added.pop(serial)
+                    tarefas.append((resumed[serial]['slot'], resumed[serial]['pon'], item))
+                else:
+                    logger.warning(f"Serial {serial} não encontrado na lista de ONUs não autorizadas")
+                    already_processed[serial] = 'not_found'
+
+            if not tarefas:
+                logger.warning("Nenhuma ONU ou ONT pedindo autorização")
+                print("Nenhuma ONU ou ONT pedindo autorização...")
+                break
+
+            # ONTs Nokia recebem posição nos workers SSH e são provisionadas juntas via TL1
+            onts_nokia = []
+            migradas, falhas = run_partitions(
+                partition_by_pon(tarefas),
+                lambda chave, itens, progresso: _migrate_pon(ip_olt, chave[0], chave[1], itens, progresso,
+                                                             onts_nokia, journal, resumed),
+                progress,
+            )
+            migradas_tl1, falhas_tl1 = _migrate_nokia_onts(ip_olt, onts_nokia, progress, journal)
+            migradas += migradas_tl1
+            falhas += falhas_tl1
+            for row in migradas:
+                already_processed[row['serial']] = 'migrated'
+            for row in falhas:
+                already_processed[row['serial']] = 'error'
+            migrated_onus.extend(migradas)
+            not_migrated_onus.extend(falhas)
+
+            if not migradas:
+                logger.info("Nenhuma ONU migrada nesse ciclo. Encerrando tentativas.")
+                break
+
+        progress.finish()
 
         # Save results to CSV files
         if migrated_onus:
@@ -767,6 +997,8 @@ def mass_migration_nokia(ip_olt: str) -> None:
             save_csv_data('csv/not_migrated.csv', not_migrated_onus, 
                         ['serial', 'error', 'timestamp'])
 
+        journal.archive()
+
         print(f"\nMigração concluída!")
         print(f"ONUs migradas com sucesso: {len(migrated_onus)}")
         print(f"ONUs não migradas: {len(not_migrated_onus)}")
@@ -782,7 +1014,7 @@ def list_onu_csv_nokia(ip_olt: str) -> None:
         pon = get_user_input("Digite a PON: ", required=True)
 
         with ssh_connection(ip_olt) as conexao:
-            success = list_onu(conexao, slot, pon)
+            success = list_onu(conexao, slot, pon, ip_olt)
             
             if success:
                 print("✅ Lista de ONUs salva com sucesso.")
@@ -800,7 +1032,7 @@ def list_pon_nokia(ip_olt: str) -> None:
         pon = get_user_input("Digite a PON: ", required=True)
 
         with ssh_connection(ip_olt) as conexao:
-            list_pon(conexao, slot, pon)
+            list_pon(conexao, slot, pon, ip_olt)
 
     except Exception as e:
         logger.error(f"Erro durante o processo de listagem: {str(e)}", exc_info=True)
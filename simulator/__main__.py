@@ -0,0 +1,115 @@
+"""
+Local OLT simulator for benchmarks and load tests.
+Stands in for the ssh client: the drivers spawn it through SSH_BINARY and
+talk to a simulated Parks CLI, Nokia ISAM CLI or Nokia TL1 port with the
+same prompts, outputs and errors as the real equipment, with configurable
+latency and PON sizes (SIM_* variables in .env.example).
+
+Usage: SSH_BINARY="python /path/to/Porygon/simulator" SSH_MULTIPLEX=0 python main.py
+       python -m simulator user@host [-p port]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import getpass
+import termios
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+from simulator.isam import IsamCli
+from simulator.tl1 import Tl1Session
+from simulator.parks import ParksCli
+
+# Constants
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config.json")
+DEFAULT_LATENCY = 0.05
+DEFAULT_LATENCY_JITTER = 0.02
+DEFAULT_LOGIN_LATENCY = 0.3
+EXIT_AUTH_FAILURE = 255
+
+# Carrega variáveis do arquivo .env
+load_dotenv()
+
+SIM_VENDOR = os.getenv('SIM_VENDOR', 'nokia')
+SIM_LATENCY = float(os.getenv('SIM_LATENCY', DEFAULT_LATENCY))
+SIM_LATENCY_JITTER = float(os.getenv('SIM_LATENCY_JITTER', DEFAULT_LATENCY_JITTER))
+SIM_LOGIN_LATENCY = float(os.getenv('SIM_LOGIN_LATENCY', DEFAULT_LOGIN_LATENCY))
+
+
+def resolve_vendor(host: str) -> str:
+    """Vendor of the OLT whose IP variable in config.json points to host"""
+    try:
+        with open(CONFIG_PATH, encoding="utf-8") as f:
+            vendors = json.load(f).get("vendors", {})
+    except (OSError, ValueError):
+        return SIM_VENDOR
+    for vendor, data in vendors.items():
+        for olt in data.get("olts", []):
+            if olt.get("env_ip") and os.getenv(olt["env_ip"]) == host:
+                return vendor
+    return SIM_VENDOR
+
+
+def open_session(host: str, port: str):
+    """Pick the simulated front end: TL1 port, ISAM CLI or Parks CLI"""
+    if port and port == os.getenv('TL1_PORT'):
+        return Tl1Session(host), os.getenv('TL1_PASSWORD')
+    if resolve_vendor(host) == "parks":
+        return ParksCli(host), os.getenv('SSH_PASSWORD_PARKS')
+    return IsamCli(host), os.getenv('SSH_PASSWORD')
+
+
+def pause(base: float) -> None:
+    delay = base + random.uniform(0, SIM_LATENCY_JITTER)
+    if delay > 0:
+        time.sleep(delay)
+
+
+def write(text: str) -> None:
+    sys.stdout.write(text)
+    sys.stdout.flush()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Simulador local de OLTs Parks/Nokia (substitui o ssh)")
+    parser.add_argument("destination", help="usuario@host")
+    parser.add_argument("-p", dest="port", default=None)
+    parser.add_argument("-o", dest="options", action="append", default=[], help="ignorado (opções do ssh)")
+    args = parser.parse_args()
+
+    user, _, host = args.destination.rpartition("@")
+    session, expected_password = open_session(host, args.port)
+
+    password = getpass.getpass(f"{user or 'root'}@{host}'s password: ")
+    pause(SIM_LOGIN_LATENCY)
+    if expected_password and password != expected_password:
+        write("Permission denied, please try again.\n")
+        return EXIT_AUTH_FAILURE
+
+    # Como na CLI da OLT, o eco sai quando a linha é processada, não quando chega
+    echo_lines = sys.stdin.isatty()
+    if echo_lines:
+        attrs = termios.tcgetattr(sys.stdin)
+        attrs[3] &= ~termios.ECHO
+        termios.tcsetattr(sys.stdin, termios.TCSANOW, attrs)
+
+    write(session.banner + session.prompt)
+    while not session.closed:
+        line = sys.stdin.readline()
+        if not line:
+            break
+        if echo_lines:
+            write(line)
+        output = session.handle(line.rstrip("\r\n"))
+        pause(SIM_LATENCY)
+        write(output + ("" if session.closed else session.prompt))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,295 @@
+"""
+Simulated Nokia ISAM CLI.
+Answers the show/configure commands used by nokia/nokia_ssh.py with the
+same prompts (typ:isadmin>#, $ while creating an ONT) and output layouts
+as the real OLT, backed by the shared simulator state.
+"""
+
+import re
+import shlex
+import time
+from typing import Dict, List, Optional
+from xml.sax.saxutils import escape
+
+from simulator.state import olt_state, ont_is_up, new_ont
+
+# Constants
+BASE_PROMPT = "typ:isadmin>"
+SEPARATOR = "=" * 93
+RULE = "-" * 93
+ONT_PATH = re.compile(r"\b1/1/(\d+)/(\d+)/(\d+)\b")
+PON_PATH = re.compile(r"^1/1/(\d+)/(\d+)$")
+MATCH_FILTER = re.compile(r"\|\s*match\s+(?:match\s+)?exact:(\S+)\s*$")
+INVALID_TOKEN = "Error : invalid token\n"
+
+
+def nokia_serial(serial: str) -> str:
+    """State key of a serial (ALCL:B3F40A21 -> ALCLB3F40A21)"""
+    return serial.replace(":", "").strip('"').upper()
+
+
+def display_serial(serial: str) -> str:
+    return f"{serial[:4]}:{serial[4:]}"
+
+
+def find_ont(state: Dict, slot: str, pon: str, position: str) -> Optional[str]:
+    """Serial of the ONT at a position, if any"""
+    for serial, ont in state["onts"].items():
+        if ont["slot"] == slot and ont["pon"] == pon and str(ont["position"]) == position:
+            return serial
+    return None
+
+
+class IsamCli:
+    """One CLI session on the simulated ISAM"""
+
+    banner = "\nWelcome to ISAM (simulador Porygon)\n\n"
+
+    def __init__(self, host: str) -> None:
+        self.host = host
+        self.context: List[str] = []
+        self.creating = False
+        self.current_ont: Optional[str] = None
+        self.closed = False
+
+    @property
+    def prompt(self) -> str:
+        path = ">".join(self.context)
+        return f"{BASE_PROMPT}{path + '>' if path else ''}{'$' if self.creating else '#'}"
+
+    def handle(self, line: str) -> str:
+        line = line.strip()
+        if not line:
+            return ""
+        if line == "exit all":
+            self._leave(all_levels=True)
+            return ""
+        if line == "exit":
+            self._leave()
+            return ""
+        if line == "logout":
+            self.closed = True
+            return ""
+        if line.startswith("environment "):
+            return ""
+        if line.startswith("show "):
+            return self._show(line)
+        if line.startswith("configure "):
+            return self._configure(line)
+        if self.context:
+            return self._context_command(line)
+        return INVALID_TOKEN
+
+    def _leave(self, all_levels: bool = False) -> None:
+        self.context = [] if all_levels else self.context[:-1]
+        self.creating = False
+        if not self.context:
+            self.current_ont = None
+
+    # Configuração
+
+    def _configure(self, line: str) -> str:
+        try:
+            words = shlex.split(line)
+        except ValueError:
+            return INVALID_TOKEN
+
+        path = ONT_PATH.search(line)
+        if words[1:4] == ["equipment", "ont", "interface"] and path and "sernum" in words:
+            return self._create_ont(words, path.groups())
+        if words[1:5] == ["equipment", "ont", "no", "interface"] and path:
+            return self._delete_ont(path.groups())
+
+        with olt_state(self.host, "nokia", write=True) as state:
+            serial = find_ont(state, *path.groups()) if path else None
+            if path and serial is None:
+                return "Error : instance does not exist\n"
+            if words[1:4] == ["equipment", "ont", "interface"] and "admin-state" in words:
+                state["onts"][serial]["admin"] = words[words.index("admin-state") + 1]
+
+        # O nó configurado vira o contexto do prompt, como na OLT
+        node = []
+        for word in words:
+            node.append(word)
+            if "/" in word or ":" in word:
+                break
+        self.context = node
+        self.creating = False
+        self.current_ont = serial
+        return ""
+
+    def _create_ont(self, words: List[str], path) -> str:
+        slot, pon, position = path
+        options = dict(zip(words[5::2], words[6::2]))
+        serial = nokia_serial(options.get("sernum", ""))
+        with olt_state(self.host, "nokia", write=True) as state:
+            occupant = find_ont(state, slot, pon, position)
+            if occupant and occupant != serial:
+                return "Error : resource is in use by another ont\n"
+            if occupant is None and serial in state["onts"]:
+                return "Error : serial number already provisioned\n"
+            if occupant is None:
+                onu = state["unprovisioned"].pop(serial, {"model": "undefined"})
+                ont = new_ont(onu, slot, pon, int(position), options.get("desc1", ""),
+                              options.get("desc2", ""))
+                ont["admin"] = "down"
+                state["onts"][serial] = ont
+            else:
+                ont = state["onts"][serial]
+                ont["name"] = options.get("desc1", ont["name"])
+                ont["mode"] = options.get("desc2", ont["mode"])
+
+        self.context = ["configure", "equipment", "ont", "interface", f"1/1/{slot}/{pon}/{position}"]
+        self.creating = occupant is None
+        self.current_ont = serial
+        return ""
+
+    def _delete_ont(self, path) -> str:
+        with olt_state(self.host, "nokia", write=True) as state:
+            serial = find_ont(state, *path)
+            if serial is None:
+                return "Error : instance does not exist\n"
+            ont = state["onts"].pop(serial)
+            # A ONU continua ligada na PON e volta para a lista de não provisionadas
+            if ont["model"] != "undefined":
+                state["unprovisioned"][serial] = {"slot": ont["slot"], "pon": ont["pon"], "model": ont["model"]}
+        self.context = ["configure", "equipment", "ont"]
+        self.creating = False
+        self.current_ont = None
+        return ""
+
+    def _context_command(self, line: str) -> str:
+        words = line.split()
+        if self.current_ont and words[0] == "admin-state" and len(words) == 2:
+            with olt_state(self.host, "nokia", write=True) as state:
+                ont = state["onts"].get(self.current_ont)
+                if ont is None:
+                    return "Error : instance does not exist\n"
+                if words[1] == "up" and ont["admin"] != "up":
+                    ont["created"] = time.time()
+                ont["admin"] = words[1]
+        return ""
+
+    # Consultas
+
+    def _show(self, line: str) -> str:
+        match = MATCH_FILTER.search(line)
+        if match:
+            line = line[:match.start()].strip()
+        words = line.split()
+        xml = words[-1] == "xml"
+        if xml:
+            words = words[:-1]
+
+        with olt_state(self.host, "nokia") as state:
+            if words[1:] == ["pon", "unprovision-onu"]:
+                output = self._unprovisioned(state)
+            elif words[1:5] == ["equipment", "ont", "status", "pon"]:
+                onts = self._select(state, words[5] if len(words) > 5 else None)
+                output = self._status_xml(onts) if xml else self._status_table(onts)
+            elif words[1:4] == ["equipment", "ont", "optics"] and len(words) > 4:
+                onts = self._select(state, words[4])
+                if xml:
+                    output = self._optics_xml(onts)
+                elif onts:
+                    output = self._optics_detail(onts[0])
+                else:
+                    output = "Error : instance does not exist\n"
+            elif words[1:4] == ["equipment", "ont", "interface"] and len(words) > 4:
+                onts = self._select(state, words[4])
+                output = self._interface_detail(onts[0]) if onts else "Error : instance does not exist\n"
+            else:
+                return INVALID_TOKEN
+
+        if match:
+            output = "".join(row for row in output.splitlines(True) if match.group(1) in row)
+        return output
+
+    def _select(self, state: Dict, path: Optional[str]) -> List[Dict]:
+        """ONTs of an ONT path, of a PON path or of the whole OLT, ordered by position"""
+        onts = [dict(ont, serial=serial) for serial, ont in state["onts"].items()]
+        if path:
+            pon_path = PON_PATH.match(path)
+            ont_path = ONT_PATH.fullmatch(path)
+            if pon_path:
+                onts = [o for o in onts if (o["slot"], o["pon"]) == pon_path.groups()]
+            elif ont_path:
+                slot, pon, position = ont_path.groups()
+                onts = [o for o in onts if (o["slot"], o["pon"], str(o["position"])) == (slot, pon, position)]
+            else:
+                onts = []
+        return sorted(onts, key=lambda o: (int(o["slot"]), int(o["pon"]), o["position"]))
+
+    def _unprovisioned(self, state: Dict) -> str:
+        rows = [
+            f"{index:<10} {'1/1/' + onu['slot'] + '/' + onu['pon']:<16} {serial:<18} "
+            f"{'undefined':<13} {'undefined':<26} undefined\n"
+            for index, (serial, onu) in enumerate(state["unprovisioned"].items(), start=1)
+        ]
+        return (f"{SEPARATOR}\nunprovision-onu table\n{SEPARATOR}\n"
+                f"alarm-idx  gpon-index       ont-serial-number  loid          logical-authentication-id  subscriber-locid\n"
+                f"{RULE}\n{''.join(rows)}{RULE}\nunprovision-onu count : {len(rows)}\n{SEPARATOR}\n")
+
+    def _status_table(self, onts: List[Dict]) -> str:
+        rows = []
+        for o in onts:
+            up = ont_is_up(o)
+            rows.append(
+                f"{'1/1/' + o['slot'] + '/' + o['pon']:<14} {'1/1/{}/{}/{}'.format(o['slot'], o['pon'], o['position']):<16} "
+                f"{display_serial(o['serial']):<15} {o['admin']:<13} {'up' if up else 'down':<12} "
+                f"{str(o['rx']) if up else 'invalid':<22} {o['distance']:<21} {chr(34) + o['name'] + chr(34):<20} {o['mode']}\n"
+            )
+        return (f"{SEPARATOR}\nstatus-table\n{SEPARATOR}\n"
+                f"pon            ont              sernum          admin-status  oper-status  "
+                f"olt-rx-sig-level(dbm)  ont-olt-distance(km)  desc1                desc2\n"
+                f"{RULE}\n{''.join(rows)}{RULE}\nstatus-table count : {len(rows)}\n{SEPARATOR}\n")
+
+    def _xml(self, instances: List[Dict[str, str]]) -> str:
+        parts = ['<?xml version="1.0" encoding="UTF-8"?>\n<runtime-data>\n<hierarchy name="show" type="static">\n']
+        for ont_id, info in instances:
+            parts.append(f'<instance>\n<res-id name="ont" short-name="ont" type="Gpon::OntIndex">{ont_id}</res-id>\n')
+            parts.extend(f'<info name="{name}">{escape(str(value))}</info>\n' for name, value in info.items())
+            parts.append("</instance>\n")
+        parts.append("</hierarchy>\n</runtime-data>\n")
+        return "".join(parts)
+
+    def _status_xml(self, onts: List[Dict]) -> str:
+        return self._xml([
+            (f"1/1/{o['slot']}/{o['pon']}/{o['position']}", {
+                "sernum": display_serial(o["serial"]),
+                "admin-status": o["admin"],
+                "oper-status": "up" if ont_is_up(o) else "down",
+                "olt-rx-sig-level(dbm)": o["rx"] if ont_is_up(o) else "invalid",
+                "ont-olt-distance(km)": o["distance"],
+                "desc1": o["name"],
+                "desc2": o["mode"],
+            })
+            for o in onts
+        ])
+
+    def _optics_xml(self, onts: List[Dict]) -> str:
+        return self._xml([
+            (f"1/1/{o['slot']}/{o['pon']}/{o['position']}", {
+                "rx-signal-level": f"{o['rx']:.2f}",
+                "tx-signal-level": "2.31",
+                "ont-temperature": o["temperature"],
+            })
+            for o in onts if ont_is_up(o)
+        ])
+
+    def _optics_detail(self, o: Dict) -> str:
+        up = ont_is_up(o)
+        rx = f"{o['rx']:.2f}" if up else "invalid"
+        temperature = o["temperature"] if up else "invalid"
+        return (f"{SEPARATOR}\noptics table\n{SEPARATOR}\n"
+                f"ont-idx : 1/1/{o['slot']}/{o['pon']}/{o['position']}\n"
+                f"{'rx-signal-level : ' + rx:<48}tx-signal-level : 2.31\n"
+                f"{'ont-voltage : 3.28':<48}olt-rx-sig-level : -24.10\n"
+                f"{'laser-bias-curr : 8432':<48}ont-temperature : {temperature}\n{SEPARATOR}\n")
+
+    def _interface_detail(self, o: Dict) -> str:
+        model = o["model"] if ont_is_up(o) else "undefined"
+        return (f"{SEPARATOR}\ninterface table\n{SEPARATOR}\n"
+                f"ont-idx : 1/1/{o['slot']}/{o['pon']}/{o['position']}\n"
+                f"{'eqpt-ver-num : 3FE49337AAAA01':<48}sw-ver-act : 3FE49337IJHK07\n"
+                f"{'equip-id : ' + model:<48}actual-num-slots : 1\n{SEPARATOR}\n")
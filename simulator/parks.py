@@ -0,0 +1,154 @@
+"""
+Simulated Parks OLT CLI.
+Covers the exec/config/interface modes and the gpon/onu commands used by
+parks/parks_ssh.py, with Parks-style prompts and error messages.
+"""
+
+import re
+import time
+from typing import Dict, List, Optional
+
+from simulator.state import olt_state, ont_is_up, new_ont
+
+# Constants
+HOSTNAME = "PARKS-SIM"
+INTERFACE = re.compile(r"^interface gpon1/(\d+)$")
+UNKNOWN_COMMAND = "% Unknown command.\n"
+
+
+class ParksCli:
+    """One CLI session on the simulated Parks OLT"""
+
+    banner = "\nParks OLT (simulador Porygon)\n\n"
+
+    def __init__(self, host: str) -> None:
+        self.host = host
+        self.modes: List[str] = []
+        self.pon: Optional[str] = None
+        self.closed = False
+
+    @property
+    def prompt(self) -> str:
+        if not self.modes:
+            return f"{HOSTNAME}#"
+        return f"{HOSTNAME}(config{'-if' if self.pon else ''})#"
+
+    def handle(self, line: str) -> str:
+        line = line.strip()
+        if line.startswith("do "):
+            line = line[3:]
+        if not line or line == "terminal length 0":
+            return ""
+        if line in ("exit", "end", "logout"):
+            return self._leave(line)
+        if line == "configure terminal":
+            self.modes = ["config"]
+            return ""
+        if line in ("copy r s", "copy running-config startup-config"):
+            return "Building configuration...\nConfiguration saved.\n"
+        if line.startswith("show "):
+            return self._show(line)
+
+        interface = INTERFACE.match(line)
+        if interface and self.modes:
+            self.modes = ["config", "if"]
+            self.pon = interface.group(1)
+            return ""
+        if self.pon and line.startswith(("onu ", "no onu ")):
+            return self._onu(line.split())
+        return UNKNOWN_COMMAND
+
+    def _leave(self, command: str) -> str:
+        if command == "logout" or (command == "exit" and not self.modes):
+            self.closed = True
+        elif command == "end":
+            self.modes, self.pon = [], None
+        else:
+            self.modes.pop()
+            if len(self.modes) < 2:
+                self.pon = None
+        return ""
+
+    def _onu(self, words: List[str]) -> str:
+        if len(words) < 3:
+            return UNKNOWN_COMMAND
+        with olt_state(self.host, "parks", write=True) as state:
+            if words[:3] == ["onu", "add", "serial-number"] and len(words) == 4:
+                serial = words[3].lower()
+                if serial in state["onts"]:
+                    return "% Serial already exists.\n"
+                onu = state["unprovisioned"].pop(serial, {"model": ""})
+                state["onts"][serial] = new_ont(onu, "0", self.pon, None, "", "")
+                return ""
+
+            if words[0] == "no":
+                serial = words[2].lower()
+                ont = state["onts"].pop(serial, None)
+                if ont is None:
+                    return f"ERROR: onu {serial} not found\n"
+                if ont["model"]:
+                    state["unprovisioned"][serial] = {"slot": "0", "pon": ont["pon"], "model": ont["model"]}
+                return ""
+
+            serial = words[2].lower() if words[1] == "reset" else words[1].lower()
+            ont = state["onts"].get(serial)
+            if ont is None or ont["pon"] != self.pon:
+                return f"ERROR: onu {serial} not found\n"
+            if words[1] == "reset":
+                ont["created"] = time.time()
+            elif words[2] == "alias":
+                ont["name"] = " ".join(words[3:]).strip('"')
+            elif words[2] in ("flow", "flow-profile"):
+                ont["mode"] = words[3] if len(words) > 3 else ""
+        return ""
+
+    def _show(self, line: str) -> str:
+        with olt_state(self.host, "parks") as state:
+            if line == "show gpon blacklist":
+                return self._blacklist(state)
+            words = line.split()
+            if words[1:3] == ["gpon", "onu"] and len(words) == 5 and words[4] == "summary":
+                return self._summary(state, words[3].lower())
+            if line.endswith(" onu model") and words[1] == "interface":
+                return self._models(state, words[2])
+            if words[1:3] == ["running-config", "interface"] and len(words) == 4:
+                return self._running_config(state, words[3])
+        return UNKNOWN_COMMAND
+
+    def _blacklist(self, state: Dict) -> str:
+        rows = "".join(f"{onu['slot']} | {onu['pon']} | {serial} | unprovisioned\n"
+                       for serial, onu in state["unprovisioned"].items())
+        return f"Slot | Port | Serial       | Status\n-----+------+--------------+--------\n{rows}"
+
+    def _summary(self, state: Dict, serial: str) -> str:
+        ont = state["onts"].get(serial)
+        if ont is None:
+            return f"ONU {serial} not found\n"
+        up = ont_is_up(ont)
+        return (f"Serial          : {serial}\n"
+                f"Alias           : {ont['name']}\n"
+                f"Interface       : gpon1/{ont['pon']}\n"
+                f"Model           : {ont['model'] if up else ''}\n"
+                f"Power Level     : {ont['rx'] if up else '-'} dBm\n"
+                f"Distance        : {int(ont['distance'] * 1000) if up else 0} m\n"
+                f"Status          : {'Active' if up else 'Inactive'} (Provisioned)\n")
+
+    def _pon_onts(self, state: Dict, interface: str):
+        pon = interface.split("/")[-1]
+        return [(serial, ont) for serial, ont in state["onts"].items() if ont["pon"] == pon]
+
+    def _models(self, state: Dict, interface: str) -> str:
+        rows = "".join(f"{serial} | {ont['model']}\n" if ont_is_up(ont) else f"{serial}\n"
+                       for serial, ont in self._pon_onts(state, interface))
+        return f"Serial       | Model\n-------------+------------------\n{rows}"
+
+    def _running_config(self, state: Dict, interface: str) -> str:
+        lines = [f"interface {interface}\n"]
+        for serial, ont in self._pon_onts(state, interface):
+            if ont["name"]:
+                alias = f'"{ont["name"]}"' if " " in ont["name"] else ont["name"]
+                lines.append(f" onu {serial} alias {alias}\n")
+            if ont["mode"]:
+                lines.append(f" onu {serial} flow-profile {ont['mode']}\n")
+        lines.append("!\n")
+        return "".join(lines)
@@ -0,0 +1,135 @@
+"""
+Persistent state of a simulated OLT.
+Each simulated OLT keeps its ONTs and the ONUs waiting for authorization in
+a JSON file, shared by every session (SSH, TL1, parallel workers) through an
+exclusive file lock, so a provisioning done in one session shows up in the
+listings of the others.
+"""
+
+import os
+import json
+import time
+import fcntl
+import random
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from dotenv import load_dotenv
+
+# Constants
+DEFAULT_STATE_DIR = os.path.join("data", "simulator")
+DEFAULT_SLOTS = 2
+DEFAULT_PONS = 4
+DEFAULT_PON_SIZE = 32
+DEFAULT_UNPROVISIONED = 16
+DEFAULT_ONT_UP_DELAY = 1.0
+DEFAULT_TR069_APPLY_DELAY = 1.0
+PON_CAPACITY = 128
+
+# (prefixo do serial, modelo) das ONUs geradas por fabricante da OLT
+NOKIA_MODELS = [("ALCL", "G-1425G-A"), ("TPLG", "TX-6610"), ("ITBS", "110Gb"), ("FHTT", "AN5506-01-A")]
+PARKS_MODELS = [("prks", "FiberLink101"), ("prks", "Fiberlink100"), ("tplg", "TX-6610"), ("prks", "FiberLink611")]
+
+# Carrega variáveis do arquivo .env
+load_dotenv()
+
+STATE_DIR = os.getenv('SIM_STATE_DIR', DEFAULT_STATE_DIR)
+SIM_SLOTS = int(os.getenv('SIM_SLOTS', DEFAULT_SLOTS))
+SIM_PONS = int(os.getenv('SIM_PONS', DEFAULT_PONS))
+SIM_PON_SIZE = min(int(os.getenv('SIM_PON_SIZE', DEFAULT_PON_SIZE)), PON_CAPACITY)
+SIM_UNPROVISIONED = int(os.getenv('SIM_UNPROVISIONED', DEFAULT_UNPROVISIONED))
+SIM_ONT_UP_DELAY = float(os.getenv('SIM_ONT_UP_DELAY', DEFAULT_ONT_UP_DELAY))
+SIM_TR069_APPLY_DELAY = float(os.getenv('SIM_TR069_APPLY_DELAY', DEFAULT_TR069_APPLY_DELAY))
+SIM_SEED = os.getenv('SIM_SEED', 'porygon')
+
+
+def _serial(rng: random.Random, prefix: str) -> str:
+    digits = f"{rng.getrandbits(32):08X}"
+    return prefix + (digits.lower() if prefix.islower() else digits)
+
+
+def _ont(rng: random.Random, model: str, slot: str, pon: str, position: Optional[int],
+         name: str, mode: str, created: float) -> Dict:
+    return {
+        "slot": slot,
+        "pon": pon,
+        "position": position,
+        "model": model,
+        "name": name,
+        "mode": mode,
+        "admin": "up",
+        "created": created,
+        "rx": round(rng.uniform(-27.0, -17.0), 2),
+        "temperature": rng.randint(38, 58),
+        "distance": round(rng.uniform(0.3, 12.0), 3),
+    }
+
+
+def generate_state(host: str, vendor: str) -> Dict:
+    """Build a fresh OLT: SIM_PON_SIZE ONTs per PON and SIM_UNPROVISIONED ONUs waiting"""
+    rng = random.Random(f"{SIM_SEED}:{host}:{vendor}")
+    models = NOKIA_MODELS if vendor == "nokia" else PARKS_MODELS
+    slots = [str(s) for s in range(1, SIM_SLOTS + 1)] if vendor == "nokia" else ["0"]
+    onts: Dict[str, Dict] = {}
+    unprovisioned: Dict[str, Dict] = {}
+
+    for slot in slots:
+        for pon in range(1, SIM_PONS + 1):
+            for position in range(1, SIM_PON_SIZE + 1):
+                prefix, model = rng.choice(models)
+                onts[_serial(rng, prefix)] = _ont(rng, model, slot, str(pon), position,
+                                                  f"cliente_{slot}_{pon}_{position}", "BRIDGE", 0.0)
+
+    for _ in range(SIM_UNPROVISIONED):
+        prefix, model = rng.choice(models)
+        unprovisioned[_serial(rng, prefix)] = {
+            "slot": rng.choice(slots),
+            "pon": str(rng.randint(1, SIM_PONS)),
+            "model": model,
+        }
+
+    return {"host": host, "vendor": vendor, "onts": onts, "unprovisioned": unprovisioned}
+
+
+def state_path(host: str) -> str:
+    safe = "".join(c if c.isalnum() or c in "-_." else "_" for c in host)
+    return os.path.join(STATE_DIR, f"{safe}.json")
+
+
+@contextmanager
+def olt_state(host: str, vendor: str, write: bool = False) -> Iterator[Dict]:
+    """Yield the OLT state under an exclusive lock, saving it back when write=True"""
+    os.makedirs(STATE_DIR, exist_ok=True)
+    path = state_path(host)
+    with open(path + ".lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as f:
+                    state = json.load(f)
+            else:
+                state = generate_state(host, vendor)
+                write = True
+            yield state
+            if write:
+                with open(path + ".tmp", "w", encoding="utf-8") as f:
+                    json.dump(state, f)
+                os.replace(path + ".tmp", path)
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def ont_is_up(ont: Dict) -> bool:
+    """A new ONT only comes up SIM_ONT_UP_DELAY seconds after being provisioned"""
+    return ont["admin"] == "up" and time.time() - ont["created"] >= SIM_ONT_UP_DELAY
+
+
+def tr069_applied(ont: Dict, param: Dict) -> bool:
+    """A TR-069 parameter is applied SIM_TR069_APPLY_DELAY seconds after it was set on an UP ONT"""
+    return ont_is_up(ont) and time.time() - max(param["set"], ont["created"] + SIM_ONT_UP_DELAY) >= SIM_TR069_APPLY_DELAY
+
+
+def new_ont(onu: Dict, slot: str, pon: str, position: Optional[int], name: str, mode: str) -> Dict:
+    """Turn an unprovisioned ONU into a provisioned ONT"""
+    rng = random.Random()
+    return _ont(rng, onu["model"], slot, pon, position, name, mode, time.time())
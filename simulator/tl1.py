@@ -0,0 +1,122 @@
+"""
+Simulated Nokia TL1 port.
+Accepts the TL1 commands used by nokia/nokia_tl1.py and answers with
+COMPLD/DENY response blocks followed by the '<' prompt. ONTs created here
+are the same ones seen by the simulated ISAM CLI of the OLT.
+"""
+
+import re
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+from simulator.state import olt_state, ont_is_up, new_ont, tr069_applied
+from simulator.isam import find_ont, nokia_serial
+
+# Constants
+TARGET = "PORYGON-SIM"
+ONT_AID = re.compile(r"-1-1-(\d+)-(\d+)-(\d+)")
+SPARAM_AID = re.compile(r"^HGUTR069SPARAM-1-1-\d+-\d+-\d+-(\d+)$")
+READ_VERBS = ("RTRV-ONT", "RTRV-HGUTR069-SPARAM")
+PARAMETER = re.compile(r'(\w+)=("[^"]*"|[^,;]*)')
+
+
+def response(status: str, body: str = "") -> str:
+    header = f"\n   {TARGET} {datetime.now().strftime('%y-%m-%d %H:%M:%S')}\nM  0 {status}\n"
+    return f"{header}{body};\n"
+
+
+def deny(code: str, reason: str) -> str:
+    return response("DENY", f"   {code}\n   /* {reason} */\n")
+
+
+class Tl1Session:
+    """One TL1 session on the simulated ISAM"""
+
+    banner = "\nWelcome to ISAM (simulador Porygon)\n"
+    prompt = "<"
+
+    def __init__(self, host: str) -> None:
+        self.host = host
+        self.closed = False
+
+    def handle(self, line: str) -> str:
+        line = line.strip()
+        if not line:
+            return ""
+        if not line.endswith(";"):
+            return deny("IISP", "Input, Invalid SyntaX or Punctuation")
+
+        verb = line.split(":", 1)[0].upper()
+        if verb == "LOGOFF":
+            self.closed = True
+            return response("COMPLD")
+
+        parts = line.rstrip(";").split(":")
+        aid = parts[2] if len(parts) > 2 else ""
+        position = ONT_AID.search(aid)
+        if position is None:
+            return response("COMPLD")
+
+        with olt_state(self.host, "nokia", write=verb not in READ_VERBS) as state:
+            serial = find_ont(state, *position.groups())
+            if verb == "ENT-ONT":
+                return self._create(state, serial, position.groups(), line)
+            if serial is None:
+                return deny("IENE", "Input, Entity Not Exist")
+            ont = state["onts"][serial]
+            if verb == "RTRV-ONT":
+                return self._retrieve(serial, ont, aid)
+            sparam = SPARAM_AID.match(aid)
+            if sparam and verb.endswith("HGUTR069-SPARAM"):
+                return self._sparam(verb, ont, aid, sparam.group(1), line)
+            if verb == "DLT-ONT":
+                state["onts"].pop(serial)
+                state["unprovisioned"][serial] = {"slot": ont["slot"], "pon": ont["pon"], "model": ont["model"]}
+            elif verb == "ED-ONT":
+                state_change = parts[-1].upper()
+                if state_change == "IS" and ont["admin"] != "up":
+                    ont["admin"] = "up"
+                    ont["created"] = time.time()
+                elif state_change == "OOS":
+                    ont["admin"] = "down"
+            elif verb == "INIT-SYS":
+                ont["created"] = time.time()
+        return response("COMPLD")
+
+    def _create(self, state: Dict, occupant: Optional[str], position, line: str) -> str:
+        if occupant is not None:
+            return deny("SROF", "Status, Requested Operation Failed - position in use")
+        params = {key.upper(): value.strip('"') for key, value in PARAMETER.findall(line.split("::::", 1)[-1])}
+        serial = nokia_serial(params.get("SERNUM", ""))
+        if serial in state["onts"]:
+            return deny("SROF", "Status, Requested Operation Failed - serial already provisioned")
+        slot, pon, index = position
+        onu = state["unprovisioned"].pop(serial, {"model": "undefined"})
+        ont = new_ont(onu, slot, pon, int(index), params.get("DESC1", ""), params.get("DESC2", ""))
+        ont["admin"] = "down"
+        state["onts"][serial] = ont
+        return response("COMPLD")
+
+    def _retrieve(self, serial: str, ont: Dict, aid: str) -> str:
+        if ont["admin"] != "up":
+            primary = "OOS-AUMA"
+        else:
+            primary = "IS-NR" if ont_is_up(ont) else "OOS-AU"
+        body = f'   "{aid}::SERNUM={serial},DESC1={ont["name"]},DESC2={ont["mode"]}:{primary}"\n'
+        return response("COMPLD", body)
+
+    def _sparam(self, verb: str, ont: Dict, aid: str, index: str, line: str) -> str:
+        params = ont.setdefault("tr069", {})
+        if verb == "ENT-HGUTR069-SPARAM":
+            values = {key.upper(): value.strip('"') for key, value in PARAMETER.findall(line.split("::::", 1)[-1])}
+            params[index] = {"name": values.get("PARAMNAME", ""), "value": values.get("PARAMVALUE", ""), "set": time.time()}
+            return response("COMPLD")
+        param = params.pop(index, None) if verb == "DLT-HGUTR069-SPARAM" else params.get(index)
+        if param is None:
+            return deny("IENE", "Input, Entity Not Exist")
+        if verb == "DLT-HGUTR069-SPARAM":
+            return response("COMPLD")
+        primary = "IS-NR" if tr069_applied(ont, param) else "OOS-AU"
+        body = f'   "{aid}::PARAMNAME={param["name"]}:{primary}"\n'
+        return response("COMPLD", body)
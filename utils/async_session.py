@@ -0,0 +1,85 @@
+"""
+Async session module for OLT connections.
+Wraps a pexpect session so that waits on the OLT use expect(async_=True),
+letting a single event loop drive many sessions concurrently.
+"""
+
+import asyncio
+from typing import List, Optional, Union
+
+import pexpect
+from utils.log import get_logger
+from utils.ssh_transport import spawn_ssh, DEFAULT_SPAWN_TIMEOUT
+
+# Constants
+DEFAULT_COMMAND_TIMEOUT = 30
+
+logger = get_logger(__name__)
+
+Pattern = Union[str, type]
+
+
+class AsyncSession:
+    """pexpect session driven from asyncio"""
+
+    def __init__(self, child: pexpect.spawn, host: str) -> None:
+        self.child = child
+        self.host = host
+
+    @property
+    def before(self) -> str:
+        before = self.child.before
+        return before.decode('utf-8', errors='ignore') if isinstance(before, bytes) else (before or "")
+
+    async def expect(self, patterns: Union[Pattern, List[Pattern]],
+                     timeout: float = DEFAULT_COMMAND_TIMEOUT) -> int:
+        """Wait for one of the patterns without blocking the event loop"""
+        return await self.child.expect(patterns, timeout=timeout, async_=True)
+
+    async def sendline(self, line: str = "") -> None:
+        self.child.sendline(line)
+
+    async def send_command(self, command: str, prompt: Pattern,
+                           timeout: float = DEFAULT_COMMAND_TIMEOUT) -> str:
+        """Send a command and return the output printed before the prompt"""
+        self.child.sendline(command)
+        await self.expect(prompt, timeout=timeout)
+        return self.before
+
+    def isalive(self) -> bool:
+        return self.child.isalive()
+
+    async def close(self) -> None:
+        """Terminate the underlying process off the event loop"""
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                None, lambda: self.child.terminate(force=True)
+            )
+        except Exception as e:
+            logger.warning(f"Erro ao encerrar sessão assíncrona com {self.host}: {e}")
+
+
+async def spawn_ssh_async(user: str, host: str, port: Optional[str] = None,
+                          timeout: int = DEFAULT_SPAWN_TIMEOUT, protocol: str = "ssh") -> AsyncSession:
+    """Spawn an ssh session over the shared transport, ready for async use"""
+    # fork/exec é rápido, mas roda fora do loop para não travar as demais sessões
+    spawned = asyncio.get_running_loop().run_in_executor(
+        None, lambda: spawn_ssh(user, host, port, timeout=timeout, protocol=protocol)
+    )
+    try:
+        child = await asyncio.shield(spawned)
+    except asyncio.CancelledError:
+        # O spawn termina mesmo cancelado: o processo criado é encerrado ao ficar pronto
+        spawned.add_done_callback(_terminate_orphan)
+        raise
+    return AsyncSession(child, host)
+
+
+def _terminate_orphan(spawned: asyncio.Future) -> None:
+    """Terminate a session whose spawn completed after the caller was cancelled"""
+    if spawned.cancelled() or spawned.exception() is not None:
+        return
+    try:
+        spawned.result().terminate(force=True)
+    except Exception as e:
+        logger.warning(f"Erro ao encerrar sessão órfã: {e}")
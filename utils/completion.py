@@ -0,0 +1,43 @@
+"""
+Completion module for OLT command flows.
+Provides helpers to wait on explicit readiness conditions instead of fixed sleeps.
+"""
+
+import time
+import random
+from typing import Callable, Optional, TypeVar
+
+# Constants
+DEFAULT_POLL_INTERVAL = 1.0
+
+T = TypeVar("T")
+
+
+def wait_until(condition: Callable[[], T], timeout: float,
+               interval: float = DEFAULT_POLL_INTERVAL,
+               backoff: float = 1.0,
+               max_interval: Optional[float] = None,
+               jitter: float = 0.0) -> Optional[T]:
+    """Poll condition until it returns a truthy value or the timeout expires.
+
+    The delay between polls starts at interval and is multiplied by backoff
+    after every miss, capped at max_interval. With jitter, each sleep is
+    randomized by up to +/- that fraction of the delay. Returns the truthy
+    value produced by the condition, or None on timeout.
+    """
+    deadline = time.monotonic() + timeout
+    delay = interval
+    while True:
+        result = condition()
+        if result:
+            return result
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        sleep = delay * (1 + random.uniform(-jitter, jitter)) if jitter else delay
+        time.sleep(min(sleep, remaining))
+
+        delay *= backoff
+        if max_interval is not None:
+            delay = min(delay, max_interval)
@@ -0,0 +1,77 @@
+"""
+Local database module.
+Opens the SQLite database shared by the local indexes in WAL mode, so
+readers never block the writer and several processes can use it at once.
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import List, Optional
+
+from dotenv import load_dotenv
+from utils.log import get_logger
+
+# Constants
+DEFAULT_DB_PATH = os.path.join("data", "porygon.db")
+BUSY_TIMEOUT = 10
+
+logger = get_logger(__name__)
+
+# Carrega variáveis do arquivo .env
+load_dotenv()
+
+DB_PATH = os.getenv('PORYGON_DB', DEFAULT_DB_PATH)
+
+_schemas: List[str] = []
+_initialized = set()
+_lock = threading.Lock()
+
+
+def register_schema(schema: str) -> None:
+    """Register DDL (CREATE ... IF NOT EXISTS) applied on first connection"""
+    with _lock:
+        _schemas.append(schema)
+        _initialized.clear()
+
+
+def connect(path: Optional[str] = None) -> sqlite3.Connection:
+    """Open a WAL connection in autocommit mode; transactions are explicit"""
+    path = path or DB_PATH
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT * 1000}")
+
+    with _lock:
+        if path not in _initialized:
+            for schema in _schemas:
+                conn.executescript(schema)
+            _initialized.add(path)
+    return conn
+
+
+@contextmanager
+def transaction(path: Optional[str] = None, immediate: bool = False):
+    """Yield a connection inside a transaction, committed on success.
+
+    immediate=True takes the write lock up front (BEGIN IMMEDIATE), which
+    serializes read-modify-write sequences across processes.
+    """
+    conn = connect(path)
+    try:
+        conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+        yield conn
+        conn.execute("COMMIT")
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
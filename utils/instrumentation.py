@@ -0,0 +1,282 @@
+"""
+Instrumentation module for OLT sessions.
+Times every command sent through the pexpect layer, from the send until the
+last expect before the next command, and aggregates latency and bytes
+received into histograms per (operation, OLT, protocol, command template).
+A summary per command, per operation and per OLT is written at exit.
+"""
+
+import os
+import re
+import time
+import atexit
+import weakref
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+import pexpect
+from dotenv import load_dotenv
+from utils.log import get_logger
+from utils.transcript import SECRET_RULES
+
+# Constants
+BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+DEFAULT_REPORT_PATH = os.path.join("logs", "latency_report.txt")
+REPORT_TOP_COMMANDS = 25
+LOGIN_TEMPLATE = "<login>"
+SECRET_TEMPLATE = "<senha>"
+CREDENTIALS_TEMPLATE = "<comando com credenciais>"
+
+logger = get_logger(__name__)
+
+# Carrega variáveis do arquivo .env
+load_dotenv()
+
+LATENCY_REPORT = os.getenv('LATENCY_REPORT', DEFAULT_REPORT_PATH)
+
+# Normalização de comandos em modelos: identificadores viram marcadores
+TEMPLATE_RULES = [
+    (re.compile(r'"[^"]*"'), '"<texto>"'),
+    (re.compile(r"\b[A-Z]{4}:?[0-9A-F]{8}\b", re.IGNORECASE), "<serial>"),
+    (re.compile(r"\b\d+(?:[/-]\d+)+\b"), "<porta>"),
+    (re.compile(r"\b\d+\b"), "<n>"),
+]
+TL1_VERB = re.compile(r"^([A-Z]+-[A-Z0-9-]+):")
+PASSWORD_PROMPT = re.compile(r"(?i)pass(word)?\s*:?\s*$")
+
+SampleKey = Tuple[str, str, str, str]  # (operação, OLT, protocolo, modelo do comando)
+
+_operation = "-"
+
+
+def _mask_secret(match: re.Match) -> str:
+    return match.group(0)[:match.start(1) - match.start(0)] + SECRET_TEMPLATE
+
+
+def _leaks_secret(template: str) -> bool:
+    return any(match.group(1) != SECRET_TEMPLATE for rule in SECRET_RULES for match in rule.finditer(template))
+
+
+def command_template(command: str) -> str:
+    """Reduce a command line to its template (credentials, serials, ports, numbers and strings masked)"""
+    command = command.strip()
+    if not command:
+        return "<enter>"
+    verb = TL1_VERB.match(command)
+    if verb:
+        return verb.group(1)
+    for rule in SECRET_RULES:
+        command = rule.sub(_mask_secret, command)
+    for pattern, replacement in TEMPLATE_RULES:
+        command = pattern.sub(replacement, command)
+    # Um modelo vira chave de histograma e vai para o log e o relatório: nunca com credenciais
+    if _leaks_secret(command):
+        logger.warning("Modelo de comando ainda continha credenciais; registrado de forma genérica")
+        return CREDENTIALS_TEMPLATE
+    return command
+
+
+@contextmanager
+def operation(name: str):
+    """Tag the commands sent while the block runs with an operation name"""
+    global _operation
+    previous, _operation = _operation, name
+    try:
+        yield
+    finally:
+        _operation = previous
+
+
+class LatencyHistogram:
+    """Bucketed latency distribution of one command template"""
+
+    def __init__(self) -> None:
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.failures = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.bytes = 0
+
+    def add(self, latency_ms: float, received: int, failed: bool) -> None:
+        index = next((i for i, bound in enumerate(BUCKETS_MS) if latency_ms <= bound), len(BUCKETS_MS))
+        self.buckets[index] += 1
+        self.count += 1
+        self.failures += failed
+        self.total_ms += latency_ms
+        self.max_ms = max(self.max_ms, latency_ms)
+        self.bytes += received
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets)]
+        self.count += other.count
+        self.failures += other.failures
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+        self.bytes += other.bytes
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound (ms) of the bucket holding the given fraction of samples"""
+        target = fraction * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS_MS + (self.max_ms,), self.buckets):
+            seen += count
+            if seen >= target:
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+
+class LatencyRecorder:
+    """Process-wide store of command latency histograms"""
+
+    def __init__(self) -> None:
+        self._histograms: Dict[SampleKey, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: SampleKey, latency_ms: float, received: int, failed: bool = False) -> None:
+        with self._lock:
+            self._histograms.setdefault(key, LatencyHistogram()).add(latency_ms, received, failed)
+
+    def grouped(self, fields: Tuple[int, ...]) -> Dict[Tuple[str, ...], LatencyHistogram]:
+        """Merge the histograms by the given key positions"""
+        with self._lock:
+            items = list(self._histograms.items())
+        groups: Dict[Tuple[str, ...], LatencyHistogram] = {}
+        for key, histogram in items:
+            groups.setdefault(tuple(key[i] for i in fields), LatencyHistogram()).merge(histogram)
+        return groups
+
+    def report(self) -> str:
+        """Text summary by command, by operation and by OLT, ordered by total time"""
+        lines: List[str] = []
+        sections = [
+            ("Comandos", (2, 3), REPORT_TOP_COMMANDS),
+            ("Operações", (0,), None),
+            ("OLTs", (1, 2), None),
+        ]
+        for title, fields, limit in sections:
+            groups = sorted(self.grouped(fields).items(), key=lambda item: item[1].total_ms, reverse=True)
+            lines.append(f"== {title} ==")
+            lines.append(f"{'chave':<80} {'n':>6} {'falhas':>6} {'total s':>9} {'média ms':>9} "
+                         f"{'p50 ms':>8} {'p95 ms':>8} {'máx ms':>8} {'KiB':>8}")
+            for key, h in groups[:limit]:
+                label = " | ".join(key)[:80]
+                lines.append(f"{label:<80} {h.count:>6} {h.failures:>6} {h.total_ms / 1000:>9.2f} "
+                             f"{h.total_ms / h.count:>9.1f} {h.percentile(0.5):>8.0f} "
+                             f"{h.percentile(0.95):>8.0f} {h.max_ms:>8.0f} {h.bytes / 1024:>8.1f}")
+            lines.append("")
+        return "\n".join(lines)
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return not self._histograms
+
+
+latency_recorder = LatencyRecorder()
+_live_sessions: "weakref.WeakSet[InstrumentedSpawn]" = weakref.WeakSet()
+
+
+def _matched_failure(pattern, index: int) -> bool:
+    """Whether expect() returned the index of a pexpect.TIMEOUT or pexpect.EOF entry of the pattern list"""
+    patterns = pattern if isinstance(pattern, (list, tuple)) else [pattern]
+    return 0 <= index < len(patterns) and patterns[index] in (pexpect.TIMEOUT, pexpect.EOF)
+
+
+class InstrumentedSpawn(pexpect.spawn):
+    """pexpect.spawn that reports the latency of every command to latency_recorder"""
+
+    def __init__(self, command: str, host: str, protocol: str, **kwargs) -> None:
+        super().__init__(command, **kwargs)
+        self.olt_host = host
+        self.protocol = protocol
+        self._template: Optional[str] = LOGIN_TEMPLATE
+        self._operation = _operation
+        self._started = time.perf_counter()
+        self._finished: Optional[float] = None
+        self._received = 0
+        self._failed = False
+        _live_sessions.add(self)
+
+    def _flush_sample(self) -> None:
+        """Record the command in progress, if any expect completed for it"""
+        if self._template is not None and self._finished is not None:
+            latency_recorder.record(
+                (self._operation, self.olt_host, self.protocol, self._template),
+                (self._finished - self._started) * 1000, self._received, self._failed,
+            )
+        self._template = None
+        self._finished = None
+
+    def send(self, s) -> int:
+        text = s.decode(errors="ignore") if isinstance(s, bytes) else str(s)
+        self._flush_sample()
+        after = self.after if isinstance(self.after, str) else ""
+        lines = [line for line in text.splitlines() if line.strip()]
+        if PASSWORD_PROMPT.search(after):
+            self._template = SECRET_TEMPLATE
+        elif len(lines) > 1:
+            self._template = f"{command_template(lines[0])} (+{len(lines) - 1} em bloco)"
+        else:
+            self._template = command_template(text)
+        self._operation = _operation
+        self._started = time.perf_counter()
+        self._received = 0
+        self._failed = False
+        return super().send(s)
+
+    def _observe(self, failed: bool) -> None:
+        self._finished = time.perf_counter()
+        self._failed = self._failed or failed
+        for part in (self.before, self.after):
+            if isinstance(part, (str, bytes)):
+                self._received += len(part)
+
+    def expect(self, pattern, timeout=-1, searchwindowsize=-1, async_=False, **kw):
+        if async_:
+            return self._expect_async(pattern, timeout, searchwindowsize, **kw)
+        try:
+            index = super().expect(pattern, timeout, searchwindowsize, **kw)
+        except (pexpect.TIMEOUT, pexpect.EOF):
+            self._observe(failed=True)
+            raise
+        self._observe(failed=_matched_failure(pattern, index))
+        return index
+
+    async def _expect_async(self, pattern, timeout, searchwindowsize, **kw):
+        try:
+            index = await super().expect(pattern, timeout, searchwindowsize, async_=True, **kw)
+        except (pexpect.TIMEOUT, pexpect.EOF):
+            self._observe(failed=True)
+            raise
+        self._observe(failed=_matched_failure(pattern, index))
+        return index
+
+    def close(self, force=True) -> None:
+        self._flush_sample()
+        super().close(force)
+
+    def terminate(self, force=False) -> bool:
+        self._flush_sample()
+        return super().terminate(force)
+
+
+def write_latency_report(path: Optional[str] = LATENCY_REPORT) -> Optional[str]:
+    """Write the summary report to path (and the log); returns the report text"""
+    # Sessões ainda abertas (ex.: no pool) têm o último comando pendente
+    for session in list(_live_sessions):
+        session._flush_sample()
+    if latency_recorder.is_empty():
+        return None
+    report = latency_recorder.report()
+    logger.info("Relatório de latência por comando:\n" + report)
+    if path:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(report)
+    return report
+
+
+atexit.register(write_latency_report)
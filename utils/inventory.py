@@ -0,0 +1,143 @@
+"""
+ONU inventory module.
+Local index serial -> (OLT, slot, PON, position) kept in the shared SQLite
+database. It is filled from bulk PON listings and updated after every
+provision or unprovision, so serial lookups become point queries that the
+caller only has to confirm with one targeted command on the OLT.
+
+The index is a cache: failures are logged and never interrupt an operation.
+"""
+
+import time
+import sqlite3
+from typing import Iterable, NamedTuple, Optional, Tuple
+
+from utils import db
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS onu_inventory (
+    olt_ip     TEXT NOT NULL,
+    serial     TEXT NOT NULL,
+    vendor     TEXT NOT NULL,
+    slot       TEXT,
+    pon        TEXT NOT NULL,
+    position   TEXT,
+    name       TEXT,
+    model      TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (olt_ip, serial)
+);
+CREATE INDEX IF NOT EXISTS idx_onu_inventory_pon
+    ON onu_inventory (olt_ip, slot, pon, position);
+"""
+
+db.register_schema(SCHEMA)
+
+# (serial, position, name, model)
+PonMember = Tuple[str, Optional[str], Optional[str], Optional[str]]
+
+
+class InventoryEntry(NamedTuple):
+    olt_ip: str
+    serial: str
+    vendor: str
+    slot: Optional[str]
+    pon: str
+    position: Optional[str]
+    name: Optional[str]
+    model: Optional[str]
+    updated_at: float
+
+
+def normalize_serial(serial: str) -> str:
+    """Canonical serial form used as key: upper case, without ':' separators"""
+    return serial.replace(":", "").strip().upper()
+
+
+def lookup_onu(olt_ip: str, serial: str) -> Optional[InventoryEntry]:
+    """Return the indexed location of a serial on an OLT, if known"""
+    try:
+        conn = db.connect()
+        try:
+            row = conn.execute(
+                "SELECT * FROM onu_inventory WHERE olt_ip = ? AND serial = ?",
+                (olt_ip, normalize_serial(serial)),
+            ).fetchone()
+        finally:
+            conn.close()
+        return InventoryEntry(**dict(row)) if row else None
+    except sqlite3.Error as e:
+        logger.warning(f"Falha ao consultar inventário para {serial}: {e}")
+        return None
+
+
+def record_onu(olt_ip: str, vendor: str, serial: str, slot: Optional[str], pon: str,
+               position: Optional[str] = None, name: Optional[str] = None,
+               model: Optional[str] = None) -> None:
+    """Insert or move a serial; any other serial indexed at the same position is evicted"""
+    serial = normalize_serial(serial)
+    try:
+        with db.transaction(immediate=True) as conn:
+            if position is not None:
+                conn.execute(
+                    "DELETE FROM onu_inventory WHERE olt_ip = ? AND slot IS ? AND pon = ? "
+                    "AND position = ? AND serial != ?",
+                    (olt_ip, slot, str(pon), str(position), serial),
+                )
+            conn.execute(
+                "INSERT INTO onu_inventory (olt_ip, serial, vendor, slot, pon, position, name, model, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (olt_ip, serial) DO UPDATE SET vendor = excluded.vendor, slot = excluded.slot, "
+                "pon = excluded.pon, position = excluded.position, "
+                "name = COALESCE(excluded.name, name), model = COALESCE(excluded.model, model), "
+                "updated_at = excluded.updated_at",
+                (olt_ip, serial, vendor, slot, str(pon),
+                 str(position) if position is not None else None, name, model, time.time()),
+            )
+        logger.debug(f"Inventário atualizado: {serial} em {olt_ip} {slot}/{pon}/{position}")
+    except sqlite3.Error as e:
+        logger.warning(f"Falha ao atualizar inventário para {serial}: {e}")
+
+
+def record_pon(olt_ip: str, vendor: str, slot: Optional[str], pon: str,
+               members: Iterable[PonMember]) -> int:
+    """Replace the indexed contents of a PON with a fresh bulk listing"""
+    now = time.time()
+    rows = [
+        (olt_ip, normalize_serial(serial), vendor, slot, str(pon),
+         str(position) if position is not None else None, name, model, now)
+        for serial, position, name, model in members
+        if serial
+    ]
+    try:
+        with db.transaction(immediate=True) as conn:
+            conn.execute(
+                "DELETE FROM onu_inventory WHERE olt_ip = ? AND slot IS ? AND pon = ?",
+                (olt_ip, slot, str(pon)),
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO onu_inventory "
+                "(olt_ip, serial, vendor, slot, pon, position, name, model, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        logger.info(f"Inventário da PON {slot}/{pon} em {olt_ip} atualizado: {len(rows)} ONUs")
+        return len(rows)
+    except sqlite3.Error as e:
+        logger.warning(f"Falha ao atualizar inventário da PON {slot}/{pon} em {olt_ip}: {e}")
+        return 0
+
+
+def remove_onu(olt_ip: str, serial: str) -> None:
+    """Drop a serial from the index (after unprovisioning, or when found stale)"""
+    try:
+        with db.transaction() as conn:
+            conn.execute(
+                "DELETE FROM onu_inventory WHERE olt_ip = ? AND serial = ?",
+                (olt_ip, normalize_serial(serial)),
+            )
+    except sqlite3.Error as e:
+        logger.warning(f"Falha ao remover {serial} do inventário: {e}")
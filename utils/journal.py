@@ -0,0 +1,94 @@
+"""
+Migration journal module.
+Append-only JSON Lines log of the steps of a bulk migration, flushed and
+fsynced per entry, so a crash, Ctrl+C or dropped session keeps everything
+that was confirmed. Replaying the file gives the last confirmed step of
+every serial, which is what a resumed run starts from.
+"""
+
+import os
+import json
+import time
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+from utils.log import get_logger
+
+# Constants
+DEFAULT_JOURNAL_DIR = "data"
+
+# Passos registrados por serial, na ordem em que acontecem
+STEP_ALLOCATED = "allocated"   # posição reservada, nada confirmado na OLT
+STEP_ADDED = "added"           # ONU adicionada na posição (falta configurar serviço)
+STEP_MIGRATED = "migrated"
+STEP_FAILED = "failed"
+
+logger = get_logger(__name__)
+
+
+def journal_path(name: str, directory: str = DEFAULT_JOURNAL_DIR) -> str:
+    """Journal file for a migration name (e.g. the OLT IP)"""
+    safe = "".join(c if c.isalnum() or c in "-_" else "_" for c in name)
+    return os.path.join(directory, f"migration_{safe}.jsonl")
+
+
+class MigrationJournal:
+    """Thread-safe append-only journal of migration steps"""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file = None
+        self._lock = threading.Lock()
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path) and os.path.getsize(self.path) > 0
+
+    def replay(self) -> Dict[str, Dict]:
+        """Return serial -> state: fields of every entry merged, 'step' is the last
+        step and 'steps' the set of every step recorded for the serial"""
+        states: Dict[str, Dict] = {}
+        if not os.path.exists(self.path):
+            return states
+        with open(self.path, encoding="utf-8") as f:
+            for number, line in enumerate(f, start=1):
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Linha truncada por queda no meio da escrita: o passo não foi confirmado
+                    logger.warning(f"{self.path}:{number}: entrada inválida ignorada")
+                    continue
+                state = states.setdefault(entry["serial"], {"steps": set()})
+                state["steps"].add(entry["step"])
+                state.update(entry)
+        return states
+
+    def record(self, serial: str, step: str, **data) -> None:
+        """Append one step and force it to disk before returning"""
+        entry = {"serial": serial, "step": step, "ts": time.time(), **data}
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._file is None:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+    def archive(self) -> Optional[str]:
+        """Close and move the journal aside once the migration finished"""
+        self.close()
+        if not os.path.exists(self.path):
+            return None
+        archived = f"{self.path}.{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+        os.replace(self.path, archived)
+        logger.info(f"Journal de migração arquivado em {archived}")
+        return archived
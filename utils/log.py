@@ -1,17 +1,198 @@
 import logging
+import logging.handlers
 import os
+import copy
+import gzip
+import queue
+import atexit
+import shutil
+import json
+import threading
 from datetime import datetime
+from typing import Dict, Optional, Union
+
+from dotenv import load_dotenv
+
+# Constants
+DEFAULT_LOG_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_LOG_BACKUP_COUNT = 5
+DEFAULT_LOG_RAW_MAX_CHARS = 2000
+LOG_FORMAT = '%(asctime)s - [%(levelname)s] - %(message)s'
+LOG_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Carrega variáveis do arquivo .env
+load_dotenv()
+
+LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', DEFAULT_LOG_MAX_BYTES))
+LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', DEFAULT_LOG_BACKUP_COUNT))
+LOG_LEVEL_NAME = os.getenv('LOG_LEVEL', 'DEBUG').strip().upper()
+LOG_RAW_MAX_CHARS = int(os.getenv('LOG_RAW_MAX_CHARS', DEFAULT_LOG_RAW_MAX_CHARS))
+LOG_RAW_CAPTURE = os.getenv('LOG_RAW_CAPTURE', '')
+
+
+def _resolve_level(name: str) -> Optional[int]:
+    """Numeric level of a level name, or None when the name is not a logging level"""
+    level = logging.getLevelName(name)
+    return level if isinstance(level, int) else None
+
+
+LOG_LEVEL = _resolve_level(LOG_LEVEL_NAME)
+if LOG_LEVEL is None:
+    LOG_LEVEL = logging.DEBUG
+
+
+def _gzip_namer(name: str) -> str:
+    return name + ".gz"
+
+
+def _gzip_rotator(source: str, dest: str) -> None:
+    """Compress the rotated log file (runs on the writer thread)"""
+    with open(source, "rb") as f_in, gzip.open(dest, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+class _ModuleFileRouter(logging.Handler):
+    """Writer-side handler: sends each record to the rotating file of the logger that queued it"""
+
+    def __init__(self) -> None:
+        super().__init__(logging.DEBUG)
+        self._files: Dict[str, logging.handlers.RotatingFileHandler] = {}
+        self._files_lock = threading.Lock()
+        self._capture = None
+
+    def add_file(self, path: str) -> None:
+        with self._files_lock:
+            if path in self._files:
+                return
+            handler = logging.handlers.RotatingFileHandler(
+                path, mode='a', maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT,
+            )
+            handler.namer = _gzip_namer
+            handler.rotator = _gzip_rotator
+            handler.setFormatter(logging.Formatter(fmt=LOG_FORMAT, datefmt=LOG_DATE_FORMAT))
+            self._files[path] = handler
+
+    def emit(self, record: logging.LogRecord) -> None:
+        with self._files_lock:
+            handler = self._files.get(getattr(record, "log_path", None))
+        if handler is not None:
+            handler.handle(record)
+        if getattr(record, "raw_payload", None) is not None:
+            self._spool(record)
+
+    def _spool(self, record: logging.LogRecord) -> None:
+        """Append the full raw payload of a record to the compressed capture file"""
+        try:
+            if self._capture is None:
+                os.makedirs(os.path.dirname(os.path.abspath(LOG_RAW_CAPTURE)), exist_ok=True)
+                self._capture = gzip.open(LOG_RAW_CAPTURE, "at", encoding="utf-8")
+            payload = record.raw_payload
+            entry = {
+                "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+                "logger": record.name,
+                "label": record.raw_label,
+                "payload": payload.decode("utf-8", errors="replace") if isinstance(payload, bytes) else str(payload),
+            }
+            self._capture.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        with self._files_lock:
+            handlers = list(self._files.values())
+        for handler in handlers:
+            handler.flush()
+        if self._capture is not None:
+            self._capture.flush()
+
+    def close(self) -> None:
+        with self._files_lock:
+            handlers = list(self._files.values())
+        for handler in handlers:
+            handler.close()
+        if self._capture is not None:
+            self._capture.close()
+            self._capture = None
+        super().close()
+
+
+class _ModuleQueueHandler(logging.handlers.QueueHandler):
+    """Caller-side handler: formats the message and queues it tagged with its log file"""
+
+    def __init__(self, log_queue: queue.Queue, log_path: str) -> None:
+        super().__init__(log_queue)
+        self.log_path = log_path
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Cópia: o mesmo registro pode ser enfileirado por mais de um logger
+        record = copy.copy(super().prepare(record))
+        record.log_path = self.log_path
+        return record
+
+
+_queue: queue.Queue = queue.Queue(-1)
+_router = _ModuleFileRouter()
+_listener = None
+_listener_lock = threading.Lock()
+
+
+def _start_listener() -> None:
+    """Start the single background writer thread, drained and stopped at exit"""
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            _listener = logging.handlers.QueueListener(_queue, _router)
+            _listener.start()
+            atexit.register(stop_logging)
+
+
+def stop_logging() -> None:
+    """Write every queued record and stop the writer thread"""
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+    _router.close()
+
+
+class RawOutput:
+    """Raw OLT output as a log argument: decoded and capped only if the record is emitted"""
+
+    __slots__ = ("payload", "limit")
+
+    def __init__(self, payload: Union[str, bytes, None], limit: int = LOG_RAW_MAX_CHARS) -> None:
+        self.payload = payload
+        self.limit = limit
+
+    def __str__(self) -> str:
+        text = self.payload.decode("utf-8", errors="replace") if isinstance(self.payload, bytes) else str(self.payload)
+        if self.limit <= 0 or len(text) <= self.limit:
+            return text
+        return f"{text[:self.limit]}... [+{len(text) - self.limit} caracteres]"
+
+
+def log_raw(logger: logging.Logger, label: str, payload: Union[str, bytes, None],
+            level: int = logging.DEBUG, limit: Optional[int] = None) -> None:
+    """Log raw OLT output capped to LOG_RAW_MAX_CHARS; the full payload goes to LOG_RAW_CAPTURE when set"""
+    if not logger.isEnabledFor(level):
+        return
+    extra = {"raw_label": label, "raw_payload": payload} if LOG_RAW_CAPTURE else None
+    logger.log(level, "%s: %s", label, RawOutput(payload, LOG_RAW_MAX_CHARS if limit is None else limit),
+               extra=extra, stacklevel=2)
+
 
 def get_logger(name: str) -> logging.Logger:
     logger = logging.getLogger(name)
-    logger.setLevel(logging.DEBUG)
+    logger.setLevel(LOG_LEVEL)
 
     if not logger.handlers:
         logs_dir = "logs"
         os.makedirs(logs_dir, exist_ok=True)
 
         log_filename = name.replace(".", "_") + "_log.log"
-        full_path = os.path.join(logs_dir, log_filename)
+        full_path = os.path.abspath(os.path.join(logs_dir, log_filename))
 
         # Escreve a linha separadora diretamente no arquivo
         with open(full_path, "a") as f:
@@ -19,15 +200,17 @@ def get_logger(name: str) -> logging.Logger:
             f.write(f"Novo início de execução: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
             f.write("="*80 + "\n")
 
-        file_handler = logging.FileHandler(full_path, mode='a')
-        file_handler.setLevel(logging.DEBUG)
+        # A escrita em disco fica na thread do listener, fora do loop de expect
+        _router.add_file(full_path)
+        _start_listener()
+
+        queue_handler = _ModuleQueueHandler(_queue, full_path)
+        queue_handler.setLevel(logging.DEBUG)
+
+        logger.addHandler(queue_handler)
 
-        formatter = logging.Formatter(
-            fmt='%(asctime)s - [%(levelname)s] - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        file_handler.setFormatter(formatter)
+    return logger
 
-        logger.addHandler(file_handler)
 
-    return logger
\ No newline at end of file
+if _resolve_level(LOG_LEVEL_NAME) is None:
+    get_logger(__name__).warning(f"LOG_LEVEL inválido '{LOG_LEVEL_NAME}', usando DEBUG")
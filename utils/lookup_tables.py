@@ -0,0 +1,123 @@
+"""
+Lookup tables module.
+In-memory hashed indexes over the configuration CSVs (VLAN and profile per
+card/PON/type). Each table is parsed once and re-read only when the file
+modification time or size changes, so bulk jobs do one dict lookup per ONU
+instead of opening and scanning the CSV.
+
+Rows are validated at load time: missing columns are an error, and
+incomplete rows, duplicated keys and PONs without an entry are reported.
+"""
+
+import csv
+import os
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+from utils.log import get_logger
+
+# Constants
+NOKIA_VLAN_CSV = os.path.join("csv", "nokia.csv")
+PARKS_PROFILE_CSV = os.path.join("csv", "parks.csv")
+
+logger = get_logger(__name__)
+
+
+def normalize_key(value: str) -> str:
+    """Canonical key part: trimmed, lower case, numbers without leading zeros"""
+    value = str(value).strip().lower()
+    return str(int(value)) if value.isdigit() else value
+
+
+class CsvLookupTable:
+    """CSV indexed by key_columns, returning the value_columns of the matching row"""
+
+    def __init__(self, path: str, key_columns: Sequence[str], value_columns: Sequence[str],
+                 sequence_column: Optional[str] = None) -> None:
+        self.path = path
+        self.key_columns = tuple(key_columns)
+        self.value_columns = tuple(value_columns)
+        # Coluna numérica cuja sequência deve ser contínua dentro das demais chaves
+        self.sequence_column = sequence_column
+        self._index: Dict[Tuple[str, ...], Dict[str, str]] = {}
+        self._signature: Optional[Tuple[int, int]] = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> None:
+        """Parse and validate the file into the index; caller holds the lock"""
+        index: Dict[Tuple[str, ...], Dict[str, str]] = {}
+        with open(self.path, mode='r', encoding='utf-8', newline='') as csvfile:
+            reader = csv.DictReader(csvfile)
+            missing = set(self.key_columns + self.value_columns) - set(reader.fieldnames or ())
+            if missing:
+                raise ValueError(f"Colunas ausentes em {self.path}: {', '.join(sorted(missing))}")
+
+            for line, row in enumerate(reader, start=2):
+                key = tuple(normalize_key(row[column] or "") for column in self.key_columns)
+                values = {column: (row[column] or "").strip() for column in self.value_columns}
+                if not all(key) or not all(values.values()):
+                    logger.warning(f"{self.path}:{line}: linha incompleta ignorada")
+                    continue
+                if key in index:
+                    logger.warning(f"{self.path}:{line}: chave duplicada {key}, mantida a primeira ocorrência")
+                    continue
+                index[key] = values
+
+        if self.sequence_column:
+            self._report_gaps(index)
+
+        self._index = index
+        logger.info(f"Tabela {self.path} carregada: {len(index)} entradas")
+
+    def _report_gaps(self, index: Dict[Tuple[str, ...], Dict[str, str]]) -> None:
+        """Warn about numbers missing from the sequence column within each group"""
+        position = self.key_columns.index(self.sequence_column)
+        groups = defaultdict(set)
+        for key in index:
+            if key[position].isdigit():
+                groups[key[:position] + key[position + 1:]].add(int(key[position]))
+        for group, numbers in groups.items():
+            gaps = sorted(set(range(min(numbers), max(numbers) + 1)) - numbers)
+            if gaps:
+                label = "/".join(group) or "-"
+                logger.warning(f"{self.path}: {self.sequence_column} sem entrada em {label}: {gaps}")
+
+    def _ensure_loaded(self) -> None:
+        """Reload when the file changed; raises FileNotFoundError if it does not exist"""
+        stat = os.stat(self.path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if signature != self._signature:
+                self._load()
+                self._signature = signature
+
+    def validate(self) -> int:
+        """Load and validate the table now (errors surface before a bulk job starts); returns its size"""
+        self._ensure_loaded()
+        return len(self._index)
+
+    def get(self, *key: str) -> Optional[Dict[str, str]]:
+        """Return the values for key, or None when the table has no such row"""
+        self._ensure_loaded()
+        return self._index.get(tuple(normalize_key(part) for part in key))
+
+    def keys(self) -> Iterable[Tuple[str, ...]]:
+        self._ensure_loaded()
+        return list(self._index)
+
+
+nokia_vlan_table = CsvLookupTable(NOKIA_VLAN_CSV, ("CARD", "PON"), ("VLAN",), sequence_column="PON")
+parks_profile_table = CsvLookupTable(PARKS_PROFILE_CSV, ("olt_ip", "pon", "type"), ("vlan", "profile"))
+
+
+def nokia_vlan(slot: str, pon: str) -> Optional[str]:
+    """VLAN configured for a Nokia card/PON"""
+    row = nokia_vlan_table.get(slot, pon)
+    return row["VLAN"] if row else None
+
+
+def parks_profile(olt_ip: str, pon: str, onu_type: str) -> Optional[Tuple[str, str]]:
+    """(VLAN, profile) configured for a Parks OLT/PON/ONU type"""
+    row = parks_profile_table.get(olt_ip, pon, onu_type)
+    return (row["vlan"], row["profile"]) if row else None
@@ -0,0 +1,121 @@
+"""
+PON occupancy module.
+Caches which ONT positions of a PON are taken as an integer bitmap, loaded
+from the OLT once and then updated locally as positions are assigned or
+freed. The bitmap is reloaded from the OLT after OCCUPANCY_RECHECK seconds,
+or right away when a caller invalidates it after an unexpected failure.
+"""
+
+import os
+import time
+import threading
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from dotenv import load_dotenv
+from utils.log import get_logger
+
+# Constants
+DEFAULT_RECHECK_INTERVAL = 300
+DEFAULT_PON_CAPACITY = 128
+
+logger = get_logger(__name__)
+
+# Carrega variáveis do arquivo .env
+load_dotenv()
+
+OCCUPANCY_RECHECK = float(os.getenv('OCCUPANCY_RECHECK', DEFAULT_RECHECK_INTERVAL))
+
+PonKey = Tuple[str, str, str]  # (OLT IP, slot, PON)
+OccupancyLoader = Callable[[], Iterable[int]]
+
+
+class PonBitmap:
+    """Occupied positions of one PON; bit N set means position N is taken"""
+
+    def __init__(self, occupied: Iterable[int], capacity: int = DEFAULT_PON_CAPACITY) -> None:
+        self.capacity = capacity
+        self.bits = 0
+        for position in occupied:
+            self.assign(position)
+        self.loaded_at = time.monotonic()
+
+    def assign(self, position: int) -> None:
+        if 1 <= position <= self.capacity:
+            self.bits |= 1 << position
+
+    def release(self, position: int) -> None:
+        self.bits &= ~(1 << position)
+
+    def is_taken(self, position: int) -> bool:
+        return bool(self.bits >> position & 1)
+
+    def first_free(self, exclude: Iterable[int] = ()) -> Optional[int]:
+        """Lowest free position in 1..capacity not in exclude, or None when there is none"""
+        taken = self.bits
+        for position in exclude:
+            taken |= 1 << position
+        # Bits 1..capacity livres; o bit 0 não corresponde a posição
+        free = ~taken & (((1 << self.capacity) - 1) << 1)
+        if not free:
+            return None
+        return (free & -free).bit_length() - 1
+
+    def taken_count(self) -> int:
+        return bin(self.bits).count("1")
+
+
+class OccupancyCache:
+    """Per-PON bitmaps shared by every flow of the process"""
+
+    def __init__(self, recheck_interval: float = OCCUPANCY_RECHECK,
+                 capacity: int = DEFAULT_PON_CAPACITY) -> None:
+        self.recheck_interval = recheck_interval
+        self.capacity = capacity
+        self._bitmaps: Dict[PonKey, PonBitmap] = {}
+        self._pon_locks: Dict[PonKey, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _pon_lock(self, key: PonKey) -> threading.Lock:
+        """Lock of one PON: loading a PON from the OLT never blocks the other PONs"""
+        with self._lock:
+            return self._pon_locks.setdefault(key, threading.Lock())
+
+    def _bitmap(self, key: PonKey, loader: OccupancyLoader) -> PonBitmap:
+        """Return the cached bitmap, (re)loading it from the OLT when stale; caller holds the PON lock"""
+        bitmap = self._bitmaps.get(key)
+        if bitmap is None or time.monotonic() - bitmap.loaded_at > self.recheck_interval:
+            action = "Carregando" if bitmap is None else "Revalidando"
+            bitmap = PonBitmap(loader(), self.capacity)
+            self._bitmaps[key] = bitmap
+            logger.info(f"{action} ocupação da PON {key[1]}/{key[2]} em {key[0]}: {bitmap.taken_count()} posições ocupadas")
+        return bitmap
+
+    def load(self, key: PonKey, loader: OccupancyLoader) -> None:
+        """Make sure the PON bitmap is cached and fresh"""
+        with self._pon_lock(key):
+            self._bitmap(key, loader)
+
+    def allocate(self, key: PonKey, loader: OccupancyLoader, exclude: Iterable[int] = ()) -> int:
+        """Take the lowest free position of the PON (skipping exclude) and mark it as assigned"""
+        with self._pon_lock(key):
+            bitmap = self._bitmap(key, loader)
+            position = bitmap.first_free(exclude)
+            if position is None:
+                raise Exception("Nenhuma posição livre disponível")
+            bitmap.assign(position)
+            return position
+
+    def release(self, key: PonKey, position: int) -> None:
+        """Mark a position as free again (ONT removed or provisioning undone)"""
+        with self._pon_lock(key):
+            bitmap = self._bitmaps.get(key)
+            if bitmap:
+                bitmap.release(int(position))
+
+    def invalidate(self, key: PonKey) -> None:
+        """Forget a PON so the next allocation reloads it from the OLT"""
+        with self._pon_lock(key):
+            self._bitmaps.pop(key, None)
+
+
+occupancy_cache = OccupancyCache()
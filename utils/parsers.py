@@ -0,0 +1,192 @@
+"""
+Parsers module for OLT CLI output.
+Precompiled, line-oriented parsers shared by the Nokia and Parks drivers.
+Each parser walks its input once, so cost stays linear even on whole-OLT dumps,
+and returns typed records that still unpack like the tuples used before.
+"""
+
+import re
+from typing import Dict, List, NamedTuple, Optional
+
+# Nokia ISAM
+NOKIA_GPON_INDEX = re.compile(r"(?<!\S)1/1/(\d+)/(\d+)\S*\s+(\S+)")
+NOKIA_ONT_PATH = re.compile(r"(\d+)/(\d+)/(\d+)/(\d+)/(\d+)")
+NOKIA_EQUIP_ID = re.compile(r"equip-id\s*:\s*([^\n\r]+?)(?=\s{2,}|$)", re.MULTILINE)
+NOKIA_RX_SIGNAL = re.compile(r"rx-signal-level\s*:\s*(-\d+\.\d{2})")
+NOKIA_TEMPERATURE = re.compile(r"ont-temperature\s*:\s*(\d{2})")
+
+# Parks
+PARKS_BLACKLIST_ROW = re.compile(r"^\s*(\d)\s*\|\s*(\d+)\s*\|\s*([^|\s]+)\s*(?:\||$)")
+PARKS_SERIAL = re.compile(r"^\w{12}$")
+PARKS_SUMMARY_FIELD = re.compile(r"^\s*(Alias|Interface|Model|Power Level|Distance|Status)\s*:(.*)$")
+PARKS_ALIAS_CONFIG = re.compile(r"^\s*onu\s+(\S+)\s+alias\s+(.+?)\s*$", re.MULTILINE)
+PARKS_MAX_SLOT = 64
+PARKS_MAX_PORT = 128
+PARKS_MIN_SERIAL_LENGTH = 6
+
+
+class UnprovisionedOnu(NamedTuple):
+    serial: str
+    slot: str
+    pon: str
+
+
+class OntPosition(NamedTuple):
+    slot: str
+    pon: str
+    position: str
+
+
+class OntStatusRow(NamedTuple):
+    ont_path: str
+    position: int
+    serial: str
+    admin_status: str
+    oper_status: str
+
+
+class OpticsReading(NamedTuple):
+    rx_signal: str
+    temperature: str
+
+
+class BlacklistEntry(NamedTuple):
+    serial: str
+    slot: str
+    pon: str
+
+
+class OnuModel(NamedTuple):
+    serial: str
+    model: str
+
+
+class OnuSummary(NamedTuple):
+    alias: Optional[str] = None
+    pon: Optional[str] = None
+    model: Optional[str] = None
+    power_level: Optional[str] = None
+    distance_km: Optional[float] = None
+    status: Optional[str] = None
+
+
+# Nokia ISAM parsers
+
+def parse_unprovisioned_onus(output: str) -> List[UnprovisionedOnu]:
+    """Parse 'show pon unprovision-onu' into (serial, slot, pon) records"""
+    return [
+        UnprovisionedOnu(match.group(3).strip(), match.group(1), match.group(2))
+        for line in output.splitlines()
+        if "1/1/" in line
+        for match in NOKIA_GPON_INDEX.finditer(line)
+    ]
+
+
+def parse_ont_position(output: str) -> Optional[OntPosition]:
+    """Return the first ONT rack/shelf/slot/pon/position path found in the output"""
+    match = NOKIA_ONT_PATH.search(output)
+    if not match:
+        return None
+    return OntPosition(match.group(3), match.group(4), match.group(5))
+
+
+def parse_ont_status_table(output: str) -> List[OntStatusRow]:
+    """Parse 'show equipment ont status pon' rows (pon, ont, sernum, admin, oper, ...)"""
+    rows = []
+    for line in output.splitlines():
+        parts = line.split()
+        if len(parts) < 2:
+            continue
+        path = NOKIA_ONT_PATH.fullmatch(parts[1])
+        if not path:
+            continue
+        rows.append(OntStatusRow(
+            ont_path=parts[1],
+            position=int(path.group(5)),
+            serial=parts[2] if len(parts) > 2 else "",
+            admin_status=parts[3] if len(parts) > 3 else "",
+            oper_status=parts[4] if len(parts) > 4 else "",
+        ))
+    return rows
+
+
+def parse_ont_equip_id(output: str) -> Optional[str]:
+    """Extract the equip-id (model) from 'show equipment ont interface ... detail'"""
+    match = NOKIA_EQUIP_ID.search(output)
+    return match.group(1).strip() if match else None
+
+
+def parse_optics_detail(output: str) -> Optional[OpticsReading]:
+    """Extract rx signal and temperature from 'show equipment ont optics ... detail'"""
+    # Duas buscas ancoradas em vez de '.*?' entre os campos: custo linear
+    rx_signal = NOKIA_RX_SIGNAL.search(output)
+    if not rx_signal:
+        return None
+    temperature = NOKIA_TEMPERATURE.search(output, rx_signal.end())
+    if not temperature:
+        return None
+    return OpticsReading(rx_signal.group(1), temperature.group(1))
+
+
+# Parks parsers
+
+def parse_blacklist(output: str) -> List[BlacklistEntry]:
+    """Parse 'show gpon blacklist' rows (slot | port | serial | ...)"""
+    entries = []
+    for line in output.splitlines():
+        match = PARKS_BLACKLIST_ROW.match(line)
+        if not match:
+            continue
+        slot, port, serial = match.groups()
+        if (int(slot) > PARKS_MAX_SLOT or int(port) > PARKS_MAX_PORT
+                or len(serial) < PARKS_MIN_SERIAL_LENGTH):
+            continue
+        entries.append(BlacklistEntry(serial, slot, port))
+    return entries
+
+
+def parse_onu_models(output: str) -> List[OnuModel]:
+    """Parse 'show interface gpon1/<pon> onu model' rows (serial | model)"""
+    models = []
+    for line in output.splitlines():
+        lowered = line.lower()
+        if "serial" in lowered or "model" in lowered:
+            continue
+        parts = [part.strip() for part in line.strip().split('|') if part.strip()]
+        if len(parts) >= 2:
+            models.append(OnuModel(parts[0], parts[1]))
+        elif len(parts) == 1 and PARKS_SERIAL.match(parts[0]):
+            models.append(OnuModel(parts[0], ""))
+    return models
+
+
+def parse_onu_summary(output: str) -> OnuSummary:
+    """Parse 'show gpon onu <serial> summary' key/value lines"""
+    fields: Dict[str, object] = {}
+    for line in output.splitlines():
+        match = PARKS_SUMMARY_FIELD.match(line)
+        if not match:
+            continue
+        key, value = match.group(1), match.group(2).strip()
+        first = value.split()[0] if value else ""
+        if key == "Alias":
+            fields["alias"] = value
+        elif key == "Interface":
+            fields["pon"] = value
+        elif key == "Model":
+            fields["model"] = value
+        elif key == "Power Level":
+            fields["power_level"] = first
+        elif key == "Distance":
+            fields["distance_km"] = round(int(first) / 1000, 2) if first.isdigit() else None
+        elif key == "Status":
+            fields["status"] = first
+    return OnuSummary(**fields)
+
+
+def parse_alias_config(output: str) -> Dict[str, str]:
+    """Map serial -> alias from 'onu <serial> alias <alias>' running-config lines"""
+    return {
+        serial: alias.strip().strip('"')
+        for serial, alias in PARKS_ALIAS_CONFIG.findall(output)
+    }
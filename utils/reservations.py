@@ -0,0 +1,120 @@
+"""
+Position reservation module.
+Leases on ONT positions kept in the shared SQLite database, so concurrent
+provisioning flows (other technicians, other processes or parallel workers)
+never get the same free position of a PON.
+
+A lease is taken inside BEGIN IMMEDIATE, which serializes the choice of the
+position across processes. It expires after RESERVATION_TTL seconds when
+the provisioning aborts without releasing it. Once provisioned, the lease is
+kept for OCCUPANCY_RECHECK seconds so that the occupancy caches of the other
+processes re-read the PON before the position stops being excluded.
+"""
+
+import os
+import time
+import socket
+import sqlite3
+import threading
+from typing import Callable, Set
+
+from dotenv import load_dotenv
+from utils import db
+from utils.log import get_logger
+from utils.occupancy import OCCUPANCY_RECHECK
+
+# Constants
+DEFAULT_RESERVATION_TTL = 600
+
+logger = get_logger(__name__)
+
+# Carrega variáveis do arquivo .env
+load_dotenv()
+
+RESERVATION_TTL = float(os.getenv('RESERVATION_TTL', DEFAULT_RESERVATION_TTL))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS position_reservation (
+    olt_ip     TEXT NOT NULL,
+    slot       TEXT NOT NULL,
+    pon        TEXT NOT NULL,
+    position   INTEGER NOT NULL,
+    owner      TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (olt_ip, slot, pon, position)
+);
+"""
+
+db.register_schema(SCHEMA)
+
+
+def reservation_owner() -> str:
+    """Identify the holder of a lease (host, process and thread)"""
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+
+def reserve_position(olt_ip: str, slot: str, pon: str,
+                     choose: Callable[[Set[int]], int],
+                     ttl: float = RESERVATION_TTL) -> int:
+    """Lease a position picked by choose(reserved), where reserved holds the active leases of the PON.
+
+    If the database is unavailable the position is still chosen, without a lease:
+    choose() runs once, excluding only the leases read before the failure, so
+    other processes may pick the same position until the database is back.
+    """
+    slot, pon = str(slot), str(pon)
+    reserved: Set[int] = set()
+    position = None
+    try:
+        with db.transaction(immediate=True) as conn:
+            now = time.time()
+            conn.execute("DELETE FROM position_reservation WHERE expires_at <= ?", (now,))
+            reserved = {
+                row["position"] for row in conn.execute(
+                    "SELECT position FROM position_reservation WHERE olt_ip = ? AND slot = ? AND pon = ?",
+                    (olt_ip, slot, pon),
+                )
+            }
+            position = choose(reserved)
+            conn.execute(
+                "INSERT INTO position_reservation (olt_ip, slot, pon, position, owner, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (olt_ip, slot, pon, int(position), reservation_owner(), now + ttl),
+            )
+        logger.debug(f"Posição {slot}/{pon}/{position} reservada em {olt_ip}")
+        return position
+    except sqlite3.Error as e:
+        if position is not None:
+            # A posição já saiu do bitmap: escolher outra a deixaria presa
+            logger.warning(f"Falha ao gravar a reserva da posição {slot}/{pon}/{position} em {olt_ip}, "
+                           f"seguindo sem reserva (outros processos podem escolhê-la): {e}")
+            return position
+        logger.warning(f"Falha ao ler as reservas da PON {slot}/{pon} em {olt_ip}, seguindo sem reserva "
+                       f"e excluindo só {len(reserved)} posições já lidas: {e}")
+        return choose(reserved)
+
+
+def confirm_reservation(olt_ip: str, slot: str, pon: str, position: int,
+                        hold: float = OCCUPANCY_RECHECK) -> None:
+    """Keep a provisioned position leased until the other caches have re-read the PON"""
+    try:
+        with db.transaction() as conn:
+            conn.execute(
+                "UPDATE position_reservation SET expires_at = ? "
+                "WHERE olt_ip = ? AND slot = ? AND pon = ? AND position = ?",
+                (time.time() + hold, olt_ip, str(slot), str(pon), int(position)),
+            )
+    except sqlite3.Error as e:
+        logger.warning(f"Falha ao confirmar reserva da posição {slot}/{pon}/{position} em {olt_ip}: {e}")
+
+
+def release_reservation(olt_ip: str, slot: str, pon: str, position: int) -> None:
+    """Drop the lease of a position (provisioning undone or ONT removed)"""
+    try:
+        with db.transaction() as conn:
+            conn.execute(
+                "DELETE FROM position_reservation WHERE olt_ip = ? AND slot = ? AND pon = ? AND position = ?",
+                (olt_ip, str(slot), str(pon), int(position)),
+            )
+    except sqlite3.Error as e:
+        logger.warning(f"Falha ao liberar reserva da posição {slot}/{pon}/{position} em {olt_ip}: {e}")
@@ -0,0 +1,206 @@
+"""
+Session pool module for OLT connections.
+Keeps authenticated pexpect sessions warm per (OLT IP, protocol) so that
+consecutive menu actions skip the SSH handshake and login sequence.
+"""
+
+import os
+import re
+import time
+import atexit
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pexpect
+from dotenv import load_dotenv
+from utils.log import get_logger
+
+# Constants
+DEFAULT_IDLE_TIMEOUT = 300
+DEFAULT_MAX_IDLE_PER_KEY = 4
+HEALTH_CHECK_TIMEOUT = 5
+
+logger = get_logger(__name__)
+
+# Carrega variáveis do arquivo .env
+load_dotenv()
+
+SessionFactory = Callable[[str], Optional[pexpect.spawn]]
+HealthCheck = Callable[[pexpect.spawn], bool]
+SessionCloser = Callable[[pexpect.spawn], None]
+
+
+def terminate_session(child: pexpect.spawn) -> None:
+    """Default closer: terminate the underlying process"""
+    try:
+        child.terminate(force=True)
+    except Exception as e:
+        logger.warning(f"Erro ao encerrar sessão: {e}")
+
+
+def mark_dirty(child: pexpect.spawn) -> None:
+    """Flag a lent session whose CLI state is unknown so the pool closes it instead of reusing it"""
+    child.pool_dirty = True
+
+
+def drain_output(child: pexpect.spawn) -> str:
+    """Discard pending output without waiting: stops as soon as nothing is left to read"""
+    drained = [child.buffer]
+    child.buffer = child.string_type()
+    while True:
+        try:
+            drained.append(child.read_nonblocking(size=4096, timeout=0))
+        except (pexpect.TIMEOUT, pexpect.EOF):
+            break
+    return "".join(drained)
+
+
+def prompt_health_check(prompt: str, command: str = "") -> HealthCheck:
+    """Build a health check that sends a harmless command and waits for the prompt.
+
+    Output left by the previous borrower is discarded first, and the prompt
+    must follow the command's echo at the end of the output, so a stale
+    prompt still in the buffer doesn't pass for a healthy session.
+    """
+    anchored = rf"{prompt}\s*$"
+
+    def check(child: pexpect.spawn) -> bool:
+        if not child.isalive():
+            return False
+        try:
+            stale = drain_output(child)
+            if stale.strip():
+                logger.debug(f"Descartados {len(stale)} caracteres pendentes antes do health-check")
+            child.sendline(command)
+            if command:
+                child.expect(re.escape(command), timeout=HEALTH_CHECK_TIMEOUT)
+            child.expect(anchored, timeout=HEALTH_CHECK_TIMEOUT)
+            return True
+        except (pexpect.TIMEOUT, pexpect.EOF):
+            return False
+    return check
+
+
+class _PooledSession:
+    """Idle session waiting to be lent again"""
+
+    def __init__(self, child: pexpect.spawn) -> None:
+        self.child = child
+        self.last_used = time.monotonic()
+
+
+class SessionPool:
+    """Pool of authenticated sessions keyed by (host, protocol)"""
+
+    def __init__(self, idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+                 max_idle_per_key: int = DEFAULT_MAX_IDLE_PER_KEY) -> None:
+        self.idle_timeout = idle_timeout
+        self.max_idle_per_key = max_idle_per_key
+        self._idle: Dict[Tuple[str, str], List[_PooledSession]] = {}
+        self._closers: Dict[str, SessionCloser] = {}
+        self._lock = threading.Lock()
+
+    def _close(self, protocol: str, child: pexpect.spawn) -> None:
+        closer = self._closers.get(protocol, terminate_session)
+        try:
+            closer(child)
+        except Exception as e:
+            logger.warning(f"Erro ao fechar sessão {protocol}: {e}")
+
+    def _take_idle(self, key: Tuple[str, str]) -> Tuple[Optional[_PooledSession], List[_PooledSession]]:
+        """Pop the most recent idle session and collect expired ones for closing"""
+        now = time.monotonic()
+        expired = []
+        with self._lock:
+            entries = self._idle.get(key, [])
+            fresh = []
+            for entry in entries:
+                if now - entry.last_used > self.idle_timeout:
+                    expired.append(entry)
+                else:
+                    fresh.append(entry)
+            entry = fresh.pop() if fresh else None
+            self._idle[key] = fresh
+        return entry, expired
+
+    def acquire(self, host: str, protocol: str, factory: SessionFactory,
+                health_check: Optional[HealthCheck] = None) -> Optional[pexpect.spawn]:
+        """Lend a healthy session, creating a new one if none is available"""
+        key = (host, protocol)
+        while True:
+            entry, expired = self._take_idle(key)
+            for old in expired:
+                logger.info(f"Sessão {protocol} para {host} expirada por inatividade, reciclando")
+                self._close(protocol, old.child)
+
+            if entry is None:
+                break
+
+            if health_check is None or health_check(entry.child):
+                logger.info(f"Reutilizando sessão {protocol} para {host}")
+                return entry.child
+
+            logger.info(f"Sessão {protocol} para {host} falhou no health-check, descartando")
+            self._close(protocol, entry.child)
+
+        logger.info(f"Abrindo nova sessão {protocol} para {host}")
+        return factory(host)
+
+    def release(self, host: str, protocol: str, child: pexpect.spawn, reusable: bool = True) -> None:
+        """Return a session to the pool, or close it when it can't be reused"""
+        if not reusable or getattr(child, "pool_dirty", False) or not child.isalive():
+            self._close(protocol, child)
+            return
+
+        key = (host, protocol)
+        with self._lock:
+            entries = self._idle.setdefault(key, [])
+            if len(entries) < self.max_idle_per_key:
+                entries.append(_PooledSession(child))
+                return
+
+        self._close(protocol, child)
+
+    def register_closer(self, protocol: str, closer: SessionCloser) -> None:
+        """Register how sessions of a protocol must be closed (e.g. LOGOFF before terminate)"""
+        self._closers[protocol] = closer
+
+    @contextmanager
+    def session(self, host: str, protocol: str, factory: SessionFactory,
+                health_check: Optional[HealthCheck] = None):
+        """Context manager lending a pooled session.
+
+        The session goes back to the pool when the block finishes cleanly and
+        is discarded when the block raises or a driver flagged it with
+        mark_dirty(), since its CLI state is unknown.
+        """
+        child = self.acquire(host, protocol, factory, health_check)
+        if not child:
+            raise Exception(f"Falha na conexão {protocol} com a OLT {host}")
+
+        reusable = True
+        try:
+            yield child
+        except BaseException:
+            reusable = False
+            raise
+        finally:
+            self.release(host, protocol, child, reusable=reusable)
+
+    def close_all(self) -> None:
+        """Close every idle session"""
+        with self._lock:
+            idle = self._idle
+            self._idle = {}
+        for (host, protocol), entries in idle.items():
+            for entry in entries:
+                self._close(protocol, entry.child)
+        logger.info("Todas as sessões do pool foram encerradas")
+
+
+session_pool = SessionPool(
+    idle_timeout=float(os.getenv('SESSION_IDLE_TIMEOUT', DEFAULT_IDLE_TIMEOUT)),
+    max_idle_per_key=int(os.getenv('SESSION_MAX_IDLE', DEFAULT_MAX_IDLE_PER_KEY)),
+)
+atexit.register(session_pool.close_all)
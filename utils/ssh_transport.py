@@ -0,0 +1,69 @@
+"""
+SSH transport module for OLT connections.
+Builds the ssh command used by the drivers so that every session to the
+same OLT endpoint shares one OpenSSH ControlMaster connection.
+"""
+
+import os
+import tempfile
+from typing import Optional
+
+from dotenv import load_dotenv
+from utils.instrumentation import InstrumentedSpawn
+from utils.log import get_logger
+from utils.transcript import record_session, replay_library
+
+# Constants
+DEFAULT_SPAWN_TIMEOUT = 30
+DEFAULT_CONTROL_PERSIST = "600"
+
+logger = get_logger(__name__)
+
+# Carrega variáveis do arquivo .env
+load_dotenv()
+
+SSH_BINARY = os.getenv('SSH_BINARY', 'ssh')
+SSH_MULTIPLEX = os.getenv('SSH_MULTIPLEX', '1').lower() not in ('0', 'false', 'no')
+SSH_CONTROL_PERSIST = os.getenv('SSH_CONTROL_PERSIST', DEFAULT_CONTROL_PERSIST)
+SSH_CONTROL_DIR = os.getenv(
+    'SSH_CONTROL_DIR',
+    os.path.join(tempfile.gettempdir(), f"porygon-ssh-{os.getuid() if hasattr(os, 'getuid') else 'user'}"),
+)
+
+
+def ssh_command(user: str, host: str, port: Optional[str] = None) -> str:
+    """Build the ssh command line, enabling connection multiplexing when configured"""
+    parts = [SSH_BINARY]
+
+    if SSH_MULTIPLEX:
+        os.makedirs(SSH_CONTROL_DIR, mode=0o700, exist_ok=True)
+        # %C = hash de (host local, host remoto, porta, usuário): um mestre por endpoint
+        parts += [
+            "-o ControlMaster=auto",
+            f"-o ControlPath={os.path.join(SSH_CONTROL_DIR, '%C')}",
+            f"-o ControlPersist={SSH_CONTROL_PERSIST}",
+        ]
+
+    parts.append(f"{user}@{host}")
+    if port:
+        parts.append(f"-p {port}")
+    return " ".join(parts)
+
+
+def spawn_ssh(user: str, host: str, port: Optional[str] = None,
+              timeout: int = DEFAULT_SPAWN_TIMEOUT, protocol: str = "ssh") -> InstrumentedSpawn:
+    """Spawn an ssh session to the OLT over the shared transport, with per-command timing.
+
+    With TRANSCRIPT_REPLAY set the session is served from a recorded
+    transcript instead; with TRANSCRIPT_DIR set it is recorded.
+    """
+    replay = replay_library.take(host, protocol)
+    if replay is not None:
+        replay.timeout = timeout
+        return replay
+
+    command = ssh_command(user, host, port)
+    logger.debug(f"Iniciando transporte SSH: {command}")
+    child = InstrumentedSpawn(command, host=host, protocol=protocol, encoding='utf-8', timeout=timeout)
+    record_session(child, host, protocol)
+    return child
@@ -0,0 +1,306 @@
+"""
+Session transcript module.
+Records what every OLT session sent and received (credentials redacted) to
+a compact gzipped JSON Lines file, and replays those transcripts offline:
+ReplaySpawn is a pexpect spawn whose output comes from a transcript, so the
+drivers, parsers and services run against recorded sessions with no network.
+"""
+
+import os
+import re
+import gzip
+import json
+import time
+import asyncio
+import weakref
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+import pexpect
+from pexpect.spawnbase import SpawnBase
+from dotenv import load_dotenv
+from utils.log import get_logger
+
+# Constants
+TRANSCRIPT_VERSION = 1
+TRANSCRIPT_SUFFIX = ".jsonl.gz"
+REDACTED = "<redigido>"
+MIN_SECRET_LENGTH = 3
+EVENT_SEND = "s"
+EVENT_READ = "r"
+
+logger = get_logger(__name__)
+
+# Carrega variáveis do arquivo .env
+load_dotenv()
+
+TRANSCRIPT_DIR = os.getenv('TRANSCRIPT_DIR', '')
+TRANSCRIPT_REPLAY = os.getenv('TRANSCRIPT_REPLAY', '')
+
+PASSWORD_PROMPT = re.compile(r"(?i)pass(word)?\s*:?\s*$")
+SECRET_RULES = [
+    # Parks: onu X iphost 1 pppoe username U password P
+    re.compile(r"(?i)\b(?:username|password)\s+(\"[^\"]*\"|\S+)"),
+    # TL1: PARAMNAME=...Password|PreSharedKey|Username,PARAMVALUE=valor
+    re.compile(r"(?i)PARAMNAME=[^,;]*(?:Password|PreSharedKey|Username)[^,;]*,PARAMVALUE=(\"[^\"]*\"|[^,;\s]*)"),
+]
+
+Event = list  # [tipo, ms desde o início, texto]
+
+
+class Redactor:
+    """Masks credentials in sent commands and in the echoed output of a session"""
+
+    def __init__(self) -> None:
+        self._secrets: Set[str] = set()
+
+    def _remember(self, secret: str) -> None:
+        secret = secret.strip().strip('"')
+        if len(secret) >= MIN_SECRET_LENGTH:
+            self._secrets.add(secret)
+
+    def sent(self, text: str, after: object) -> str:
+        """Redact a command; the whole line when it answers a password prompt"""
+        if isinstance(after, str) and PASSWORD_PROMPT.search(after):
+            self._remember(text)
+            return REDACTED + text[len(text.rstrip("\r\n")):]
+        for rule in SECRET_RULES:
+            for match in rule.finditer(text):
+                self._remember(match.group(1))
+        return self.received(text)
+
+    def received(self, text: str) -> str:
+        for secret in self._secrets:
+            text = text.replace(secret, REDACTED)
+        for rule in SECRET_RULES:
+            text = rule.sub(lambda m: m.group(0)[:m.start(1) - m.start(0)] + REDACTED, text)
+        return text
+
+
+class TranscriptWriter:
+    """Append-only transcript of one session, attached to pexpect's logfile hooks"""
+
+    def __init__(self, path: str, host: str, protocol: str) -> None:
+        self.path = path
+        self._started = time.monotonic()
+        self._lock = threading.Lock()
+        self._redactor = Redactor()
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        header = {"v": TRANSCRIPT_VERSION, "host": host, "protocol": protocol,
+                  "started": datetime.now().isoformat(timespec="seconds")}
+        self._file.write(json.dumps(header) + "\n")
+
+    def _write(self, kind: str, text: str) -> None:
+        elapsed = int((time.monotonic() - self._started) * 1000)
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(json.dumps([kind, elapsed, text], ensure_ascii=False) + "\n")
+            if kind == EVENT_SEND:
+                # Uma sincronização por ida e volta: sessão interrompida continua legível
+                self._file.flush()
+
+    def sent(self, text: str, after: object) -> None:
+        self._write(EVENT_SEND, self._redactor.sent(text, after))
+
+    def received(self, text: str) -> None:
+        self._write(EVENT_READ, self._redactor.received(text))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class _LogHook:
+    """File-like object given to pexpect as logfile_send/logfile_read"""
+
+    def __init__(self, writer: TranscriptWriter, child: pexpect.spawn, direction: str) -> None:
+        self._writer = writer
+        self._child = weakref.ref(child)
+        self._direction = direction
+
+    def write(self, data) -> None:
+        text = data.decode("utf-8", errors="replace") if isinstance(data, bytes) else data
+        if self._direction == EVENT_SEND:
+            child = self._child()
+            self._writer.sent(text, child.after if child is not None else None)
+        else:
+            self._writer.received(text)
+
+    def flush(self) -> None:
+        pass
+
+
+def transcript_path(host: str, protocol: str, directory: str) -> str:
+    safe_host = "".join(c if c.isalnum() or c in "-." else "_" for c in host)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    return os.path.join(directory, f"{stamp}_{safe_host}_{protocol}{TRANSCRIPT_SUFFIX}")
+
+
+def record_session(child: pexpect.spawn, host: str, protocol: str,
+                   directory: str = TRANSCRIPT_DIR) -> Optional[TranscriptWriter]:
+    """Start recording the session when a transcript directory is configured"""
+    if not directory:
+        return None
+    try:
+        os.makedirs(directory, exist_ok=True)
+        writer = TranscriptWriter(transcript_path(host, protocol, directory), host, protocol)
+    except OSError as e:
+        logger.warning(f"Não foi possível gravar a transcrição da sessão com {host}: {e}")
+        return None
+    child.logfile_send = _LogHook(writer, child, EVENT_SEND)
+    child.logfile_read = _LogHook(writer, child, EVENT_READ)
+    weakref.finalize(child, writer.close)
+    logger.debug(f"Gravando transcrição da sessão {protocol} com {host} em {writer.path}")
+    return writer
+
+
+def load_transcript(path: str) -> Tuple[Dict, List[Event]]:
+    """Header and events of a transcript; a truncated tail (interrupted session) is ignored"""
+    events: List[Event] = []
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        try:
+            for line in f:
+                events.append(json.loads(line))
+        except (EOFError, ValueError, OSError):
+            logger.warning(f"Transcrição {path} termina truncada; usando {len(events)} eventos")
+    return header, events
+
+
+class ReplaySpawn(SpawnBase):
+    """pexpect session served from a transcript.
+
+    Output recorded after the n-th command only becomes readable once the
+    n-th command was sent again, so expect() sees the same before/after as in
+    the recorded session. Reading past the available output raises TIMEOUT
+    right away; past the end of the transcript, EOF. With speed > 0 the
+    recorded response times are reproduced (scaled by 1/speed).
+    """
+
+    def __init__(self, events: List[Event], host: str = "", protocol: str = "",
+                 timeout: float = 30, speed: float = 0.0) -> None:
+        super().__init__(timeout=timeout, encoding="utf-8")
+        self.olt_host = host
+        self.protocol = protocol
+        self.linesep = os.linesep
+        self.speed = speed
+        self.divergences = 0
+        self.closed = False
+        self._redactor = Redactor()
+        self._sent_expected = [text for kind, _, text in events if kind == EVENT_SEND]
+        self._sent_at = [elapsed for kind, elapsed, _ in events if kind == EVENT_SEND]
+        self._reads: List[Tuple[int, int, str]] = []  # (comandos antes, ms, texto)
+        sends = 0
+        for kind, elapsed, text in events:
+            if kind == EVENT_SEND:
+                sends += 1
+            else:
+                self._reads.append((sends, elapsed, text))
+        self._next_read = 0
+        self._sends = 0
+        self._last_send = time.monotonic()
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> "ReplaySpawn":
+        header, events = load_transcript(path)
+        return cls(events, header.get("host", ""), header.get("protocol", ""), **kwargs)
+
+    @property
+    def replayed(self) -> bool:
+        """Whether every recorded command was sent and every output consumed"""
+        return self._sends >= len(self._sent_expected) and self._next_read >= len(self._reads)
+
+    def send(self, s) -> int:
+        text = s.decode("utf-8", errors="replace") if isinstance(s, bytes) else s
+        redacted = self._redactor.sent(text, self.after)
+        if self._sends >= len(self._sent_expected) or self._sent_expected[self._sends] != redacted:
+            expected = self._sent_expected[self._sends] if self._sends < len(self._sent_expected) else "<fim>"
+            self.divergences += 1
+            logger.warning(f"Replay divergiu no comando {self._sends + 1}: enviado {redacted!r}, gravado {expected!r}")
+        self._sends += 1
+        self._last_send = time.monotonic()
+        self._log(text, "send")
+        return len(text)
+
+    def sendline(self, s="") -> int:
+        return self.send(s + self.linesep)
+
+    def read_nonblocking(self, size=1, timeout=None) -> str:
+        if self._next_read >= len(self._reads):
+            self.flag_eof = True
+            raise pexpect.EOF("Fim da transcrição")
+        sends_before, elapsed, text = self._reads[self._next_read]
+        if sends_before > self._sends:
+            raise pexpect.TIMEOUT("Sem saída gravada para o comando atual")
+        if self.speed > 0 and sends_before:
+            due = (elapsed - self._sent_at[sends_before - 1]) / 1000 / self.speed
+            wait = due - (time.monotonic() - self._last_send)
+            if wait > 0:
+                time.sleep(wait)
+        self._next_read += 1
+        self._log(text, "read")
+        return text
+
+    def expect(self, pattern, timeout=-1, searchwindowsize=-1, async_=False, **kw):
+        if async_:
+            return self._expect_async(pattern, timeout, searchwindowsize, **kw)
+        return super().expect(pattern, timeout, searchwindowsize, **kw)
+
+    async def _expect_async(self, pattern, timeout, searchwindowsize, **kw):
+        await asyncio.sleep(0)
+        return super().expect(pattern, timeout, searchwindowsize, **kw)
+
+    def isalive(self) -> bool:
+        return not self.closed and not self.flag_eof
+
+    def close(self, force=True) -> None:
+        self.closed = True
+
+    def terminate(self, force=False) -> bool:
+        self.closed = True
+        return True
+
+
+class ReplayLibrary:
+    """Transcripts handed to spawn_ssh instead of opening sessions, in recorded order per (OLT, protocol)"""
+
+    def __init__(self) -> None:
+        self._queues: Dict[Tuple[str, str], List[str]] = {}
+        self._lock = threading.Lock()
+        self.enabled = False
+
+    def add(self, path: str) -> None:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+        with self._lock:
+            self._queues.setdefault((header["host"], header["protocol"]), []).append(path)
+            self.enabled = True
+
+    def load(self, directory: str) -> int:
+        """Queue every transcript of a directory (file names sort in recording order)"""
+        paths = sorted(name for name in os.listdir(directory) if name.endswith(TRANSCRIPT_SUFFIX))
+        for name in paths:
+            self.add(os.path.join(directory, name))
+        logger.info(f"{len(paths)} transcrições carregadas de {directory} para replay")
+        return len(paths)
+
+    def take(self, host: str, protocol: str) -> Optional[ReplaySpawn]:
+        """Next recorded session for the OLT, or None when replay is off"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            queue = self._queues.get((host, protocol))
+            if not queue:
+                raise ValueError(f"Nenhuma transcrição restante para {host} ({protocol})")
+            path = queue.pop(0)
+        logger.info(f"Sessão {protocol} com {host} servida da transcrição {path}")
+        return ReplaySpawn.from_file(path)
+
+
+replay_library = ReplayLibrary()
+if TRANSCRIPT_REPLAY:
+    replay_library.load(TRANSCRIPT_REPLAY)